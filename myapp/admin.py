@@ -1,6 +1,16 @@
 from django.contrib import admin
 from django.contrib.admin import AdminSite
 from .models import *
+from .exports import streaming_export
+from .pagination import EstimatedCountPaginator
+from .job_import import detect_format, import_jobs
+
+from django import forms
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.core.exceptions import PermissionDenied
 
 from django.contrib.auth.models import User, Group
 from django.contrib.auth.admin import UserAdmin, GroupAdmin
@@ -14,8 +24,8 @@ class MyAdminSite(AdminSite):
         for app in app_list:
             if app['app_label'] == 'myapp':
                 # reorder models manually
-                model_order = ['Course', 'Job', 'Plan', 'Topic', 'JobVideo', 'InterviewQuestion', 'PlacementSession', 'UserProfile',  'Application', 
-                'Doubt']
+                model_order = ['Course', 'Job', 'Skill', 'Plan', 'Topic', 'JobVideo', 'InterviewQuestion', 'PlacementSession', 'UserProfile',  'Application', 
+                'Payment', 'Doubt']
                 app['models'].sort(key=lambda x: model_order.index(x['object_name']))
         return app_list
 
@@ -26,9 +36,6 @@ admin_site.register(User, UserAdmin)
 admin_site.register(Group, GroupAdmin)
 
 # --- Register your app models ---
-admin_site.register(UserProfile)
-admin_site.register(Job)
-admin_site.register(Application)
 admin_site.register(Plan)
 
 @admin.register(Course, site=admin_site)
@@ -63,3 +70,107 @@ class PlacementSessionAdmin(admin.ModelAdmin):
     list_display = ("id", "date", "time", "session_type", "mode")
     list_filter = ("date", "mode")
     search_fields = ("session_type", "mode")
+
+@admin.register(Skill, site=admin_site)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug")
+    search_fields = ("slug",)
+
+
+class CompletionScoreFilter(admin.SimpleListFilter):
+    title = "profile completion"
+    parameter_name = "completion"
+    BANDS = {"lt25": (0, 25), "25-49": (25, 50), "50-74": (50, 75), "75-99": (75, 100), "100": (100, 101)}
+
+    def lookups(self, request, model_admin):
+        return [("lt25", "Under 25%"), ("25-49", "25–49%"), ("50-74", "50–74%"), ("75-99", "75–99%"), ("100", "Complete")]
+
+    def queryset(self, request, queryset):
+        if self.value() in self.BANDS:
+            low, high = self.BANDS[self.value()]
+            return queryset.filter(completion_score__gte=low, completion_score__lt=high)
+        return queryset
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelists for big tables: estimated totals, no second full COUNT(*)."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+@admin.register(UserProfile, site=admin_site)
+class UserProfileAdmin(LargeTableAdmin):
+    list_display = ("__str__", "full_name", "plan", "completion_score", "updated_at")
+    list_select_related = ("user", "plan")
+    list_filter = (CompletionScoreFilter, "plan")
+    search_fields = ("=mobile", "=user__username")
+    raw_id_fields = ("user",)
+    readonly_fields = ("completion_score",)
+
+
+class JobImportForm(forms.Form):
+    feed = forms.FileField(help_text="CSV with a header row, or JSON Lines (.jsonl). Rows are upserted on company + title + location.")
+    dry_run = forms.BooleanField(required=False, help_text="Validate and count changes without saving.")
+
+@admin.register(Job, site=admin_site)
+class JobAdmin(LargeTableAdmin):
+    change_list_template = "admin/myapp/job/change_list.html"
+    list_display = ("title", "company", "location", "course", "posted_at", "applicants")
+    list_select_related = ("course",)
+    list_filter = ("course", "posted_at")
+    ordering = ("-posted_at", "-id")  # job_posted_at_id_idx
+    search_fields = ("title", "company")
+    autocomplete_fields = ("course",)
+
+    def get_urls(self):
+        urls = [path("import/", self.admin_site.admin_view(self.import_view), name="myapp_job_import")]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            raise PermissionDenied
+        form = JobImportForm(request.POST or None, request.FILES or None)
+        result = None
+        if request.method == "POST" and form.is_valid():
+            feed = form.cleaned_data["feed"]
+            result = import_jobs(feed.file, detect_format(feed.name), dry_run=form.cleaned_data["dry_run"])
+            level = messages.WARNING if result.failed else messages.SUCCESS
+            self.message_user(request, ("Dry run: " if form.cleaned_data["dry_run"] else "") + result.summary(), level)
+            if not result.failed and not form.cleaned_data["dry_run"]:
+                return redirect("admin:myapp_job_changelist")
+        return TemplateResponse(request, "admin/myapp/job/import_jobs.html", {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import jobs",
+            "form": form,
+            "result": result,
+        })
+
+
+# --- Streaming exports (selected rows, or every filtered row with "select all") ---
+@admin.action(description="Export selected rows as CSV")
+def export_csv(modeladmin, request, queryset):
+    return streaming_export(queryset, "csv", request=request)
+
+@admin.action(description="Export selected rows as JSON Lines")
+def export_jsonl(modeladmin, request, queryset):
+    return streaming_export(queryset, "jsonl", request=request)
+
+@admin.register(Application, site=admin_site)
+class ApplicationAdmin(LargeTableAdmin):
+    list_display = ("full_name", "email", "job", "plan", "created_at")
+    list_select_related = ("job", "plan")
+    list_filter = ("plan", "created_at")
+    ordering = ("-created_at",)
+    search_fields = ("=email",)
+    raw_id_fields = ("user",)  # millions of users: an id box, not a search
+    autocomplete_fields = ("job",)
+    actions = (export_csv, export_jsonl)
+
+@admin.register(Payment, site=admin_site)
+class PaymentAdmin(LargeTableAdmin):
+    list_display = ("razorpay_order_id", "user", "plan", "amount", "status", "created_at")
+    list_select_related = ("user", "plan")
+    list_filter = ("status", "plan")
+    ordering = ("-id",)
+    search_fields = ("=razorpay_order_id", "=razorpay_payment_id")
+    raw_id_fields = ("user",)
+    actions = (export_csv, export_jsonl)
@@ -0,0 +1,117 @@
+# myapp/ai.py
+"""
+Pluggable text-generation providers for the AI tools.
+
+``get_provider()`` returns the process-wide provider named by
+``AI_PROVIDER``:
+
+* ``stub``   - deterministic and offline: streams back the ``offline_text``
+  the caller rendered itself, word by word. The default, and what tests
+  and local development use.
+* ``openai`` - the Chat Completions API through the ``openai`` package
+  (imported on first use), streamed token by token.
+
+Every provider yields plain text chunks, so callers never care which one
+is configured; ``astream`` is the same for async views, without holding a
+thread while the model writes.
+"""
+import re
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_WORDS = re.compile(r"\S+\s*")
+
+
+class BaseProvider:
+    name = "base"
+    model = ""
+
+    def stream(self, system, prompt, offline_text=""):
+        """Yield the completion of ``prompt`` as text chunks."""
+        raise NotImplementedError
+
+    async def astream(self, system, prompt, offline_text=""):
+        """``stream`` for async callers; providers with an async client override it."""
+        chunks = iter(self.stream(system, prompt, offline_text))
+        next_chunk = sync_to_async(next, thread_sensitive=False)
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+
+
+class StubProvider(BaseProvider):
+    """Same input, same output, no network."""
+    name = "stub"
+    model = "stub"
+
+    def stream(self, system, prompt, offline_text=""):
+        yield from _WORDS.findall(offline_text)
+
+    async def astream(self, system, prompt, offline_text=""):
+        for chunk in _WORDS.findall(offline_text):
+            yield chunk
+
+
+class OpenAIProvider(BaseProvider):
+    name = "openai"
+
+    def __init__(self):
+        import openai  # optional dependency, only needed when configured
+
+        self.model = settings.OPENAI_MODEL
+        options = {
+            "api_key": settings.OPENAI_API_KEY or None,
+            "base_url": settings.OPENAI_BASE_URL or None,
+            "timeout": settings.OPENAI_TIMEOUT,
+            "max_retries": settings.OPENAI_MAX_RETRIES,
+        }
+        self.client = openai.OpenAI(**options)
+        self.async_client = openai.AsyncOpenAI(**options)
+
+    def _request(self, system, prompt):
+        return {
+            "model": self.model,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+            "temperature": settings.OPENAI_TEMPERATURE,
+            "stream": True,
+        }
+
+    def stream(self, system, prompt, offline_text=""):
+        for chunk in self.client.chat.completions.create(**self._request(system, prompt)):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astream(self, system, prompt, offline_text=""):
+        response = await self.async_client.chat.completions.create(**self._request(system, prompt))
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+PROVIDERS = {
+    "stub": StubProvider,
+    "openai": OpenAIProvider,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """The configured provider (one per process)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = PROVIDERS[settings.AI_PROVIDER]()
+    return _provider
+
+
+@receiver(setting_changed)
+def _reset_provider(setting, **kwargs):
+    global _provider
+    if setting == "AI_PROVIDER" or setting.startswith("OPENAI_"):
+        _provider = None
@@ -0,0 +1,260 @@
+# myapp/bio.py
+"""
+Professional bio generation for the AI Bio Generator page.
+
+``BioRequest.from_form`` normalizes the form (whitespace, skill list,
+the tone/length/language choices, with defaults for anything missing)
+and ``key()`` hashes the result together with the provider and model.
+``stream_bios`` then yields ``(variant, text)`` chunks for the two bio
+variants:
+
+* a finished result for the same key comes from an in-process LRU cache;
+* while one request is generating a key, identical concurrent requests
+  attach to it and replay its chunks as they arrive, instead of calling
+  the provider again (single flight).
+
+``astream_bios`` is the same for async callers: it reads the provider's
+``astream``, so under ASGI each chunk goes out as it is written.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .ai import get_provider
+
+TONES = ("Professional", "Friendly", "Creative")
+LENGTHS = {"Short": "50-75 words", "Medium": "100-150 words", "Long": "200-250 words"}
+LANGUAGES = ("English", "Tamil", "Hindi")
+VARIANTS = (1, 2)
+
+SYSTEM_PROMPT = (
+    "You write professional bios for job seekers applying to remote jobs. "
+    "Write in the third person, plain text, no headings or lists, "
+    "and never invent employers, degrees or numbers that were not given."
+)
+
+
+def _clean(value, limit=300):
+    return " ".join((value or "").split())[:limit]
+
+
+def _choice(value, choices, default):
+    value = _clean(value).lower()
+    return next((choice for choice in choices if choice.lower() == value), default)
+
+
+@dataclass(frozen=True)
+class BioRequest:
+    name: str
+    experience: str
+    skills: tuple
+    highlights: str
+    tone: str = "Professional"
+    length: str = "Medium"
+    language: str = "English"
+
+    @classmethod
+    def from_form(cls, data):
+        skills = []
+        for raw in (data.get("skills") or "").split(","):
+            skill = _clean(raw, 50)
+            if skill and skill.lower() not in (s.lower() for s in skills):
+                skills.append(skill)
+        return cls(
+            name=_clean(data.get("fullName"), 100),
+            experience=_clean(data.get("experience"), 50),
+            skills=tuple(skills[:20]),
+            highlights=_clean(data.get("highlights"), 500),
+            tone=_choice(data.get("tone"), TONES, "Professional"),
+            length=_choice(data.get("length"), LENGTHS, "Medium"),
+            language=_choice(data.get("language"), LANGUAGES, "English"),
+        )
+
+    def missing(self):
+        """Names of the required fields left empty."""
+        return [label for label, value in (("fullName", self.name), ("skills", self.skills)) if not value]
+
+    def key(self, provider):
+        payload = json.dumps({**asdict(self), "provider": provider.name, "model": provider.model}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def prompt(self, variant):
+        angle = "their skills and strengths" if variant == 1 else "the results they deliver and the role they want next"
+        return (
+            f"Write a {self.tone.lower()} professional bio in {self.language}, about "
+            f"{LENGTHS[self.length]}, leading with {angle}.\n"
+            f"Name: {self.name}\n"
+            f"Experience level: {self.experience or 'not given'}\n"
+            f"Skills: {', '.join(self.skills)}\n"
+            f"Career highlights: {self.highlights or 'not given'}"
+        )
+
+    def offline_text(self, variant):
+        """The stub provider's deterministic bio."""
+        skills = ", ".join(self.skills)
+        experience = f"{self.experience} " if self.experience else ""
+        highlights = f" {self.highlights.rstrip('.')}." if self.highlights else ""
+        if variant == 1:
+            article = "an" if (experience or "professional")[0].lower() in "aeiou" else "a"
+            return (f"{self.name} is {article} {experience}professional skilled in {skills}.{highlights} "
+                    f"Known for a {self.tone.lower()} approach and clear, {self.length.lower()} communication.")
+        return (f"With {experience.lower() or 'hands-on '}experience in {skills}, {self.name} builds work "
+                f"that ships.{highlights} Delivers results with a {self.tone.lower()} style.")
+
+
+class _LRU:
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+
+class _Flight:
+    """One in-progress generation that other identical requests can follow."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.cond = threading.Condition()
+
+    def add(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.done, self.error = True, error
+            self.cond.notify_all()
+
+    def follow(self):
+        seen = 0
+        while True:
+            with self.cond:
+                while seen == len(self.chunks) and not self.done:
+                    self.cond.wait()
+                chunks, done, error = self.chunks[seen:], self.done, self.error
+            seen += len(chunks)
+            yield from chunks
+            if done and seen == len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+    async def afollow(self):
+        """``follow`` for async callers; each wait for the leader happens on a worker thread."""
+        chunks = self.follow()
+        next_chunk = sync_to_async(next, thread_sensitive=False)
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+
+
+_results = _LRU(settings.BIO_CACHE_SIZE)
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _join(key):
+    """``(flight, leader)``: the generation of ``key`` already running, or a new one to lead."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    return flight, leader
+
+
+def stream_bios(request):
+    """Yield ``(variant, text)`` chunks of both bios for a BioRequest."""
+    provider = get_provider()
+    key = request.key(provider)
+    cached = _results.get(key)
+    if cached is not None:
+        for variant, text in zip(VARIANTS, cached):
+            yield variant, text
+        return
+
+    flight, leader = _join(key)
+    if not leader:
+        yield from flight.follow()
+        return
+
+    # the leader streams straight from the provider and publishes every chunk
+    bios = {variant: [] for variant in VARIANTS}
+    try:
+        for variant in VARIANTS:
+            for text in provider.stream(SYSTEM_PROMPT, request.prompt(variant), request.offline_text(variant)):
+                flight.add((variant, text))
+                bios[variant].append(text)
+                yield variant, text
+        _results.set(key, tuple("".join(bios[variant]) for variant in VARIANTS))
+        flight.finish()
+    except BaseException as exc:
+        # provider error, or the leader's client went away (GeneratorExit)
+        flight.finish(exc if isinstance(exc, Exception) else RuntimeError("bio generation was abandoned"))
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+
+
+async def astream_bios(request):
+    """``stream_bios`` for async callers."""
+    provider = get_provider()
+    key = request.key(provider)
+    cached = _results.get(key)
+    if cached is not None:
+        for variant, text in zip(VARIANTS, cached):
+            yield variant, text
+        return
+
+    flight, leader = _join(key)
+    if not leader:
+        async for chunk in flight.afollow():
+            yield chunk
+        return
+
+    bios = {variant: [] for variant in VARIANTS}
+    try:
+        for variant in VARIANTS:
+            async for text in provider.astream(SYSTEM_PROMPT, request.prompt(variant), request.offline_text(variant)):
+                flight.add((variant, text))
+                bios[variant].append(text)
+                yield variant, text
+        _results.set(key, tuple("".join(bios[variant]) for variant in VARIANTS))
+        flight.finish()
+    except BaseException as exc:
+        # provider error, or the client went away (GeneratorExit / CancelledError)
+        flight.finish(exc if isinstance(exc, Exception) else RuntimeError("bio generation was abandoned"))
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+
+
+def generate_bios(request):
+    """Both bios as whole strings: ``{"bio1": ..., "bio2": ...}``."""
+    bios = {variant: "" for variant in VARIANTS}
+    for variant, text in stream_bios(request):
+        bios[variant] += text
+    return {f"bio{variant}": text.strip() for variant, text in bios.items()}
@@ -0,0 +1,95 @@
+# myapp/course_bundle.py
+"""
+Cached, admin-edited course content for the confirm_courses page.
+
+One prefetching pass loads a course with its topics, preparation videos,
+interview PDFs, next placement session and fallback job; the result is
+cached until one of those admin models changes (see myapp.signals).
+The job's applicant count is left out: apply_job bumps it with an
+UPDATE that sends no signal, so callers read it fresh.
+"""
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .models import Course, Job, PlacementSession
+
+GENERATION_KEY = "course_bundle:generation"
+
+
+@dataclass
+class CourseBundle:
+    course: Course
+    job_videos: list = field(default_factory=list)
+    interview_qs: list = field(default_factory=list)
+    placement: PlacementSession = None
+    job: Job = None  # first job linked to the course (or named like it); applicants deferred
+
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, 1, timeout=None)
+
+
+def _key(course_id, generation):
+    # the date is part of the key because "next placement session" moves daily
+    return f"course_bundle:{generation}:{course_id}:{timezone.localdate().isoformat()}"
+
+
+def build_course_bundle(course_id):
+    today = timezone.localdate()
+    course = (
+        Course.objects.filter(id=course_id)
+        .prefetch_related(
+            "topics",
+            "job_videos",
+            "interview_questions",
+            Prefetch(
+                "placement_sessions",
+                queryset=PlacementSession.objects.filter(date__gte=today).order_by("date", "id"),
+                to_attr="upcoming_sessions",
+            ),
+        )
+        .first()
+    )
+    if course is None:
+        return None
+
+    jobs = Job.objects.with_skills().defer("applicants")
+    job = jobs.filter(course=course).first() \
+          or jobs.filter(role__iexact=course.name).first() \
+          or jobs.filter(title__iexact=course.name).first()
+
+    return CourseBundle(
+        course=course,
+        job_videos=list(course.job_videos.all()),
+        interview_qs=list(course.interview_questions.all()),
+        placement=course.upcoming_sessions[0] if course.upcoming_sessions else None,
+        job=job,
+    )
+
+
+def get_course_bundle(course_id):
+    """Return the CourseBundle for ``course_id`` (None if it doesn't exist)."""
+    key = _key(course_id, _generation())
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = build_course_bundle(course_id)
+        if bundle is not None:
+            cache.set(key, bundle, timeout=settings.COURSE_BUNDLE_TIMEOUT)
+    return bundle
+
+
+def invalidate_course_bundle(course_id=None):
+    """Drop one course's bundle, or every bundle when ``course_id`` is None."""
+    if course_id is not None:
+        cache.delete(_key(course_id, _generation()))
+        return
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # key was evicted: restart from a value no earlier generation used
+        cache.set(GENERATION_KEY, int(time.time()), timeout=None)
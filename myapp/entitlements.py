@@ -0,0 +1,213 @@
+# myapp/entitlements.py
+"""
+What the signed-in user's plan allows, loaded once per request.
+
+``EntitlementsMiddleware`` sets a lazy ``request.entitlements``: the first
+access reads the profile's plan and expiry in one query, and pages that
+never look pay nothing. With ``ENTITLEMENTS_SESSION_CACHE`` on, the result
+is also kept in the session and reused until the user's profile or any
+plan is saved (see myapp.signals), which bumps a version held in the cache;
+it defaults to on only when that cache is shared (REDIS_URL).
+Async views use ``afor_request`` instead, since the lazy object would
+query the database synchronously.
+"""
+import time
+from dataclasses import dataclass
+from datetime import date
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from .models import DailyApplicationQuota, UserProfile
+
+SESSION_KEY = "_entitlements"
+GLOBAL_VERSION_KEY = "entitlements:version"  # bumped when any Plan changes
+TIERS = ("basic", "standard", "premium")
+VIDEO_TIERS = ("standard", "premium")
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    user_id: int = None
+    plan_id: int = None
+    plan_name: str = ""
+    plan_end: date = None
+    daily_application_limit: int = None  # None = unlimited
+
+    @property
+    def has_plan(self):
+        return self.plan_id is not None
+
+    @property
+    def tier(self):
+        """"basic", "standard" or "premium" from the plan name ("Premium Plan" -> "premium"); "" if none."""
+        name = self.plan_name.lower()
+        return next((tier for tier in TIERS if tier in name), "")
+
+    @property
+    def active(self):
+        return self.has_plan and self.plan_end is not None and self.plan_end >= date.today()
+
+    @property
+    def remaining_days(self):
+        """Days left in the plan's validity (0 if expired or no plan)."""
+        if self.has_plan and self.plan_end:
+            return max((self.plan_end - date.today()).days, 0)
+        return 0
+
+    @property
+    def can_watch_videos(self):
+        """Preparation videos are a Standard/Premium plan feature."""
+        return self.active and self.tier in VIDEO_TIERS
+
+    @property
+    def placement_access(self):
+        """Live placement sessions come with any active plan."""
+        return self.active
+
+    def remaining_applications_today(self):
+        """Applications left today; None when there is no plan or no limit."""
+        if not self.has_plan or self.daily_application_limit is None:
+            return None
+        return max(self.daily_application_limit - DailyApplicationQuota.used_today(self.user_id), 0)
+
+    def to_session(self):
+        return {
+            "user_id": self.user_id,
+            "plan_id": self.plan_id,
+            "plan_name": self.plan_name,
+            "plan_end": self.plan_end.isoformat() if self.plan_end else None,
+            "daily_application_limit": self.daily_application_limit,
+        }
+
+    @classmethod
+    def from_session(cls, data):
+        plan_end = date.fromisoformat(data["plan_end"]) if data["plan_end"] else None
+        return cls(
+            user_id=data["user_id"],
+            plan_id=data["plan_id"],
+            plan_name=data["plan_name"],
+            plan_end=plan_end,
+            daily_application_limit=data["daily_application_limit"],
+        )
+
+
+ANONYMOUS = Entitlements()
+
+
+def _profile_row(user):
+    return UserProfile.objects.filter(user=user).values(
+        "plan_id", "plan__name", "plan__daily_application_limit", "plan_end"
+    )
+
+
+def load(user):
+    """Read ``user``'s entitlements from the database (one query)."""
+    return _from_row(user, _profile_row(user).first())
+
+
+async def aload(user):
+    return _from_row(user, await _profile_row(user).afirst())
+
+
+def _from_row(user, row):
+    if row is None or row["plan_id"] is None:
+        return Entitlements(user_id=user.pk)
+    return Entitlements(
+        user_id=user.pk,
+        plan_id=row["plan_id"],
+        plan_name=row["plan__name"],
+        plan_end=row["plan_end"],
+        daily_application_limit=row["plan__daily_application_limit"],
+    )
+
+
+def _user_version_key(user_id):
+    return f"entitlements:version:{user_id}"
+
+
+def _versions(user_id):
+    keys = [GLOBAL_VERSION_KEY, _user_version_key(user_id)]
+    versions = cache.get_many(keys)
+    # a missing key restarts from a value no earlier version used
+    missing = {key: int(time.time()) for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+async def _aversions(user_id):
+    keys = [GLOBAL_VERSION_KEY, _user_version_key(user_id)]
+    versions = await cache.aget_many(keys)
+    missing = {key: int(time.time()) for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def for_request(request):
+    user = request.user
+    if not user.is_authenticated:
+        return ANONYMOUS
+    if not settings.ENTITLEMENTS_SESSION_CACHE:
+        return load(user)
+
+    # read the versions before the row, so a change in between forces a reload next time
+    versions = _versions(user.pk)
+    cached = request.session.get(SESSION_KEY)
+    if cached and cached["versions"] == versions and cached["user_id"] == user.pk:
+        return Entitlements.from_session(cached)
+    entitlements = load(user)
+    request.session[SESSION_KEY] = {**entitlements.to_session(), "versions": versions}
+    return entitlements
+
+
+async def afor_request(request):
+    """``for_request`` for async views, which can't use the lazy ``request.entitlements``."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return ANONYMOUS
+    if not settings.ENTITLEMENTS_SESSION_CACHE:
+        return await aload(user)
+
+    versions = await _aversions(user.pk)
+    cached = await request.session.aget(SESSION_KEY)
+    if cached and cached["versions"] == versions and cached["user_id"] == user.pk:
+        return Entitlements.from_session(cached)
+    entitlements = await aload(user)
+    await request.session.aset(SESSION_KEY, {**entitlements.to_session(), "versions": versions})
+    return entitlements
+
+
+def invalidate(user_id=None):
+    """Expire one user's cached entitlements, or everyone's when ``user_id`` is None."""
+    key = GLOBAL_VERSION_KEY if user_id is None else _user_version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time()), timeout=None)
+
+
+class EntitlementsMiddleware:
+    """Adds a lazy ``request.entitlements``; goes after AuthenticationMiddleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.entitlements = SimpleLazyObject(lambda: for_request(request))
+        return self.get_response(request)  # a coroutine under ASGI; the caller awaits it
+
+
+def context_processor(request):
+    """``{{ entitlements }}`` in every template (still lazy until used)."""
+    return {"entitlements": getattr(request, "entitlements", ANONYMOUS)}
@@ -0,0 +1,201 @@
+# myapp/facets.py
+"""
+Facet counts for the job_search sidebar.
+
+``compute_facets`` counts location, job type, employment type, candidate
+type and course for any Job queryset in one GROUP BY over all five
+columns, then folds the groups into per-field counts in Python. The
+unfiltered board's facets are cached and patched in place when a Job is
+saved or deleted (see myapp.signals); anything the patch can't apply
+safely (a concurrent patch, an evicted blob, bulk imports) bumps the
+cache generation instead, and the next request recounts. Patches and
+generations only reach every worker through a shared cache (REDIS_URL);
+without one, JOB_FACETS_TIMEOUT is short and each worker recounts often.
+The ``a``-prefixed functions are the same for async views.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.http import QueryDict
+
+from .models import Course, Job
+
+FACET_FIELDS = ("location", "job_type", "employment_type", "candidate_type", "course")
+FACET_COLUMNS = ("location", "job_type", "employment_type", "candidate_type", "course_id")
+FACET_PARAMS = (  # field, sidebar title, query parameter
+    ("location", "Location", "job_location"),  # exact; ?location= is the search box's substring match
+    ("job_type", "Job Type", "job_type"),
+    ("employment_type", "Employment Type", "employment_type"),
+    ("candidate_type", "Candidate Type", "candidate_type"),
+    ("course", "Course", "course_id"),
+)
+GENERATION_KEY = "job_facets:generation"
+LOCK_KEY = "job_facets:lock"
+FACET_LIMIT = 10  # values shown per field
+
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, 1, timeout=None)
+
+
+async def _ageneration():
+    return await cache.aget_or_set(GENERATION_KEY, 1, timeout=None)
+
+
+def _key(generation):
+    return f"job_facets:{generation}"
+
+
+def facet_values(job):
+    """The (location, job_type, ...) tuple one Job contributes to the counts."""
+    return tuple(getattr(job, column) for column in FACET_COLUMNS)
+
+
+def _groups(queryset):
+    return queryset.order_by().values_list(*FACET_COLUMNS).annotate(jobs=Count("id"))
+
+
+def _fold(groups):
+    counts = {name: Counter() for name in FACET_FIELDS}
+    for *values, jobs in groups:
+        for name, value in zip(FACET_FIELDS, values):
+            counts[name][value] += jobs
+    return counts
+
+
+def count_facets(queryset):
+    """``{field: Counter(value -> jobs)}`` for ``queryset``, from a single grouped query."""
+    return _fold(_groups(queryset))
+
+
+async def acount_facets(queryset):
+    return _fold([group async for group in _groups(queryset)])
+
+
+@dataclass
+class Facet:
+    name: str
+    title: str
+    param: str  # the job_search query parameter that filters on it
+    values: list = field(default_factory=list)  # [FacetValue], most common first
+
+
+@dataclass
+class FacetValue:
+    value: object
+    label: str
+    count: int
+    active: bool = False
+    query: str = ""  # "?..." toggling this value on (or off, when active)
+
+
+def _toggle(selected, param, value, active):
+    query = selected.copy()
+    query.pop("cursor", None)  # a new filter starts from the first page
+    if active:
+        query.pop(param, None)
+    else:
+        query[param] = value
+    return "?" + query.urlencode()
+
+
+def _top(counts, limit):
+    return {name: [(value, n) for value, n in counter.most_common() if value not in (None, "") and n > 0][:limit]
+            for name, counter in counts.items()}
+
+
+def _course_names(top):
+    return Course.objects.filter(id__in=[value for value, _ in top["course"]]).values_list("id", "name")
+
+
+def _facets(top, course_names, selected):
+    selected = selected if selected is not None else QueryDict()
+    result = []
+    for name, title, param in FACET_PARAMS:
+        facet = Facet(name=name, title=title, param=param)
+        for value, n in top[name]:
+            label = course_names.get(value, str(value)) if name == "course" else value
+            active = selected.get(param) == str(value)
+            facet.values.append(FacetValue(value, label, n, active, _toggle(selected, param, value, active)))
+        result.append(facet)
+    return result
+
+
+def present(counts, selected=None, limit=FACET_LIMIT):
+    """
+    Sidebar-ready ``[Facet]`` from ``count_facets`` output: most common
+    values first, empty values and zero counts dropped. ``selected`` is
+    the request's query dict, to mark the values already filtered on.
+    """
+    top = _top(counts, limit)
+    return _facets(top, dict(_course_names(top)), selected)
+
+
+async def apresent(counts, selected=None, limit=FACET_LIMIT):
+    top = _top(counts, limit)
+    return _facets(top, {pk: name async for pk, name in _course_names(top)}, selected)
+
+
+def compute_facets(queryset, selected=None, limit=FACET_LIMIT):
+    return present(count_facets(queryset), selected, limit)
+
+
+async def acompute_facets(queryset, selected=None, limit=FACET_LIMIT):
+    return await apresent(await acount_facets(queryset), selected, limit)
+
+
+def board_facets(selected=None, limit=FACET_LIMIT):
+    """Facets for every job on the board, served from the cache."""
+    key = _key(_generation())
+    counts = cache.get(key)
+    if counts is None:
+        counts = count_facets(Job.objects.all())
+        cache.set(key, counts, timeout=settings.JOB_FACETS_TIMEOUT)
+    return present(counts, selected, limit)
+
+
+async def aboard_facets(selected=None, limit=FACET_LIMIT):
+    key = _key(await _ageneration())
+    counts = await cache.aget(key)
+    if counts is None:
+        counts = await acount_facets(Job.objects.all())
+        await cache.aset(key, counts, timeout=settings.JOB_FACETS_TIMEOUT)
+    return await apresent(counts, selected, limit)
+
+
+def job_changed(before, after):
+    """
+    Move one job's contribution from ``before`` to ``after`` (facet_values
+    tuples; None for a created or deleted job) in the cached board counts.
+    """
+    if before == after:
+        return
+    if not cache.add(LOCK_KEY, 1, timeout=5):
+        invalidate()  # someone else is mid-update; recounting is always safe
+        return
+    try:
+        # if invalidate() runs meanwhile, this write lands on a generation nobody reads
+        key = _key(_generation())
+        counts = cache.get(key)
+        if counts is None:
+            return
+        for values, step in ((before, -1), (after, 1)):
+            if values is not None:
+                for name, value in zip(FACET_FIELDS, values):
+                    counts[name][value] += step
+        cache.set(key, counts, timeout=settings.JOB_FACETS_TIMEOUT)
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def invalidate():
+    """Drop the cached board facets (after bulk writes or course renames)."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # key was evicted: restart from a value no earlier generation used
+        cache.set(GENERATION_KEY, int(time.time()), timeout=None)
@@ -0,0 +1,206 @@
+# myapp/fake_razorpay.py
+"""
+A tiny stand-in for the Razorpay API, for offline development and load tests.
+
+Implements just what the checkout flow uses:
+
+    POST /v1/orders              create an order
+    GET  /v1/orders/<id>         fetch an order
+    POST /v1/orders/<id>/pay     "pay" an order; returns the signed callback
+                                 fields the real Checkout would post back
+    GET  /v1/payments/<id>       fetch a payment
+    GET  /v1/checkout.js         drop-in replacement for Razorpay Checkout
+
+Signatures are real HMAC-SHA256 over ``order_id|payment_id`` with the
+configured key secret, so ``payment_callback`` verifies them unchanged.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHECKOUT_JS = """
+(function () {
+  function Razorpay(options) { this.options = options; }
+  Razorpay.prototype.open = function () {
+    var o = this.options;
+    fetch("%(base)s/v1/orders/" + o.order_id + "/pay", {method: "POST"})
+      .then(function (r) { return r.json(); })
+      .then(function (data) {
+        var form = document.createElement("form");
+        form.method = "POST";
+        form.action = o.callback_url;
+        Object.keys(data).forEach(function (k) {
+          var input = document.createElement("input");
+          input.type = "hidden"; input.name = k; input.value = data[k];
+          form.appendChild(input);
+        });
+        document.body.appendChild(form);
+        form.submit();
+      });
+  };
+  window.Razorpay = Razorpay;
+})();
+"""
+
+
+def sign(secret, order_id, payment_id):
+    return hmac.new(secret.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+
+
+class FakeRazorpayState:
+    def __init__(self, key_id, key_secret, latency=0.0):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.latency = latency
+        self.orders = {}
+        self.payments = {}
+        self.lock = threading.Lock()
+
+    def create_order(self, body):
+        order = {
+            "id": "order_" + secrets.token_hex(7),
+            "entity": "order",
+            "amount": int(body.get("amount", 0)),
+            "amount_paid": 0,
+            "amount_due": int(body.get("amount", 0)),
+            "currency": body.get("currency", "INR"),
+            "receipt": body.get("receipt"),
+            "status": "created",
+            "attempts": 0,
+            "notes": body.get("notes", []),
+            "created_at": int(time.time()),
+        }
+        with self.lock:
+            self.orders[order["id"]] = order
+        return order
+
+    def pay_order(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                return None
+            payment = {
+                "id": "pay_" + secrets.token_hex(7),
+                "entity": "payment",
+                "amount": order["amount"],
+                "currency": order["currency"],
+                "status": "captured",
+                "order_id": order_id,
+                "captured": True,
+                "created_at": int(time.time()),
+            }
+            self.payments[payment["id"]] = payment
+            order.update(status="paid", amount_paid=order["amount"], amount_due=0, attempts=order["attempts"] + 1)
+        return {
+            "razorpay_payment_id": payment["id"],
+            "razorpay_order_id": order_id,
+            "razorpay_signature": sign(self.key_secret, order_id, payment["id"]),
+        }
+
+
+class FakeRazorpayHandler(BaseHTTPRequestHandler):
+    server_version = "FakeRazorpay/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, so client pooling is exercised
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, code, description):
+        self._send(status, {"error": {"code": code, "description": description}})
+
+    def _authorized(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return False
+        try:
+            key_id, _, secret = base64.b64decode(header[6:]).decode().partition(":")
+        except ValueError:
+            return False
+        return key_id == self.state.key_id and secret == self.state.key_secret
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw or b"{}")
+
+    def _simulate_latency(self):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self._simulate_latency()
+        if self.path == "/v1/checkout.js":
+            base = f"http://{self.headers.get('Host')}"
+            return self._send(200, (CHECKOUT_JS % {"base": base}).encode(), "application/javascript")
+        if not self._authorized():
+            return self._error(401, "BAD_REQUEST_ERROR", "Authentication failed")
+        match = re.fullmatch(r"/v1/(orders|payments)/([\w]+)", self.path)
+        if match:
+            store = self.state.orders if match.group(1) == "orders" else self.state.payments
+            entity = store.get(match.group(2))
+            if entity:
+                return self._send(200, entity)
+        return self._error(404, "BAD_REQUEST_ERROR", "The id provided does not exist")
+
+    def do_POST(self):
+        self._simulate_latency()
+        pay = re.fullmatch(r"/v1/orders/(\w+)/pay", self.path)
+        if pay:
+            # stands in for the customer completing Checkout, so no API auth
+            result = self.state.pay_order(pay.group(1))
+            if result is None:
+                return self._error(404, "BAD_REQUEST_ERROR", "The id provided does not exist")
+            return self._send(200, result)
+        if not self._authorized():
+            return self._error(401, "BAD_REQUEST_ERROR", "Authentication failed")
+        if self.path == "/v1/orders":
+            try:
+                body = self._body()
+            except ValueError:
+                return self._error(400, "BAD_REQUEST_ERROR", "Invalid JSON")
+            if int(body.get("amount", 0)) < 100:
+                return self._error(400, "BAD_REQUEST_ERROR", "Order amount less than minimum amount allowed")
+            return self._send(200, self.state.create_order(body))
+        return self._error(404, "BAD_REQUEST_ERROR", "The requested URL was not found on the server.")
+
+
+def make_server(host, port, key_id, key_secret, latency=0.0, verbose=False):
+    server = ThreadingHTTPServer((host, port), FakeRazorpayHandler)
+    server.daemon_threads = True
+    server.state = FakeRazorpayState(key_id, key_secret, latency=latency)
+    server.verbose = verbose
+    return server
+
+
+def start_in_thread(host="127.0.0.1", port=0, key_id="rzp_test_fake", key_secret="fake_secret", latency=0.0):
+    """Start a server on a background thread; returns it (``server.server_address`` has the port)."""
+    server = make_server(host, port, key_id, key_secret, latency=latency)
+    threading.Thread(target=server.serve_forever, name="fake-razorpay", daemon=True).start()
+    return server
@@ -0,0 +1,125 @@
+# myapp/images.py
+"""
+Resized WebP/JPEG derivatives for uploaded images.
+
+After an upload is committed, the original is handed to a small thread
+pool (Pillow releases the GIL while decoding/encoding) which writes
+fixed-width copies next to it:
+
+    profile_images/me.jpg -> profile_images/me.w320.webp, me.w320.jpg, ...
+
+The ``{% responsive_image %}`` tag in ``media_tags`` turns those into a
+``<picture>`` with ``srcset``, falling back to the original until the
+derivatives exist.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+FORMATS = (("webp", "WEBP"), ("jpg", "JPEG"))
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def widths():
+    return tuple(sorted(settings.IMAGE_DERIVATIVE_WIDTHS))
+
+
+def derivative_name(name, width, ext):
+    root, _ = os.path.splitext(name)
+    return f"{root}.w{width}.{ext}"
+
+
+def _ready_key(name):
+    return f"image_derivatives:{name}"
+
+
+def derivatives_ready(name, storage=default_storage):
+    """True once the full derivative set for ``name`` is on storage (cached)."""
+    if cache.get(_ready_key(name)):
+        return True
+    # the largest JPEG is written last, so its presence means the set is complete
+    if storage.exists(derivative_name(name, widths()[-1], "jpg")):
+        cache.set(_ready_key(name), True, timeout=None)
+        return True
+    return False
+
+
+def generate_derivatives(name, storage=default_storage):
+    """Write every width/format derivative of the image ``name``."""
+    if derivatives_ready(name, storage):
+        return
+    with storage.open(name, "rb") as fh:
+        original = ImageOps.exif_transpose(Image.open(fh))
+        original.load()
+
+    for width in widths():
+        image = original.copy()
+        # never upscale: small originals just get re-encoded at their own size
+        if image.width > width:
+            image.thumbnail((width, width * 10), Image.LANCZOS)
+        for ext, fmt in FORMATS:
+            out = image
+            if fmt == "JPEG" and out.mode not in ("RGB", "L"):
+                out = out.convert("RGB")
+            elif fmt == "WEBP" and out.mode not in ("RGB", "RGBA"):
+                out = out.convert("RGBA" if "A" in out.getbands() else "RGB")
+            buffer = BytesIO()
+            out.save(buffer, fmt, quality=settings.IMAGE_DERIVATIVE_QUALITY, optimize=True)
+            target = derivative_name(name, width, ext)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    cache.set(_ready_key(name), True, timeout=None)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.IMAGE_DERIVATIVE_WORKERS, thread_name_prefix="image-derivatives"
+                )
+    return _executor
+
+
+def _run(name):
+    try:
+        generate_derivatives(name)
+    except Exception:
+        logger.exception("Could not build image derivatives for %s", name)
+    finally:
+        with _executor_lock:
+            _pending.discard(name)
+
+
+def schedule(name):
+    """Queue derivative generation for ``name`` (duplicate requests are dropped)."""
+    if not name:
+        return
+    with _executor_lock:
+        if name in _pending:
+            return
+        _pending.add(name)
+    _get_executor().submit(_run, name)
+
+
+def schedule_for_instance(instance):
+    """Queue derivatives for every ImageField on a freshly saved model instance."""
+    for field in instance._meta.concrete_fields:
+        if isinstance(field, models.ImageField):
+            schedule(getattr(instance, field.attname).name)
@@ -0,0 +1,276 @@
+# myapp/interview.py
+"""
+Mock interview sessions for the AI Mock Interview page.
+
+``astart`` draws a course's questions: one per ``InterviewQuestion``
+tool (falling back to ``Course.course_tools``) at the chosen level, then
+a behavioural question to close. ``aanswer`` scores a reply locally
+(``score_answer``) and streams the provider's feedback on it.
+
+Sessions are ``MockInterviewSession`` rows, so whichever worker takes
+the next answer sees them. ``aclaim`` locks a session with a conditional
+UPDATE of ``locked_until``, so concurrent submits can't score the same
+question twice. Everything here is async: it waits on the async ORM and
+the provider's ``astream``.
+"""
+import random
+import re
+import secrets
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .ai import get_provider
+from .models import Course, MockInterviewSession
+
+LEVELS = {
+    "fresher": (
+        "What is {tool}, and what would you use it for?",
+        "Walk me through a small project or exercise where you used {tool}.",
+        "What was the hardest part of learning {tool}, and how did you get past it?",
+    ),
+    "intermediate": (
+        "How have you used {tool} in a real project, and what problem did it solve?",
+        "What mistakes do people often make with {tool}, and how do you avoid them?",
+        "How do you test or check your work when using {tool}?",
+    ),
+    "experienced": (
+        "How would you design a system that relies heavily on {tool} so it scales?",
+        "Tell me about a production problem involving {tool} and how you resolved it.",
+        "When would you choose not to use {tool}, and what would you use instead?",
+    ),
+}
+BEHAVIOURAL = (
+    "Tell me about a challenging project you worked on and how you overcame the difficulties.",
+    "Describe a time you disagreed with a teammate. How did you handle it?",
+    "Why do you want to work remotely, and how do you stay productive at home?",
+)
+MAX_SCORE = 10
+
+SYSTEM_PROMPT = (
+    "You are a friendly interviewer running a mock job interview. Give short, "
+    "specific feedback on the candidate's answer: what worked, what was missing, "
+    "and one concrete suggestion. Plain text, at most 120 words."
+)
+
+EXAMPLE_RE = re.compile(r"\b(for example|for instance|when i|i built|i used|we built|project|\d+)\b", re.I)
+REASON_RE = re.compile(r"\b(because|so that|which meant|therefore|trade-?off|instead of)\b", re.I)
+RESULT_RE = re.compile(r"\b(result|improved|reduced|increased|saved|learned|delivered)\b|%", re.I)
+
+
+class SessionNotFound(Exception):
+    pass
+
+
+class AnswerConflict(Exception):
+    """The answer doesn't fit the session: already answered, or one is still being scored."""
+
+
+@dataclass
+class InterviewSession:
+    id: str
+    course_id: int
+    course_name: str
+    level: str
+    questions: list  # [{"tool": ..., "text": ...}]
+    user_id: int = None
+    answers: list = field(default_factory=list)  # [{"answer", "score", "feedback"}], one per question so far
+
+    @property
+    def finished(self):
+        return len(self.answers) >= len(self.questions)
+
+    @property
+    def current(self):
+        """Index of the question being asked, or None when the interview is over."""
+        return None if self.finished else len(self.answers)
+
+    def question(self, index=None):
+        index = self.current if index is None else index
+        if index is None:
+            return None
+        return {"number": index, "of": len(self.questions), **self.questions[index]}
+
+    def summary(self):
+        total = sum(answer["score"] for answer in self.answers)
+        return {
+            "course": self.course_name,
+            "level": self.level,
+            "score": total,
+            "out_of": MAX_SCORE * len(self.questions),
+            "answers": [{**self.questions[n], **answer} for n, answer in enumerate(self.answers)],
+            "finished": self.finished,
+        }
+
+
+def _live(user_id, now=None):
+    """Sessions of ``user_id`` that haven't expired."""
+    cutoff = (now or timezone.now()) - timedelta(seconds=settings.INTERVIEW_SESSION_TIMEOUT)
+    return MockInterviewSession.objects.filter(user_id=user_id, updated_at__gte=cutoff)
+
+
+async def _course_tools(course):
+    tools = [tool async for tool in course.interview_questions.order_by("id").values_list("tool_name", flat=True)]
+    if not tools:
+        tools = (course.course_tools or "").split(",")
+    unique = {}
+    for tool in tools:
+        tool = " ".join(tool.split())
+        unique.setdefault(tool.lower(), tool)
+    return [tool for tool in unique.values() if tool]
+
+
+def draw_questions(tools, level, count, seed):
+    """``count`` questions: one per tool in turn, ending on a behavioural one."""
+    rng = random.Random(seed)
+    templates = LEVELS[level]
+    order = {tool: rng.sample(templates, len(templates)) for tool in tools}  # no repeats per tool
+    questions = []
+    for n in range(max(count - 1, 0) if tools else 0):
+        tool = tools[n % len(tools)]
+        questions.append({"tool": tool, "text": order[tool][n // len(tools) % len(templates)].format(tool=tool)})
+    general = rng.sample(BEHAVIOURAL, len(BEHAVIOURAL))
+    while len(questions) < count:
+        questions.append({"tool": "", "text": general[len(questions) % len(general)]})
+    return questions
+
+
+async def astart(course_id, level, user_id=None):
+    """Open a new session for ``course_id``; raises Course.DoesNotExist."""
+    if level not in LEVELS:
+        level = "fresher"
+    course = await Course.objects.aget(pk=course_id)
+    session_id = secrets.token_urlsafe(16)
+    session = InterviewSession(
+        id=session_id,
+        course_id=course.pk,
+        course_name=course.name,
+        level=level,
+        questions=draw_questions(await _course_tools(course), level, settings.INTERVIEW_QUESTIONS, session_id),
+        user_id=user_id,
+    )
+    await MockInterviewSession.objects.acreate(
+        id=session.id, user_id=user_id, course_id=course.pk, level=level, questions=session.questions,
+    )
+    # expired sessions are only ever cleared here
+    cutoff = timezone.now() - timedelta(seconds=settings.INTERVIEW_SESSION_TIMEOUT)
+    await MockInterviewSession.objects.filter(updated_at__lt=cutoff).adelete()
+    return session
+
+
+async def aload(session_id, user_id=None):
+    row = await _live(user_id).filter(pk=session_id).values(
+        "course_id", "course__name", "level", "questions", "answers",
+    ).afirst()
+    if row is None:
+        raise SessionNotFound(session_id)
+    return InterviewSession(
+        id=session_id,
+        course_id=row["course_id"],
+        course_name=row["course__name"],
+        level=row["level"],
+        questions=row["questions"],
+        user_id=user_id,
+        answers=row["answers"],
+    )
+
+
+async def asave(session):
+    await MockInterviewSession.objects.filter(pk=session.id).aupdate(
+        answers=session.answers, updated_at=timezone.now(),
+    )
+
+
+async def arelease(session_id):
+    await MockInterviewSession.objects.filter(pk=session_id).aupdate(locked_until=None)
+
+
+async def aclaim(session_id, number, user_id=None):
+    """
+    Lock the session for answering question ``number`` and return it.
+    The lock is released by ``aanswer``; the caller must run it.
+    """
+    now = timezone.now()
+    claimed = await _live(user_id, now).filter(pk=session_id).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+    ).aupdate(locked_until=now + timedelta(seconds=settings.INTERVIEW_ANSWER_TIMEOUT))
+    if not claimed:
+        await aload(session_id, user_id)  # SessionNotFound if that's why
+        raise AnswerConflict("Your previous answer is still being scored.")
+    try:
+        session = await aload(session_id, user_id)
+        if session.current is None or session.current != number:
+            raise AnswerConflict("That question has already been answered.")
+    except Exception:
+        await arelease(session_id)
+        raise
+    return session
+
+
+def score_answer(question, answer):
+    """``(score out of MAX_SCORE, [strengths], [suggestions])`` from the text alone."""
+    words = len(answer.split())
+    strengths, suggestions = [], []
+    score = 3 if words >= 60 else 2 if words >= 25 else 1 if words >= 8 else 0
+    if words < 25:
+        suggestions.append("Give a fuller answer; two or three sentences at least.")
+    tool = question["tool"]
+    if tool:
+        if tool.lower() in answer.lower():
+            score += 2
+            strengths.append(f"You talked about {tool} directly.")
+        else:
+            suggestions.append(f"Tie your answer back to {tool} by name.")
+    else:
+        score += 2 if words >= 25 else 0
+    for pattern, points, strength, suggestion in (
+        (EXAMPLE_RE, 2, "You backed it up with a concrete example.", "Add a concrete example from a project you did."),
+        (REASON_RE, 2, "You explained why, not just what.", "Explain why you made the choices you describe."),
+        (RESULT_RE, 1, "You mentioned the outcome.", "Finish with the result or what you learned."),
+    ):
+        if pattern.search(answer):
+            score += points
+            strengths.append(strength)
+        else:
+            suggestions.append(suggestion)
+    return min(score, MAX_SCORE), strengths, suggestions
+
+
+def _offline_feedback(score, strengths, suggestions):
+    parts = [f"Score: {score}/{MAX_SCORE}."]
+    parts += strengths or ["Good start."]
+    if suggestions:
+        parts.append("To improve: " + " ".join(suggestions))
+    return " ".join(parts)
+
+
+async def aanswer(session, answer):
+    """
+    Score ``answer`` to the current question of a session from ``aclaim``
+    and yield ``(event, data)``: ``("score", ...)``, then ``(None, text)``
+    feedback chunks, then ``("next", ...)`` once the session is saved.
+    """
+    try:
+        number = session.current
+        question = session.questions[number]
+        score, strengths, suggestions = score_answer(question, answer)
+        yield "score", {"number": number, "score": score, "out_of": MAX_SCORE}
+
+        prompt = (
+            f"Interview level: {session.level}\nCourse: {session.course_name}\n"
+            f"Question: {question['text']}\nAnswer: {answer}\n"
+            f"Automatic score: {score}/{MAX_SCORE}"
+        )
+        feedback = []
+        async for text in get_provider().astream(SYSTEM_PROMPT, prompt, _offline_feedback(score, strengths, suggestions)):
+            feedback.append(text)
+            yield None, text
+
+        session.answers.append({"answer": answer, "score": score, "feedback": "".join(feedback).strip()})
+        await asave(session)
+        yield "next", {"question": session.question(), "summary": session.summary() if session.finished else None}
+    finally:
+        await arelease(session.id)
@@ -0,0 +1,267 @@
+# myapp/job_import.py
+"""
+Streaming bulk import of partner job feeds (CSV or JSON Lines).
+
+Rows are read one at a time and written in batches, so memory stays flat
+however big the feed is. Each row is upserted on its natural key
+``(company, title, location)``: new postings are ``bulk_create``d,
+changed ones ``bulk_update``d (only the columns present in the feed), and
+identical ones skipped. ``course`` is given by name and resolved through
+one map loaded up front. A new posting must carry every required Job
+column. A bad row is reported with its line number and skipped; the rest
+of its batch is still written. If the database rejects a batch, it is
+retried one row at a time so only the rows at fault are reported.
+
+Used by ``manage.py import_jobs`` and the "Import jobs" admin page.
+"""
+import csv
+import io
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import facets, recommendations, search, suggest
+from .course_bundle import invalidate_course_bundle
+from .models import Course, Job
+from .salary import salary_fields
+from .skills import sync_job_skills
+
+NATURAL_KEY = ("company", "title", "location")
+# feed columns that map straight onto Job fields
+IMPORT_FIELDS = (
+    "title", "company", "location", "job_type", "salary_range", "posted_days", "posted_at",
+    "openings", "responsibilities", "role", "candidate_type", "employment_type",
+    "education", "skills", "about_company",
+)
+MAX_REPORTED_ERRORS = 1000
+# legacy "posted_days" text: "Today", "5 hours ago", "3 days ago", "30+ days ago", "2 weeks ago"
+POSTED_RE = re.compile(r"^\s*(\d+)\+?\s*(hour|day|week|month|year)s?\s+ago\s*$", re.IGNORECASE)
+UNIT_DAYS = {"hour": 1 / 24, "day": 1, "week": 7, "month": 30, "year": 365}
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)  # [(line, message)], first MAX_REPORTED_ERRORS
+
+    def error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def summary(self):
+        return f"{self.created} created, {self.updated} updated, {self.unchanged} unchanged, {self.failed} failed"
+
+
+def detect_format(name):
+    return "jsonl" if name.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def iter_rows(stream, fmt):
+    """Yield ``(line, row)`` from a binary file object; ``row`` is an error message for unparsable lines."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "jsonl":
+        for line, raw in enumerate(text, start=1):
+            if not raw.strip():
+                continue
+            try:
+                row = json.loads(raw)
+            except ValueError as exc:
+                yield line, f"invalid JSON: {exc}"
+                continue
+            yield line, row if isinstance(row, dict) else "expected a JSON object"
+    else:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def parse_posted_days(text, now=None):
+    """``now`` minus the age in a "3 days ago" style string, or None if it doesn't parse."""
+    now = now or timezone.now()
+    text = (text or "").strip().lower()
+    if text in ("today", "just now"):
+        return now
+    match = POSTED_RE.match(text)
+    if not match:
+        return None
+    return now - timedelta(days=int(match.group(1)) * UNIT_DAYS[match.group(2).lower()])
+
+
+def _clean(row, course_ids):
+    """Turn one feed row into Job field values; raises ValidationError."""
+    values = {}
+    for name in IMPORT_FIELDS:
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+            if not value and name in ("posted_at", "openings"):
+                value = None  # an empty CSV cell means "not given"
+        if value is not None:
+            values[name] = value
+
+    if "posted_at" in values:
+        posted_at = values["posted_at"]
+        parsed = parse_datetime(posted_at) if isinstance(posted_at, str) else None
+        if parsed is None:
+            raise ValidationError(f"posted_at: not an ISO datetime: {posted_at!r}")
+        values["posted_at"] = timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    course_name = (row.get("course") or "").strip()
+    if course_name:
+        if course_name.lower() not in course_ids:
+            raise ValidationError(f"course: unknown course {course_name!r}")
+        values["course_id"] = course_ids[course_name.lower()]
+
+    for name in NATURAL_KEY:
+        if not values.get(name):
+            raise ValidationError(f"{name}: required")
+
+    job = Job(**values)
+    # course was resolved above; checking it again would cost a query per row
+    job.clean_fields(exclude=[f.name for f in Job._meta.fields if f.attname not in values or f.name == "course"])
+    values = {name: getattr(job, name) for name in values}  # converted, e.g. "3" -> 3
+    if "salary_range" in values:
+        # bulk writes skip Job.save(), which normally parses these
+        values.update(salary_fields(values["salary_range"]))
+    return values
+
+
+def _check_required(values):
+    """A new posting needs every required Job column; updates only touch the columns given."""
+    # course was resolved by _clean
+    Job(**values).clean_fields(exclude=["course"])
+
+
+def _message(exc):
+    if hasattr(exc, "error_dict"):
+        return "; ".join(f"{name}: {' '.join(errors)}" for name, errors in exc.message_dict.items())
+    return "; ".join(exc.messages)
+
+
+def _with_posted_at(values):
+    """Older feeds only carry the posted_days text; derive the indexed posted_at from it."""
+    if "posted_at" in values or "posted_days" not in values:
+        return values
+    posted_at = parse_posted_days(values["posted_days"])
+    return values if posted_at is None else {**values, "posted_at": posted_at}
+
+
+class JobImporter:
+    def __init__(self, batch_size=1000, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.result = ImportResult()
+        # the single course lookup for the whole import
+        self.course_ids = {name.lower(): pk for pk, name in Course.objects.values_list("id", "name")}
+        self.changed_ids = []
+
+    def run(self, rows):
+        batch = {}
+        for line, row in rows:
+            if not isinstance(row, dict):
+                self.result.error(line, row)
+                continue
+            try:
+                values = _clean(row, self.course_ids)
+            except ValidationError as exc:
+                self.result.error(line, _message(exc))
+                continue
+            # a key repeated inside one batch: the later row wins
+            batch[tuple(values[name] for name in NATURAL_KEY)] = (line, values)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = {}
+        if batch:
+            self._flush(batch)
+        self._finish()
+        return self.result
+
+    def _existing(self, keys):
+        companies, titles, locations = (set(column) for column in zip(*keys))
+        found = {}
+        candidates = Job.objects.filter(company__in=companies, title__in=titles, location__in=locations).order_by("id")
+        for job in candidates:
+            found.setdefault((job.company, job.title, job.location), job)  # oldest duplicate wins
+        return found
+
+    def _flush(self, batch):
+        existing = self._existing(batch.keys())
+        to_create, to_update, update_fields, reskilled = [], [], set(), set()
+        for key, (line, values) in batch.items():
+            job = existing.get(key)
+            if job is None or ("posted_days" in values and values["posted_days"] != job.posted_days):
+                values = _with_posted_at(values)
+            if job is None:
+                try:
+                    _check_required(values)
+                except ValidationError as exc:
+                    self.result.error(line, _message(exc))
+                    continue
+                to_create.append((line, values))
+                continue
+            changed = [name for name, value in values.items() if getattr(job, name) != value]
+            if not changed:
+                self.result.unchanged += 1
+                continue
+            for name in changed:
+                setattr(job, name, values[name])
+            update_fields.update(changed)
+            to_update.append((line, job))
+            if "skills" in changed:
+                reskilled.add(job.pk)
+
+        if self.dry_run:
+            self.result.created += len(to_create)
+            self.result.updated += len(to_update)
+            return
+        try:
+            self._write(to_create, to_update, update_fields, reskilled)
+        except DatabaseError:
+            # find the rows at fault: one savepoint each, so the rest still go in
+            rows = [([row], []) for row in to_create] + [([], [row]) for row in to_update]
+            for row_create, row_update in rows:
+                try:
+                    self._write(row_create, row_update, update_fields, reskilled)
+                except DatabaseError as exc:
+                    line, _ = (row_create or row_update)[0]
+                    self.result.error(line, str(exc))
+
+    def _write(self, to_create, to_update, update_fields, reskilled):
+        """Write ``(line, values)`` creates and ``(line, job)`` updates atomically."""
+        to_update = [job for _, job in to_update]
+        with transaction.atomic():
+            created = Job.objects.bulk_create([Job(**values) for _, values in to_create])
+            if created and created[0].pk is None:
+                # backends that don't return ids from bulk inserts (MySQL)
+                keys = {tuple(getattr(job, name) for name in NATURAL_KEY) for job in created}
+                created = list(self._existing(keys).values())
+            if to_update:
+                Job.objects.bulk_update(to_update, sorted(update_fields))
+            # bulk writes skip the post_save receivers; do their work here
+            sync_job_skills(created + [job for job in to_update if job.pk in reskilled])
+            search.index_jobs(created + to_update)
+        self.result.created += len(created)
+        self.result.updated += len(to_update)
+        self.changed_ids.extend(job.pk for job in created + to_update)
+
+    def _finish(self):
+        if self.changed_ids:
+            recommendations.jobs_changed(self.changed_ids)
+            facets.invalidate()
+            suggest.changed()
+            invalidate_course_bundle()
+
+
+def import_jobs(stream, fmt="csv", batch_size=1000, dry_run=False):
+    """Import a binary CSV/JSONL stream; returns an ImportResult."""
+    return JobImporter(batch_size=batch_size, dry_run=dry_run).run(iter_rows(stream, fmt))
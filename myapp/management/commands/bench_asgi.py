@@ -0,0 +1,258 @@
+import asyncio
+import json
+import os
+import platform
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+import django
+import httpx
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from myapp.models import Job, UserProfile
+
+from .bench_funnel import percentile
+
+WSGI_CMD = ("gunicorn myproject.wsgi:application --bind 127.0.0.1:{port} "
+            "--workers {workers} --threads {threads} --worker-class gthread")
+ASGI_CMD = ("uvicorn myproject.asgi:application --host 127.0.0.1 --port {port} "
+            "--workers {workers} --no-access-log")
+DEPLOYMENTS = {  # name: (server, ASYNC_JOB_VIEWS)
+    "wsgi": ("wsgi", "0"),
+    "asgi": ("asgi", "1"),
+    "asgi-sync": ("asgi", "0"),  # ASGI server, sync views: separates the server from the views
+}
+SEARCH_TERMS = ("", "python", "developer", "data")
+BENCH_USER = "bench-asgi@example.com"
+
+
+def tree_rss(pid):
+    """Resident memory in bytes of ``pid`` and all its descendants (Linux /proc); None elsewhere."""
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as fh:
+                    ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    total, todo = 0, [pid]
+    while todo:
+        current = todo.pop()
+        todo.extend(children.get(current, ()))
+        try:
+            with open(f"/proc/{current}/status") as fh:
+                for line in fh:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total
+
+
+class Server:
+    """One deployment running in its own process group."""
+
+    def __init__(self, command, env, port, log_path):
+        self.command, self.env, self.port = command, env, port
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.log = open(log_path, "w")
+        self.process = None
+
+    def start(self, probe, timeout=30):
+        self.process = subprocess.Popen(
+            shlex.split(self.command), env=self.env, cwd=settings.BASE_DIR,
+            stdout=self.log, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"`{self.command}` exited with {self.process.returncode}; see {self.log.name}")
+            try:
+                if httpx.get(self.base_url + probe, headers={"Host": "localhost"}, timeout=2).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+        self.stop()
+        raise CommandError(f"`{self.command}` didn't answer within {timeout}s; see {self.log.name}")
+
+    def rss(self):
+        return tree_rss(self.process.pid)
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        self.log.close()
+
+
+async def drive(server, urls, concurrency, duration, headers):
+    """``concurrency`` keep-alive connections requesting ``urls`` in turn for ``duration`` seconds."""
+    latencies, statuses = [], Counter()
+    peak_rss = server.rss() or 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=server.base_url, headers=headers, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def connection_loop(n):
+            i = n
+            while time.perf_counter() < deadline:
+                url, i = urls[i % len(urls)], i + concurrency
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                except httpx.HTTPError as exc:
+                    statuses[type(exc).__name__] += 1
+                    continue
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+
+        async def sample_memory():
+            nonlocal peak_rss
+            while time.perf_counter() < deadline:
+                peak_rss = max(peak_rss, server.rss() or 0)
+                await asyncio.sleep(0.25)
+
+        start = time.perf_counter()
+        await asyncio.gather(sample_memory(), *(connection_loop(n) for n in range(concurrency)))
+        wall = time.perf_counter() - start
+    return latencies, statuses, peak_rss, wall
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the job pages (job_list, job_detail, job_search, plan_select) from gunicorn (WSGI, "
+        "sync views) and uvicorn (ASGI, async views) in turn, drive each at several concurrent "
+        "connection counts, and compare requests/sec, latency and server memory per connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--deployments", default="wsgi,asgi,asgi-sync", help=f"Any of: {', '.join(DEPLOYMENTS)}.")
+        parser.add_argument("--concurrency", default="10,100,500", help="Concurrent connections per run.")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level.")
+        parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+        parser.add_argument("--threads", type=int, default=8, help="Threads per gunicorn worker (WSGI).")
+        parser.add_argument("--port", type=int, default=8701)
+        parser.add_argument("--wsgi-cmd", default=WSGI_CMD, help="WSGI server command ({port}, {workers}, {threads}).")
+        parser.add_argument("--asgi-cmd", default=ASGI_CMD, help="ASGI server command ({port}, {workers}).")
+        parser.add_argument("--output", default=None, help="JSON results file (default: bench-asgi-<timestamp>.json).")
+
+    def handle(self, *args, **options):
+        deployments = [name.strip() for name in options["deployments"].split(",") if name.strip()]
+        unknown = set(deployments) - set(DEPLOYMENTS)
+        if unknown:
+            raise CommandError(f"Unknown deployment(s): {', '.join(sorted(unknown))}")
+        levels = [int(n) for n in options["concurrency"].split(",") if n.strip()]
+        job_ids = list(Job.objects.order_by("-posted_at", "-id").values_list("id", flat=True)[:100])
+        if not job_ids:
+            raise CommandError("Needs Jobs; run seed_load first.")
+        if connection.vendor == "sqlite" and settings.DATABASES["default"]["NAME"] == ":memory:":
+            raise CommandError("The servers need a database they can share with this command.")
+
+        urls = self.bench_urls(job_ids)
+        headers = {"Host": "localhost", "Cookie": f"{settings.SESSION_COOKIE_NAME}={self.session_key()}"}
+
+        results = {}
+        for n, name in enumerate(deployments):
+            kind, async_views = DEPLOYMENTS[name]
+            env = {**os.environ, "ASYNC_JOB_VIEWS": async_views, "SECURE_SSL_REDIRECT": "0", "DEBUG": "0"}
+            command = options[f"{kind}_cmd"].format(port=options["port"] + n, workers=options["workers"], threads=options["threads"])
+            server = Server(command, env, options["port"] + n, f"bench-asgi-{name}.log")
+            self.stdout.write(f"{name}: {command}")
+            server.start(probe=reverse("job_search"))
+            try:
+                results[name] = self.run_levels(server, urls, headers, levels, options["duration"])
+            finally:
+                server.stop()
+
+        report = {
+            "meta": {
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "workers": options["workers"],
+                "threads": options["threads"],
+                "duration_seconds": options["duration"],
+                "urls": len(urls),
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "platform": sys.platform,
+            },
+            "results": results,
+        }
+        output = options["output"] or f"bench-asgi-{datetime.now():%Y%m%d-%H%M%S}.json"
+        with open(output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        self.print_report(report)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def bench_urls(self, job_ids):
+        urls = [reverse("job_list"), reverse("plan_select")]
+        urls += [reverse("job_detail", args=[job_id]) for job_id in job_ids[:20]]
+        urls += [reverse("job_search") + (f"?keyword={term}" if term else "") for term in SEARCH_TERMS]
+        return urls
+
+    def session_key(self):
+        """A signed-in session in the shared session store, for the login-only pages."""
+        user, created = User.objects.get_or_create(username=BENCH_USER, defaults={"email": BENCH_USER})
+        UserProfile.objects.get_or_create(user=user)
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def run_levels(self, server, urls, headers, levels, duration):
+        # warm every worker's caches and indexes before measuring
+        asyncio.run(drive(server, urls, max(levels[0], 4), min(duration, 3), headers))
+        idle_rss = server.rss()
+        rows = {}
+        for concurrency in levels:
+            latencies, statuses, peak_rss, wall = asyncio.run(drive(server, urls, concurrency, duration, headers))
+            latencies.sort()
+            ok = statuses.get(200, 0)
+            grown = max(peak_rss - idle_rss, 0) if idle_rss else None
+            rows[str(concurrency)] = {
+                "requests": sum(statuses.values()),
+                "ok": ok,
+                "statuses": {str(status): count for status, count in statuses.items()},
+                "requests_per_second": round(ok / wall, 1) if wall else None,
+                **{
+                    f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 1) if latencies else None
+                    for pct in (50, 95, 99)
+                },
+                "idle_rss_mib": round(idle_rss / 2**20, 1) if idle_rss else None,
+                "peak_rss_mib": round(peak_rss / 2**20, 1) if peak_rss else None,
+                "kib_per_connection": round(grown / concurrency / 1024, 1) if grown is not None else None,
+            }
+        return rows
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{'deployment':<12}{'conns':>7}{'ok':>8}{'errors':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+            f"{'idle MiB':>10}{'peak MiB':>10}{'KiB/conn':>10}"
+        )
+        for name, rows in report["results"].items():
+            for concurrency, row in rows.items():
+                self.stdout.write(
+                    f"{name:<12}{concurrency:>7}{row['ok']:>8}{row['requests'] - row['ok']:>8}"
+                    f"{row['requests_per_second'] or 0:>9}{row['p50_ms'] or 0:>9}{row['p95_ms'] or 0:>9}"
+                    f"{row['p99_ms'] or 0:>9}{row['idle_rss_mib'] or 0:>10}{row['peak_rss_mib'] or 0:>10}"
+                    f"{row['kib_per_connection'] if row['kib_per_connection'] is not None else '-':>10}"
+                )
@@ -0,0 +1,273 @@
+import json
+import platform
+import re
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from myapp.fake_razorpay import start_in_thread
+from myapp.models import DailyApplicationQuota, Job, Plan, UserProfile
+
+STEPS = (
+    "login", "job_search", "job_detail", "apply_job",
+    "plan_select", "select_plan", "payment_callback", "confirm_courses",
+)
+PASSWORD = "bench-password"
+FAKE_KEY_ID, FAKE_KEY_SECRET = "rzp_test_bench", "bench_secret"
+ORDER_ID_RE = re.compile(r'"order_id":\s*"([^"]+)"')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class StepFailed(Exception):
+    pass
+
+
+class VirtualUser:
+    """One simulated candidate walking the apply-and-pay funnel."""
+
+    def __init__(self, user, jobs, plan, gateway_url, terms):
+        self.user = user
+        self.jobs = jobs
+        self.plan = plan
+        self.gateway_url = gateway_url
+        self.terms = terms
+        self.samples = {step: [] for step in STEPS}  # (seconds, queries)
+        self.errors = {step: 0 for step in STEPS}
+        self.completed = 0
+        self._queries = 0
+
+    def _count(self, execute, sql, params, many, context):
+        self._queries += 1
+        return execute(sql, params, many, context)
+
+    def _step(self, name, call, expect):
+        self._queries = 0
+        start = time.perf_counter()
+        try:
+            response = call()
+        except Exception as exc:  # e.g. "database is locked" under SQLite
+            self.errors[name] += 1
+            raise StepFailed(f"{name}: {exc!r}") from exc
+        elapsed = time.perf_counter() - start
+        if response.status_code not in expect:
+            self.errors[name] += 1
+            raise StepFailed(f"{name}: HTTP {response.status_code}")
+        self.samples[name].append((elapsed, self._queries))
+        return response
+
+    def reset(self):
+        # every iteration starts from "signed up, no plan yet", outside the timings
+        UserProfile.objects.filter(user=self.user).update(plan=None, plan_start=None, plan_end=None)
+        DailyApplicationQuota.objects.filter(user=self.user).delete()
+
+    def run_once(self, rng_index):
+        job = self.jobs[rng_index % len(self.jobs)]
+        term = self.terms[rng_index % len(self.terms)]
+        client = Client(SERVER_NAME="localhost")
+        self.reset()
+
+        self._step("login", lambda: client.post(
+            reverse("login"), {"email": self.user.username, "password": PASSWORD}, secure=True), (302,))
+        self._step("job_search", lambda: client.get(reverse("job_search"), {"keyword": term}, secure=True), (200,))
+        self._step("job_detail", lambda: client.get(reverse("job_detail", args=[job.id]), secure=True), (200,))
+        self._step("apply_job", lambda: client.post(reverse("apply_job", args=[job.id]), {
+            "full_name": self.user.get_full_name() or "Bench User", "email": self.user.email,
+            "mobile": "9000000000", "city": "Chennai", "gender": "female", "languages": "English, Tamil",
+            "work_status": "Fresher", "experience_years": "1", "qualification": "B.E", "passed_out_year": "2024",
+        }, secure=True), (302,))
+        self._step("plan_select", lambda: client.post(
+            reverse("plan_select"), {"plan_id": self.plan.id}, secure=True), (302,))
+        checkout = self._step("select_plan", lambda: client.get(
+            reverse("select_plan", args=[self.plan.id]), secure=True), (200,))
+
+        match = ORDER_ID_RE.search(checkout.content.decode())
+        if not match:
+            self.errors["select_plan"] += 1
+            raise StepFailed("select_plan: no order id on the checkout page")
+        # the customer completing Razorpay Checkout; not part of our timings
+        fields = self._pay(match.group(1))
+
+        self._step("payment_callback", lambda: client.post(
+            reverse("payment_callback"), fields, secure=True), (302,))
+        self._step("confirm_courses", lambda: client.get(
+            reverse("confirm_courses_course", args=[job.course_id]), secure=True), (200,))
+        self.completed += 1
+
+    def _pay(self, order_id):
+        request = urllib.request.Request(f"{self.gateway_url}/v1/orders/{order_id}/pay", method="POST")
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    def run(self, iterations, offset, barrier):
+        barrier.wait()
+        with connection.execute_wrapper(self._count):
+            for i in range(iterations):
+                try:
+                    self.run_once(offset + i)
+                except StepFailed:
+                    continue
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the apply-and-pay funnel (login -> job_search -> job_detail -> apply_job -> "
+        "plan_select -> select_plan -> payment_callback -> confirm_courses) with concurrent "
+        "virtual users against a local fake Razorpay, and save the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users (threads).")
+        parser.add_argument("--iterations", type=int, default=10, help="Funnel runs per virtual user.")
+        parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per user before measuring.")
+        parser.add_argument("--gateway-latency-ms", type=int, default=0, help="Simulated Razorpay API latency.")
+        parser.add_argument("--search-terms", default="python,developer,data,java,remote")
+        parser.add_argument("--output", default=None, help="JSON results file (default: bench-funnel-<timestamp>.json).")
+        parser.add_argument("--compare", default=None, help="Earlier results file to diff against.")
+
+    def handle(self, *args, **options):
+        plan = Plan.objects.filter(price__gt=0).order_by("price").first()
+        if plan is None:
+            raise CommandError("Needs a paid Plan; run seed_load first.")
+        jobs = list(Job.objects.filter(course__isnull=False).order_by("-posted_at", "-id")[:200])
+        if not jobs:
+            raise CommandError("Needs Jobs linked to a Course; run seed_load first.")
+        terms = [term.strip() for term in options["search_terms"].split(",") if term.strip()]
+
+        gateway = start_in_thread(key_id=FAKE_KEY_ID, key_secret=FAKE_KEY_SECRET,
+                                  latency=options["gateway_latency_ms"] / 1000)
+        gateway_url = f"http://127.0.0.1:{gateway.server_address[1]}"
+        users = self.bench_users(options["users"])
+
+        try:
+            with override_settings(
+                RAZORPAY_BASE_URL=gateway_url, RAZORPAY_KEY_ID=FAKE_KEY_ID, RAZORPAY_KEY_SECRET=FAKE_KEY_SECRET,
+                RAZORPAY_CHECKOUT_JS=f"{gateway_url}/v1/checkout.js",
+            ):
+                if options["warmup"]:
+                    self.run_threads(users, jobs, plan, gateway_url, terms, options["warmup"])
+                results, wall = self.run_threads(users, jobs, plan, gateway_url, terms, options["iterations"])
+        finally:
+            gateway.shutdown()
+            gateway.server_close()
+
+        report = self.build_report(results, wall, options)
+        output = options["output"] or f"bench-funnel-{datetime.now():%Y%m%d-%H%M%S}.json"
+        with open(output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+        self.print_report(report)
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                self.print_comparison(json.load(fh), report)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def bench_users(self, count):
+        users = []
+        for i in range(count):
+            email = f"bench-{i}@example.com"
+            user, created = User.objects.get_or_create(
+                username=email, defaults={"email": email, "first_name": "Bench", "last_name": str(i)}
+            )
+            if created:
+                user.set_password(PASSWORD)
+                user.save(update_fields=["password"])
+            UserProfile.objects.get_or_create(user=user)
+            users.append(user)
+        return users
+
+    def run_threads(self, users, jobs, plan, gateway_url, terms, iterations):
+        vusers = [VirtualUser(user, jobs, plan, gateway_url, terms) for user in users]
+        barrier = threading.Barrier(len(vusers) + 1)
+        threads = [
+            threading.Thread(target=vu.run, args=(iterations, n * iterations, barrier), name=f"vu-{n}")
+            for n, vu in enumerate(vusers)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return vusers, time.perf_counter() - start
+
+    def build_report(self, vusers, wall, options):
+        steps = {}
+        for step in STEPS:
+            samples = [sample for vu in vusers for sample in vu.samples[step]]
+            latencies = sorted(seconds for seconds, _ in samples)
+            queries = [n for _, n in samples]
+            steps[step] = {
+                "requests": len(samples),
+                "errors": sum(vu.errors[step] for vu in vusers),
+                "throughput_rps": round(len(samples) / wall, 2) if wall else None,
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                **{
+                    f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 2) if latencies else None
+                    for pct in (50, 95, 99)
+                },
+                "queries_mean": round(sum(queries) / len(queries), 2) if queries else None,
+                "queries_max": max(queries) if queries else None,
+            }
+        completed = sum(vu.completed for vu in vusers)
+        return {
+            "meta": {
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "virtual_users": options["users"],
+                "iterations_per_user": options["iterations"],
+                "gateway_latency_ms": options["gateway_latency_ms"],
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "debug": settings.DEBUG,
+            },
+            "funnel": {
+                "completed": completed,
+                "attempted": options["users"] * options["iterations"],
+                "wall_seconds": round(wall, 3),
+                "funnels_per_second": round(completed / wall, 2) if wall else None,
+                "requests_per_second": round(sum(s["requests"] for s in steps.values()) / wall, 2) if wall else None,
+            },
+            "steps": steps,
+        }
+
+    def print_report(self, report):
+        funnel = report["funnel"]
+        self.stdout.write(
+            f"{funnel['completed']}/{funnel['attempted']} funnels in {funnel['wall_seconds']}s "
+            f"({funnel['funnels_per_second']} funnels/s, {funnel['requests_per_second']} req/s)"
+        )
+        self.stdout.write(f"{'step':<18}{'req':>6}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}")
+        for step, row in report["steps"].items():
+            self.stdout.write(
+                f"{step:<18}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps'] or 0:>9}"
+                f"{row['p50_ms'] or 0:>9}{row['p95_ms'] or 0:>9}{row['p99_ms'] or 0:>9}{row['queries_mean'] or 0:>9}"
+            )
+
+    def print_comparison(self, before, after):
+        self.stdout.write("p95 ms / mean queries vs. baseline:")
+        for step, row in after["steps"].items():
+            old = before.get("steps", {}).get(step)
+            if not old or not old.get("p95_ms") or not row["p95_ms"]:
+                continue
+            change = (row["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+            self.stdout.write(
+                f"  {step:<18}{old['p95_ms']:>9} -> {row['p95_ms']:<9}({change:+.1f}%)  "
+                f"queries {old['queries_mean']} -> {row['queries_mean']}"
+            )
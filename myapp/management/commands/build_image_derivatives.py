@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from myapp.images import generate_derivatives
+from myapp.models import Application, Course, InterviewQuestion, JobVideo, UserProfile
+
+MODELS = (Application, UserProfile, Course, JobVideo, InterviewQuestion)
+
+
+class Command(BaseCommand):
+    help = "Generate missing WebP/JPEG derivatives for images uploaded before the pipeline existed."
+
+    def handle(self, *args, **options):
+        done = failed = 0
+        for model in MODELS:
+            for field in model._meta.concrete_fields:
+                if not isinstance(field, models.ImageField):
+                    continue
+                names = (
+                    model.objects.exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+                    .values_list(field.name, flat=True).distinct().iterator()
+                )
+                for name in names:
+                    try:
+                        generate_derivatives(name)
+                        done += 1
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"{model.__name__}.{field.name} {name}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"{done} image(s) processed, {failed} failed."))
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from myapp import recommendations
+
+
+class Command(BaseCommand):
+    help = "Build the job recommendation matrix (and save it to RECOMMENDER_INDEX_PATH, if set)."
+
+    def handle(self, *args, **options):
+        index = recommendations.rebuild()
+        where = settings.RECOMMENDER_INDEX_PATH or "this process only (RECOMMENDER_INDEX_PATH is not set)"
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index.job_ids)} jobs x {len(index.names)} terms "
+            f"({len(index.col_rows)} non-zeros) -> {where}."
+        ))
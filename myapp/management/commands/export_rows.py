@@ -0,0 +1,64 @@
+import sys
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from myapp.exports import CHUNK_SIZE, iter_lines
+from myapp.models import Application, Payment
+
+MODELS = {"applications": Application, "payments": Payment}
+
+
+def start_of_day(value, option, days=0):
+    """Midnight (current time zone) of a YYYY-MM-DD date, plus ``days``; CommandError if it doesn't parse."""
+    try:
+        day = parse_date(value)
+    except ValueError:  # well formed but not a date, e.g. 2024-02-30
+        day = None
+    if day is None:
+        raise CommandError(f"{option}: expected a date as YYYY-MM-DD, got {value!r}")
+    return timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+
+
+class Command(BaseCommand):
+    help = "Stream Applications or Payments to CSV/JSONL (stdout or --output), optionally filtered."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=sorted(MODELS))
+        parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+        parser.add_argument("--output", "-o", default=None, help="File to write (default: stdout).")
+        parser.add_argument("--since", help="Created on or after this date (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Created on or before this date (YYYY-MM-DD).")
+        parser.add_argument("--plan", help="Plan name (case-insensitive).")
+        parser.add_argument("--status", help="Payments only: CREATED / SUCCESS / FAILED.")
+        parser.add_argument("--job", type=int, help="Applications only: job id.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = MODELS[options["model"]].objects.all()
+        # plain created_at ranges, which can use an index; __date can't
+        if options["since"]:
+            queryset = queryset.filter(created_at__gte=start_of_day(options["since"], "--since"))
+        if options["until"]:
+            queryset = queryset.filter(created_at__lt=start_of_day(options["until"], "--until", days=1))
+        if options["plan"]:
+            queryset = queryset.filter(plan__name__iexact=options["plan"])
+        if options["status"] and queryset.model is Payment:
+            queryset = queryset.filter(status=options["status"].upper())
+        if options["job"] and queryset.model is Application:
+            queryset = queryset.filter(job_id=options["job"])
+
+        out = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else sys.stdout
+        lines = 0
+        try:
+            for line in iter_lines(queryset, options["format"], options["chunk_size"]):
+                out.write(line)
+                lines += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        rows = lines - 1 if options["format"] == "csv" else lines  # CSV has a header line
+        if options["output"]:
+            self.stdout.write(self.style.SUCCESS(f"Exported {rows} row(s) to {options['output']}."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.job_import import detect_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV/JSONL job feed into Job, upserting on (company, title, location)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"), default=None,
+                            help="Default: from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Validate and diff without writing.")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+        try:
+            with open(options["path"], "rb") as stream:
+                result = import_jobs(stream, fmt, batch_size=options["batch_size"], dry_run=options["dry_run"])
+        except OSError as exc:
+            raise CommandError(exc)
+
+        for line, message in result.errors:
+            self.stderr.write(f"line {line}: {message}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... and {result.failed - len(result.errors)} more errors")
+        prefix = "Dry run: " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(f"{prefix}{result.summary()}."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from myapp.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Recompute UserProfile.completion_score in the database, one UPDATE per primary-key range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        bounds = UserProfile.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            self.stdout.write("No profiles.")
+            return
+
+        expression = UserProfile.completion_score_expression()
+        changed = 0
+        for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+            # only rows whose stored score is stale are rewritten
+            changed += (
+                UserProfile.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+                .exclude(completion_score=expression)
+                .update(completion_score=expression)
+            )
+        self.stdout.write(self.style.SUCCESS(f"Updated {changed} profile completion score(s)."))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.reconciliation import reconcile_pending
+
+
+class Command(BaseCommand):
+    help = "Apply queued Razorpay webhook events to Payment rows and user plans, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep polling the queue instead of exiting when it is empty.")
+        parser.add_argument("--interval", type=float, default=5.0,
+                            help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = reconcile_pending(batch_size=options["batch_size"])
+            if processed or not options["loop"]:
+                self.stdout.write(f"Reconciled {processed} payment event(s).")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
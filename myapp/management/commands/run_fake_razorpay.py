@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from myapp.fake_razorpay import make_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in for the Razorpay API. Point RAZORPAY_BASE_URL and "
+        "RAZORPAY_CHECKOUT_JS at it to run the checkout flow offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency-ms", type=int, default=0,
+                            help="Artificial delay added to every response.")
+        parser.add_argument("--quiet", action="store_true")
+
+    def handle(self, *args, **options):
+        server = make_server(
+            options["host"], options["port"],
+            settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET,
+            latency=options["latency_ms"] / 1000, verbose=not options["quiet"],
+        )
+        base = f"http://{options['host']}:{server.server_address[1]}"
+        self.stdout.write(self.style.SUCCESS(f"Fake Razorpay listening on {base}"))
+        self.stdout.write(f"  RAZORPAY_BASE_URL={base}")
+        self.stdout.write(f"  RAZORPAY_CHECKOUT_JS={base}/v1/checkout.js")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,296 @@
+import random
+import zlib
+from array import array
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from myapp import facets, search, suggest
+from myapp.course_bundle import invalidate_course_bundle
+from myapp.models import Application, Course, Job, Payment, Plan, Topic, UserProfile
+from myapp.salary import salary_fields
+from myapp.skills import sync_job_skills
+
+# role -> (tools, skill pool)
+CATALOG = {
+    "Python Developer": ("Python, Django, Flask", ["Python", "Django", "Flask", "REST APIs", "PostgreSQL", "Git", "Docker", "Celery", "Redis", "pytest"]),
+    "Data Analyst": ("Excel, SQL, Power BI", ["SQL", "Excel", "Power BI", "Tableau", "Python", "Pandas", "Statistics", "Data Visualization"]),
+    "Data Scientist": ("Python, Pandas, Scikit-learn", ["Python", "Pandas", "NumPy", "Scikit-learn", "Machine Learning", "Statistics", "SQL", "TensorFlow"]),
+    "Java Developer": ("Java, Spring Boot, Hibernate", ["Java", "Spring Boot", "Hibernate", "Microservices", "MySQL", "Maven", "Git", "JUnit"]),
+    "Frontend Developer": ("HTML, CSS, JavaScript, React", ["HTML", "CSS", "JavaScript", "React", "TypeScript", "Redux", "Bootstrap", "Git"]),
+    "Full Stack Developer": ("React, Node.js, MongoDB", ["JavaScript", "React", "Node.js", "Express", "MongoDB", "REST APIs", "Git", "Docker"]),
+    "DevOps Engineer": ("AWS, Docker, Kubernetes", ["AWS", "Docker", "Kubernetes", "Linux", "Terraform", "Jenkins", "CI/CD", "Bash"]),
+    "Software Tester": ("Selenium, Java, TestNG", ["Manual Testing", "Selenium", "Java", "TestNG", "API Testing", "JIRA", "SQL", "Postman"]),
+    "Digital Marketing Executive": ("SEO, Google Ads, Analytics", ["SEO", "Google Ads", "Google Analytics", "Content Marketing", "Social Media", "Email Marketing"]),
+    "UI/UX Designer": ("Figma, Adobe XD", ["Figma", "Adobe XD", "Wireframing", "Prototyping", "User Research", "Photoshop"]),
+    "Business Analyst": ("Excel, SQL, JIRA", ["Requirements Gathering", "SQL", "Excel", "JIRA", "Power BI", "Stakeholder Management"]),
+    "Customer Support Executive": ("CRM, Zendesk", ["Communication", "CRM", "Zendesk", "Email Support", "Chat Support", "MS Office"]),
+}
+TITLE_LEVELS = ("Junior", "Associate", "", "Senior", "Lead")
+COMPANY_WORDS = ("Tech", "Soft", "Info", "Data", "Cloud", "Logic", "Nova", "Quantum", "Bright", "Vertex", "Zen", "Pixel")
+COMPANY_SUFFIXES = ("Solutions", "Systems", "Labs", "Technologies", "Pvt Ltd", "Services", "Analytics", "Digital")
+LOCATIONS = ("Remote", "Chennai", "Bengaluru", "Hyderabad", "Pune", "Mumbai", "Coimbatore", "Delhi NCR", "Kochi", "Madurai")
+JOB_TYPES = ("Full-time", "Part-time", "Contract", "Internship")
+EDUCATION = ("Any Graduate", "B.E/B.Tech", "B.Sc", "BCA", "MCA", "M.Sc", "MBA")
+FIRST_NAMES = ("Arun", "Priya", "Karthik", "Divya", "Vignesh", "Lakshmi", "Rahul", "Sneha", "Suresh", "Anitha", "Vijay", "Meena", "Ravi", "Kavya", "Ajay", "Deepa")
+LAST_NAMES = ("Kumar", "Raj", "Sharma", "Iyer", "Nair", "Reddy", "Patel", "Menon", "Krishnan", "Das", "Singh", "Pillai")
+CITIES = LOCATIONS[1:]
+QUALIFICATIONS = ("B.E", "B.Tech", "B.Sc", "BCA", "MCA", "MBA", "Diploma")
+PLAN_DEFAULTS = (("Basic", Decimal("0"), 5), ("Standard", Decimal("499"), None), ("Premium", Decimal("999"), None))
+
+
+def _posted_days(delta):
+    days = delta.days
+    if days <= 0:
+        return "Today"
+    return "1 day ago" if days == 1 else f"{days} days ago"
+
+
+@contextmanager
+def _explicit_timestamps(model, *field_names):
+    """Let bulk_create keep the given auto_now_add values instead of "now"."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [field.auto_now_add for field in fields]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in zip(fields, saved):
+            field.auto_now_add = value
+
+
+class Command(BaseCommand):
+    help = "Generate a large, deterministic synthetic dataset (users, profiles, courses, jobs, applications, payments)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--jobs", type=int, default=2000)
+        parser.add_argument("--courses", type=int, default=len(CATALOG))
+        parser.add_argument("--applications", type=int, default=10000)
+        parser.add_argument("--paid-ratio", type=float, default=0.3, help="Share of users with a paid plan (and a payment).")
+        parser.add_argument("--days", type=int, default=180, help="Spread timestamps over this many past days.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--prefix", default=None, help="Username/id prefix (default: load<seed>).")
+        parser.add_argument("--skip-index", action="store_true", help="Don't update the search index (run rebuild_search_index afterwards).")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.prefix = options["prefix"] or f"load{options['seed']}"
+        # 15 digits fits both UserProfile.mobile (unique) and Application.mobile
+        self.mobile_prefix = f"{zlib.crc32(self.prefix.encode()) % 10 ** 5:05d}"
+        self.now = timezone.now().replace(microsecond=0)
+        self.days = max(options["days"], 1)
+        self.skip_index = options["skip_index"]
+
+        if User.objects.filter(username__startswith=f"{self.prefix}-").exists():
+            raise CommandError(f"Rows with prefix '{self.prefix}' already exist; use another --seed or --prefix.")
+
+        plans = self.ensure_plans()
+        courses = self.seed_courses(options["courses"])
+        job_ids = self.seed_jobs(options["jobs"], courses)
+        user_ids = self.seed_users(options["users"], plans, options["paid_ratio"])
+        self.seed_applications(options["applications"], user_ids, job_ids)
+
+        facets.invalidate()
+        suggest.changed()
+        invalidate_course_bundle()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(user_ids)} users, {len(courses)} courses, {len(job_ids)} jobs, "
+            f"{options['applications'] if user_ids and job_ids else 0} applications (prefix '{self.prefix}')."
+        ))
+
+    def random_time(self):
+        return self.now - timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def chunks(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(start + self.batch_size, total))
+
+    # -------------------- PLANS / COURSES --------------------
+
+    def ensure_plans(self):
+        plans = list(Plan.objects.order_by("price", "id"))
+        if not plans:
+            plans = Plan.objects.bulk_create([
+                Plan(name=name, price=price, daily_application_limit=limit)
+                for name, price, limit in PLAN_DEFAULTS
+            ])
+        return plans
+
+    def seed_courses(self, count):
+        roles = list(CATALOG)
+        names = [roles[i % len(roles)] + (f" {i // len(roles) + 1}" if i >= len(roles) else "") for i in range(count)]
+        existing = set(Course.objects.filter(name__in=names).values_list("name", flat=True))
+        new = [
+            Course(name=name, course_tools=CATALOG[roles[i % len(roles)]][0])
+            for i, name in enumerate(names) if name not in existing
+        ]
+        Course.objects.bulk_create(new, batch_size=self.batch_size)
+        courses = list(Course.objects.filter(name__in=names))
+        role_of = {name: roles[i % len(roles)] for i, name in enumerate(names)}
+        self.course_roles = {course.pk: role_of[course.name] for course in courses}
+        Topic.objects.bulk_create([
+            Topic(course=course, title=f"{course.name} – Module {n}", order=n)
+            for course in courses if course.name not in existing
+            for n in range(1, self.rng.randint(8, 15) + 1)
+        ], batch_size=self.batch_size)
+        return courses
+
+    # -------------------- JOBS --------------------
+
+    def build_job(self, courses):
+        rng = self.rng
+        course = rng.choice(courses) if courses else None
+        role = self.course_roles[course.pk] if course else rng.choice(list(CATALOG))
+        pool = CATALOG[role][1]
+        level = rng.randrange(len(TITLE_LEVELS))
+        low = rng.choice((2, 3, 4, 5, 6, 8)) + level * rng.choice((1, 2, 3))
+        posted_at = self.random_time()
+        salary_range = f"₹{low} - {low + rng.randint(1, 6)} LPA"
+        return Job(
+            course=course,
+            title=f"{TITLE_LEVELS[level]} {role}".strip(),
+            company=f"{rng.choice(COMPANY_WORDS)}{rng.choice(COMPANY_WORDS).lower()} {rng.choice(COMPANY_SUFFIXES)}",
+            location=rng.choice(LOCATIONS),
+            job_type=rng.choices(JOB_TYPES, weights=(80, 5, 10, 5))[0],
+            salary_range=salary_range,
+            **salary_fields(salary_range),  # bulk_create skips Job.save()
+            posted_at=posted_at,
+            posted_days=_posted_days(self.now - posted_at),
+            openings=rng.randint(1, 10),
+            responsibilities="\n".join(
+                f"Work with {skill} on day-to-day deliverables" for skill in rng.sample(pool, 3)
+            ),
+            role=role,
+            candidate_type=rng.choice(("Fresher", "Experienced", "Fresher / Experienced")),
+            employment_type=rng.choice(("Permanent", "Contract", "Temporary")),
+            education=rng.choice(EDUCATION),
+            skills=", ".join(rng.sample(pool, rng.randint(3, min(6, len(pool))))),
+            about_company="A growing company hiring across India.",
+        )
+
+    def seed_jobs(self, count, courses):
+        job_ids = array("q")
+        for chunk in self.chunks(count):
+            with transaction.atomic():
+                jobs = Job.objects.bulk_create([self.build_job(courses) for _ in chunk])
+                sync_job_skills(jobs)
+                if not self.skip_index:
+                    search.index_jobs(jobs)
+            job_ids.extend(job.pk for job in jobs)
+            self.stdout.write(f"  jobs: {len(job_ids)}/{count}")
+        return job_ids
+
+    # -------------------- USERS / PROFILES / PAYMENTS --------------------
+
+    def seed_users(self, count, plans, paid_ratio):
+        rng = self.rng
+        password = make_password("password")  # hashing once keeps this fast
+        paid_plans = [plan for plan in plans if plan.price > 0] or plans
+        free_plan = next((plan for plan in plans if plan.price == 0), None)
+        user_ids = array("q")
+
+        for chunk in self.chunks(count):
+            users, people = [], []
+            for i in chunk:
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                joined = self.random_time()
+                users.append(User(
+                    username=f"{self.prefix}-{i}@example.com", email=f"{self.prefix}-{i}@example.com",
+                    first_name=first, last_name=last, password=password, date_joined=joined,
+                ))
+                people.append((i, first, last, joined))
+
+            with transaction.atomic():
+                users = User.objects.bulk_create(users)
+                profiles, payments = [], []
+                for user, (i, first, last, joined) in zip(users, people):
+                    role = rng.choice(list(CATALOG))
+                    plan = rng.choice(paid_plans) if rng.random() < paid_ratio else free_plan
+                    profile = UserProfile(
+                        user=user, full_name=f"{first} {last}", email=user.email,
+                        mobile=f"{self.mobile_prefix}{i:010d}", city=rng.choice(CITIES),
+                        gender=rng.choice(("Male", "Female")), languages="English, Tamil",
+                        work_status=rng.choice(("Fresher", "Experienced")),
+                        education=rng.choice(QUALIFICATIONS), course=role,
+                        skill=", ".join(rng.sample(CATALOG[role][1], 3)),
+                        current_role=role if rng.random() < 0.5 else None,
+                    )
+                    profile.completion_score = profile.compute_completion()  # bulk_create skips save()
+                    if plan is not None:
+                        profile.plan = plan
+                        profile.plan_start = joined.date()
+                        profile.plan_end = joined.date() + timedelta(days=365)
+                    profiles.append(profile)
+                    if plan is not None and plan.price > 0:
+                        payments.extend(self.build_payments(user, plan, joined))
+                UserProfile.objects.bulk_create(profiles)
+                with _explicit_timestamps(Payment, "created_at"):
+                    Payment.objects.bulk_create(payments)
+            user_ids.extend(user.pk for user in users)
+            self.stdout.write(f"  users: {len(user_ids)}/{count}")
+        return user_ids
+
+    def build_payments(self, user, plan, joined):
+        """A successful payment, sometimes preceded by a failed/abandoned attempt."""
+        ref = f"{self.prefix}_{user.pk}"
+        attempts = []
+        if self.rng.random() < 0.15:
+            attempts.append(Payment(
+                user=user, plan=plan, razorpay_order_id=f"order_{ref}_0", amount=float(plan.price),
+                status=self.rng.choice(("FAILED", "CREATED")), created_at=joined,
+            ))
+        attempts.append(Payment(
+            user=user, plan=plan, razorpay_order_id=f"order_{ref}_1", razorpay_payment_id=f"pay_{ref}",
+            razorpay_signature="seeded", amount=float(plan.price), status="SUCCESS",
+            created_at=joined + timedelta(minutes=self.rng.randint(1, 30)),
+        ))
+        return attempts
+
+    # -------------------- APPLICATIONS --------------------
+
+    def seed_applications(self, count, user_ids, job_ids):
+        if not user_ids or not job_ids:
+            return
+        rng = self.rng
+        created = 0
+        for chunk in self.chunks(count):
+            applicants = [user_ids[rng.randrange(len(user_ids))] for _ in chunk]
+            profiles = UserProfile.objects.in_bulk(applicants, field_name="user_id")
+            applications = []
+            for user_id in applicants:
+                profile = profiles[user_id]
+                applications.append(Application(
+                    user_id=user_id, job_id=job_ids[rng.randrange(len(job_ids))],
+                    full_name=profile.full_name, email=profile.email, mobile=profile.mobile,
+                    city=profile.city, gender=profile.gender, languages=profile.languages,
+                    work_status=profile.work_status, experience_years=str(rng.randint(0, 12)),
+                    qualification=profile.education, passed_out_year=str(rng.randint(2005, 2025)),
+                    updates_optin=rng.random() < 0.4, plan_id=profile.plan_id,
+                    plan_start=profile.plan_start, plan_end=profile.plan_end,
+                    created_at=self.random_time(),
+                ))
+            with _explicit_timestamps(Application, "created_at"):
+                Application.objects.bulk_create(applications)
+            created += len(applications)
+            self.stdout.write(f"  applications: {created}/{count}")
+
+        # keep Job.applicants consistent with the rows just written
+        counts = (
+            Application.objects.filter(job=OuterRef("pk")).order_by()
+            .values("job").annotate(n=Count("id")).values("n")
+        )
+        for chunk in self.chunks(len(job_ids)):
+            ids = job_ids[chunk.start:chunk.stop]
+            Job.objects.filter(pk__in=list(ids)).update(applicants=Coalesce(Subquery(counts), 0))
@@ -0,0 +1,350 @@
+# myapp/metrics.py
+"""
+Per-view performance metrics with a Prometheus text endpoint.
+
+MetricsMiddleware records, per resolved URL name, the wall time, number
+of DB queries, time spent in the DB and time spent rendering templates,
+into fixed-bucket histograms held in process memory.
+
+With several gunicorn workers, set METRICS_DIR to a directory shared by
+them: each worker periodically writes a snapshot there
+(``metrics-<pid>-<boot id>.json``) and ``/metrics`` merges every snapshot,
+so whichever worker answers the scrape reports the whole server. The boot
+id is new in every process, so a recycled PID starts its own file. At
+scrape time, the snapshots of workers that have exited are folded into
+``metrics-retired.json`` and deleted. Their counts are kept, and the
+directory holds one file per live worker.
+"""
+import contextlib
+import contextvars
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends import django as django_backend
+
+try:
+    import fcntl
+except ImportError:  # Windows: no gunicorn workers to retire
+    fcntl = None
+
+PREFIX = "vwfh"
+RETIRED_FILE = "metrics-retired.json"
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+HISTOGRAMS = {
+    "request_duration_seconds": ("Wall time per request.", TIME_BUCKETS),
+    "db_queries": ("Database queries per request.", COUNT_BUCKETS),
+    "db_duration_seconds": ("Time spent in database queries per request.", TIME_BUCKETS),
+    "template_render_seconds": ("Time spent rendering templates per request.", TIME_BUCKETS),
+}
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class _RequestStats:
+    __slots__ = ("queries", "db_time", "template_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+
+# -------------------- REGISTRY --------------------
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (metric, view) -> [bucket counts..., +Inf count, sum]
+        self.histograms = {}
+        # (view, status class) -> count
+        self.responses = {}
+        self.last_flush = 0.0
+
+    def observe(self, metric, view, value):
+        buckets = HISTOGRAMS[metric][1]
+        with self.lock:
+            row = self.histograms.get((metric, view))
+            if row is None:
+                row = self.histograms[(metric, view)] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def count_response(self, view, status):
+        key = (view, f"{status // 100}xx")
+        with self.lock:
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": [[m, v, list(row)] for (m, v), row in self.histograms.items()],
+                "responses": [[v, s, n] for (v, s), n in self.responses.items()],
+            }
+
+
+registry = Registry()
+
+
+def merge_snapshots(snapshots):
+    histograms, responses = {}, {}
+    for snap in snapshots:
+        for metric, view, row in snap.get("histograms", []):
+            if metric not in HISTOGRAMS:
+                continue
+            total = histograms.setdefault((metric, view), [0] * len(row))
+            for i, value in enumerate(row):
+                total[i] += value
+        for view, status, n in snap.get("responses", []):
+            responses[(view, status)] = responses.get((view, status), 0) + n
+    return histograms, responses
+
+
+def _metrics_dir():
+    return getattr(settings, "METRICS_DIR", "") or ""
+
+
+def _as_snapshot(histograms, responses):
+    return {
+        "histograms": [[m, v, row] for (m, v), row in histograms.items()],
+        "responses": [[v, s, n] for (v, s), n in responses.items()],
+    }
+
+
+def _read(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(directory, name, snapshot):
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(snapshot, fh)
+    os.replace(tmp, os.path.join(directory, name))
+
+
+_boot = None
+
+
+def _snapshot_name():
+    global _boot
+    pid = os.getpid()
+    if _boot is None or _boot[0] != pid:  # first flush, or forked since (gunicorn --preload)
+        _boot = (pid, uuid.uuid4().hex)
+    return f"metrics-{pid}-{_boot[1]}.json"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by someone else
+    return True
+
+
+def _dead_snapshots(directory):
+    newest, dead = {}, []  # pid -> (mtime, path)
+    for path in glob.glob(os.path.join(directory, "metrics-*-*.json")):
+        try:
+            pid = int(os.path.basename(path).split("-")[1])
+            mtime = os.path.getmtime(path)
+        except (ValueError, OSError):
+            continue
+        if not _pid_alive(pid):
+            dead.append(path)
+        elif pid in newest:
+            # a recycled PID: only the newest of its snapshots can be the live process
+            older, newer = sorted([newest[pid], (mtime, path)])
+            dead.append(older[1])
+            newest[pid] = newer
+        else:
+            newest[pid] = (mtime, path)
+    return dead
+
+
+@contextlib.contextmanager
+def _scrape_lock(directory):
+    """One scrape at a time, so no snapshot is read both before and after it is retired."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, ".metrics-scrape.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _retire_dead(directory):
+    """Fold exited workers' snapshots into RETIRED_FILE and delete them; hold _scrape_lock."""
+    dead = _dead_snapshots(directory)
+    snapshots = [_read(path) for path in dead]
+    if not any(snapshots):
+        return
+    snapshots.append(_read(os.path.join(directory, RETIRED_FILE)) or {})
+    _write(directory, RETIRED_FILE, _as_snapshot(*merge_snapshots(s for s in snapshots if s is not None)))
+    for path in dead:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+def flush(force=False):
+    """Write this worker's snapshot to METRICS_DIR (rate limited unless forced)."""
+    directory = _metrics_dir()
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - registry.last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    registry.last_flush = now
+    os.makedirs(directory, exist_ok=True)
+    _write(directory, _snapshot_name(), registry.snapshot())
+
+
+def collect():
+    """Merged histograms/responses for every worker (or just this one)."""
+    directory = _metrics_dir()
+    if not directory:
+        return merge_snapshots([registry.snapshot()])
+    flush(force=True)
+    with _scrape_lock(directory):
+        if fcntl is not None:
+            _retire_dead(directory)
+        snapshots = [_read(path) for path in glob.glob(os.path.join(directory, "metrics-*.json"))]
+    return merge_snapshots(snapshot for snapshot in snapshots if snapshot is not None)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus():
+    histograms, responses = collect()
+    lines = []
+    for metric, (help_text, buckets) in HISTOGRAMS.items():
+        name = f"{PREFIX}_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (m, view), row in sorted(histograms.items()):
+            if m != metric:
+                continue
+            view = _label(view)
+            for bound, count in zip(buckets, row):
+                lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{view="{view}",le="+Inf"}} {row[-2]}')
+            lines.append(f'{name}_sum{{view="{view}"}} {row[-1]}')
+            lines.append(f'{name}_count{{view="{view}"}} {row[-2]}')
+    name = f"{PREFIX}_responses_total"
+    lines.append(f"# HELP {name} Responses by view and status class.")
+    lines.append(f"# TYPE {name} counter")
+    for (view, status), n in sorted(responses.items()):
+        lines.append(f'{name}{{view="{_label(view)}",status="{status}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+# -------------------- HOOKS --------------------
+
+def _db_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def _install_db_wrapper(sender, connection, **kwargs):
+    # installed once per connection object; it persists across reconnects
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+_original_render = django_backend.Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    stats = _current.get()
+    if stats is None:
+        return _original_render(self, context, request)
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        stats.template_time += time.perf_counter() - start
+
+
+_hooks_installed = False
+
+
+def install_hooks():
+    global _hooks_installed
+    if not _hooks_installed:
+        connection_created.connect(_install_db_wrapper, weak=False, dispatch_uid="myapp.metrics")
+        for connection in connections.all(initialized_only=True):
+            _install_db_wrapper(None, connection)
+        django_backend.Template.render = _timed_render
+        _hooks_installed = True
+
+
+# -------------------- MIDDLEWARE --------------------
+
+class MetricsMiddleware:
+    """Records per-view timings; put it first in MIDDLEWARE."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install_hooks()
+
+    def _begin(self):
+        stats = _RequestStats()
+        return stats, _current.set(stats), time.perf_counter()
+
+    def _end(self, request, response, stats, token, start):
+        elapsed = time.perf_counter() - start
+        _current.reset(token)
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unresolved"
+        registry.observe("request_duration_seconds", view, elapsed)
+        registry.observe("db_queries", view, stats.queries)
+        registry.observe("db_duration_seconds", view, stats.db_time)
+        registry.observe("template_render_seconds", view, stats.template_time)
+        registry.count_response(view, response.status_code)
+        flush()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats, token, start = self._begin()
+        response = self.get_response(request)
+        self._end(request, response, stats, token, start)
+        return response
+
+    async def __acall__(self, request):
+        stats, token, start = self._begin()
+        response = await self.get_response(request)
+        self._end(request, response, stats, token, start)
+        return response
@@ -0,0 +1,55 @@
+# Full-text search index for Job (see myapp/search.py)
+
+from django.db import migrations
+
+FIELDS = (
+    ("title", "A"),
+    ("role", "A"),
+    ("skills", "B"),
+    ("company", "B"),
+    ("responsibilities", "C"),
+    ("about_company", "D"),
+)
+COLUMNS = ", ".join(field for field, _ in FIELDS)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        vector = " || ".join(
+            f"setweight(to_tsvector('english'::regconfig, coalesce({field}, '')), '{weight}')"
+            for field, weight in FIELDS
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS myapp_job_search_gin ON myapp_job USING GIN (({vector}))"
+        )
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS myapp_job_fts USING fts5("
+                f"{COLUMNS}, tokenize='porter unicode61')"
+            )
+        except Exception:
+            return  # SQLite built without FTS5; search falls back to the Python index
+        schema_editor.execute(
+            f"INSERT INTO myapp_job_fts (rowid, {COLUMNS}) SELECT id, {COLUMNS} FROM myapp_job"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS myapp_job_search_gin")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS myapp_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0029_payment'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,48 @@
+# Parse the existing comma separated Job.skills into Skill / JobSkill rows
+
+import re
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+SPACES = re.compile(r"\s+")
+
+
+def parse_skills(csv):
+    seen = {}
+    for raw in (csv or "").split(","):
+        name = SPACES.sub(" ", raw.strip())[:100]
+        slug = name.lower()
+        if slug and slug not in seen:
+            seen[slug] = name
+    return list(seen.items())
+
+
+def backfill_job_skills(apps, schema_editor):
+    Job = apps.get_model("myapp", "Job")
+    Skill = apps.get_model("myapp", "Skill")
+    JobSkill = apps.get_model("myapp", "JobSkill")
+
+    skill_ids = {}
+    batch = []
+    rows = Job.objects.values_list("id", "skills").order_by("id").iterator(chunk_size=BATCH_SIZE)
+    for job_id, csv in rows:
+        for position, (slug, name) in enumerate(parse_skills(csv)):
+            if slug not in skill_ids:
+                skill_ids[slug] = Skill.objects.get_or_create(slug=slug, defaults={"name": name})[0].id
+            batch.append(JobSkill(job_id=job_id, skill_id=skill_ids[slug], position=position))
+        if len(batch) >= BATCH_SIZE:
+            JobSkill.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    JobSkill.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0032_skill_catalog'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_job_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:18
+
+from datetime import datetime, time
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def seed_limits(apps, schema_editor):
+    """Keep the old behaviour: Basic plans get 5 applications a day."""
+    Plan = apps.get_model("myapp", "Plan")
+    Application = apps.get_model("myapp", "Application")
+    DailyApplicationQuota = apps.get_model("myapp", "DailyApplicationQuota")
+
+    for plan in Plan.objects.all():
+        if plan.name and plan.name.strip().lower() == "basic":
+            plan.daily_application_limit = 5
+            plan.save(update_fields=["daily_application_limit"])
+
+    # carry over today's applications so the switch-over day isn't a free reset
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today, time.min))
+    used = (
+        Application.objects.filter(user__isnull=False, created_at__gte=start)
+        .values("user").annotate(n=Count("id"))
+    )
+    DailyApplicationQuota.objects.bulk_create(
+        [DailyApplicationQuota(user_id=row["user"], day=today, used=row["n"]) for row in used],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0033_backfill_job_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plan',
+            name='daily_application_limit',
+            field=models.PositiveIntegerField(blank=True, help_text='Job applications allowed per day (empty = unlimited)', null=True),
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('used', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_quotas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='unique_user_day_quota')],
+            },
+        ),
+        migrations.RunPython(seed_limits, migrations.RunPython.noop),
+    ]
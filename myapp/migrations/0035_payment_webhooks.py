@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+
+def blank_payment_ids_to_null(apps, schema_editor):
+    # several "" values would collide under the new unique index; NULLs don't
+    Payment = apps.get_model("myapp", "Payment")
+    Payment.objects.filter(razorpay_payment_id="").update(razorpay_payment_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0034_daily_application_quota'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_payment_ids_to_null, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='payment',
+            name='razorpay_order_id',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='razorpay_payment_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='PaymentEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(max_length=50)),
+                ('razorpay_payment_id', models.CharField(max_length=255)),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=255)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['id'], name='paymentevent_pending_idx')],
+                'constraints': [models.UniqueConstraint(fields=('razorpay_payment_id', 'event'), name='unique_payment_event')],
+            },
+        ),
+    ]
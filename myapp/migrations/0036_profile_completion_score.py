@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:28
+
+from django.db import migrations, models
+from django.db.models import Case, ExpressionWrapper, Q, When
+
+# frozen copy of UserProfile.COMPLETION_FIELDS at the time of this migration
+COMPLETION_FIELDS = (
+    "full_name", "email", "mobile", "city",
+    "education", "university", "course",
+    "skill", "software",
+    "project_title", "project_details",
+    "current_industry", "current_role",
+    "resume",
+)
+
+
+def backfill_scores(apps, schema_editor):
+    UserProfile = apps.get_model("myapp", "UserProfile")
+    filled = sum(
+        Case(When(Q(**{f"{name}__isnull": False}) & ~Q(**{name: ""}), then=1), default=0)
+        for name in COMPLETION_FIELDS
+    )
+    UserProfile.objects.update(completion_score=ExpressionWrapper(
+        filled * 100 / len(COMPLETION_FIELDS), output_field=models.IntegerField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0035_payment_webhooks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='completion_score',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
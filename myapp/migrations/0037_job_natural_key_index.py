@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0036_profile_completion_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['company', 'title', 'location'], name='job_natural_key_idx'),
+        ),
+    ]
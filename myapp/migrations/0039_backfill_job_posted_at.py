@@ -0,0 +1,43 @@
+import re
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+# "Today", "Just now", "5 hours ago", "1 day ago", "30+ days ago", "2 weeks ago", "1 month ago"
+POSTED_RE = re.compile(r"^\s*(\d+)\+?\s*(hour|day|week|month|year)s?\s+ago\s*$", re.IGNORECASE)
+UNIT_DAYS = {"hour": 1 / 24, "day": 1, "week": 7, "month": 30, "year": 365}
+
+
+def backfill_posted_at(apps, schema_editor):
+    # 0031 gave every existing job the same "now"; derive the real age from the
+    # text admins typed, counted back from today (the best anchor we have)
+    Job = apps.get_model("myapp", "Job")
+    now = timezone.now()
+    batch = []
+    for job in Job.objects.only("id", "posted_days").iterator(chunk_size=2000):
+        text = (job.posted_days or "").strip().lower()
+        if text in ("today", "just now"):
+            days = 0
+        else:
+            match = POSTED_RE.match(text)
+            if not match:
+                continue
+            days = int(match.group(1)) * UNIT_DAYS[match.group(2).lower()]
+        job.posted_at = now - timedelta(days=days)
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, ["posted_at"])
+            batch = []
+    Job.objects.bulk_update(batch, ["posted_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0038_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_posted_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:39
+# Adds the parsed salary columns and backfills them from Job.salary_range
+
+import re
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+CURRENCIES = (
+    (re.compile(r"₹|\brs\b\.?|\binr\b"), "INR"),
+    (re.compile(r"\$|\busd\b"), "USD"),
+    (re.compile(r"€|\beur\b"), "EUR"),
+    (re.compile(r"£|\bgbp\b"), "GBP"),
+)
+PERIODS = (
+    (re.compile(r"\blpa\b|per annum|per year|\bp\.?a\b|/\s*y(?:ea)?r\b|\byearly\b|\bannual"), "year"),
+    (re.compile(r"per month|/\s*mo(?:nth)?\b|\bp\.?m\b|\bmonthly\b"), "month"),
+    (re.compile(r"per week|/\s*w(?:ee)?k\b|\bweekly\b"), "week"),
+    (re.compile(r"per day|/\s*day\b|\bdaily\b"), "day"),
+    (re.compile(r"per hour|/\s*h(?:ou)?r\b|\bhourly\b"), "hour"),
+)
+PERIODS_PER_YEAR = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+MULTIPLIERS = {
+    "k": 1_000,
+    "l": 100_000, "lac": 100_000, "lacs": 100_000, "lakh": 100_000, "lakhs": 100_000,
+    "m": 1_000_000, "mn": 1_000_000,
+    "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000,
+}
+AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(k|lakhs?|lacs?|l|crores?|cr|mn|m)?\b")
+LPA_RE = re.compile(r"\blpa\b")
+DIGIT_COMMAS = re.compile(r"(?<=\d),(?=\d)")
+
+
+def parse_salary(text):
+    """(min, max, currency, period) with yearly amounts, or None."""
+    text = DIGIT_COMMAS.sub("", (text or "").lower()).replace("–", "-").replace("—", "-")
+    amounts, suffix = [], None
+    for number, own in reversed(AMOUNT_RE.findall(text)):
+        suffix = own or suffix
+        amounts.append(float(number) * MULTIPLIERS.get(suffix, 1))
+    amounts.reverse()
+    if not amounts:
+        return None
+    if LPA_RE.search(text):
+        amounts = [amount * 100_000 if amount < 1000 else amount for amount in amounts]
+    currency = next((code for pattern, code in CURRENCIES if pattern.search(text)), "INR")
+    period = next((name for pattern, name in PERIODS if pattern.search(text)), "year")
+    low, high = sorted(amounts[:2]) if len(amounts) > 1 else (amounts[0], amounts[0])
+    per_year = PERIODS_PER_YEAR[period]
+    return round(low * per_year), round(high * per_year), currency, period
+
+
+def backfill_salaries(apps, schema_editor):
+    Job = apps.get_model("myapp", "Job")
+    fields = ["salary_min", "salary_max", "salary_currency", "salary_period"]
+    batch = []
+    for job in Job.objects.only("id", "salary_range").order_by("id").iterator(chunk_size=BATCH_SIZE):
+        parsed = parse_salary(job.salary_range)
+        if parsed is None:
+            continue
+        job.salary_min, job.salary_max, job.salary_currency, job.salary_period = parsed
+        batch.append(job)
+        if len(batch) >= BATCH_SIZE:
+            Job.objects.bulk_update(batch, fields)
+            batch = []
+    Job.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0039_backfill_job_posted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_period',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.RunPython(backfill_salaries, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_currency', 'salary_min'], name='job_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_currency', 'salary_max'], name='job_salary_max_idx'),
+        ),
+    ]
@@ -1,14 +1,22 @@
 # myapp/models.py
+from django.conf import settings
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, Q, When
 from django.contrib.auth.models import User
+from django.utils import timezone
 from datetime import date, timedelta
 
+from .salary import SALARY_FIELDS, salary_fields
+
 class Plan(models.Model):
     name = models.CharField(max_length=100)  # Basic / Standard / Premium
     price = models.DecimalField(max_digits=10, decimal_places=2)
     duration = models.CharField(max_length=50, default="Yearly")
     features = models.TextField(help_text="Comma separated features", blank=True)
     is_current = models.BooleanField(default=False)
+    daily_application_limit = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Job applications allowed per day (empty = unlimited)"
+    )
 
     class Meta:
         verbose_name = "Plan Details Upload"
@@ -21,6 +29,30 @@ class Plan(models.Model):
         return self.name
     
 
+class JobQuerySet(models.QuerySet):
+    def posted_within(self, days):
+        """Jobs posted in the last ``days`` days (a range scan on job_posted_at_id_idx)."""
+        return self.filter(posted_at__gte=timezone.now() - timedelta(days=days))
+
+    def salary_between(self, low=None, high=None, currency=None):
+        """Jobs paying from ``low`` and up to ``high`` a year (either may be None), in ``currency``."""
+        jobs = self.filter(salary_currency=currency or settings.SALARY_DEFAULT_CURRENCY)
+        if low is not None:
+            jobs = jobs.filter(salary_min__gte=low)
+        if high is not None:
+            jobs = jobs.filter(salary_max__lte=high)
+        return jobs
+
+    def with_skills(self):
+        """Prefetch each job's skills (in CSV order) with one query per page."""
+        return self.prefetch_related(
+            models.Prefetch(
+                "job_skills",
+                queryset=JobSkill.objects.select_related("skill").order_by("position"),
+            )
+        )
+
+
 class Job(models.Model):
     course = models.ForeignKey("Course", on_delete=models.SET_NULL, null=True, blank=True)
     title = models.CharField(max_length=200)
@@ -28,7 +60,13 @@ class Job(models.Model):
     location = models.CharField(max_length=100, default="Remote")
     job_type = models.CharField(max_length=100, default="Full-time")
     salary_range = models.CharField(max_length=50)
+    # parsed from salary_range by save() (see myapp.salary): yearly amounts in salary_currency
+    salary_min = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    salary_max = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, editable=False)
+    salary_period = models.CharField(max_length=10, blank=True, editable=False)  # as quoted: year / month / ...
     posted_days = models.CharField(max_length=50, default="1 day ago")
+    posted_at = models.DateTimeField(default=timezone.now)
     openings = models.IntegerField(default=1)
     applicants = models.IntegerField(default=0)
     responsibilities = models.TextField(help_text="Use line breaks for bullet points")
@@ -37,13 +75,75 @@ class Job(models.Model):
     employment_type = models.CharField(max_length=100)
     education = models.CharField(max_length=100)
     skills = models.CharField(max_length=300, help_text="Comma separated skills")
+    skill_set = models.ManyToManyField("Skill", through="JobSkill", related_name="jobs", blank=True)
     about_company = models.TextField()
 
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination: newest first, id as tie-breaker
+            models.Index(fields=["-posted_at", "-id"], name="job_posted_at_id_idx"),
+            # natural key used by the feed importer to upsert
+            models.Index(fields=["company", "title", "location"], name="job_natural_key_idx"),
+            # job_search salary range filters
+            models.Index(fields=["salary_currency", "salary_min"], name="job_salary_min_idx"),
+            models.Index(fields=["salary_currency", "salary_max"], name="job_salary_max_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the row as loaded: lets the facet patch on save skip a SELECT (see myapp.signals)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        for name, value in salary_fields(self.salary_range).items():
+            setattr(self, name, value)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "salary_range" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *SALARY_FIELDS}
+        super().save(*args, **kwargs)
+
     def skill_list(self):
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("job_skills")
+        if prefetched is not None:
+            return [js.skill.name for js in prefetched]
         return [s.strip() for s in self.skills.split(",") if s.strip()]
 
     def __str__(self):
         return f"{self.title} - {self.company}"
+
+
+# Normalized skill catalog (kept in sync with Job.skills by myapp.signals)
+class Skill(models.Model):
+    name = models.CharField(max_length=100)
+    slug = models.CharField(max_length=100, unique=True, help_text="Lower-cased, whitespace-collapsed name")
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="job_skills")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="job_skills")
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "skill"], name="unique_job_skill"),
+        ]
+        indexes = [
+            # inverted index: skill -> jobs
+            models.Index(fields=["skill", "job"], name="jobskill_skill_job_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} -> {self.skill_id}"
     
 
 
@@ -77,6 +177,13 @@ class Application(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at"], name="application_created_idx"),
+            # confirm_courses looks applications up by email; so does admin search
+            models.Index(fields=["email"], name="application_email_idx"),
+        ]
+
     def is_plan_active(self):
         from datetime import date
         return bool(self.plan_end and self.plan_end >= date.today())
@@ -92,6 +199,57 @@ class Application(models.Model):
         return f"{self.full_name} ({self.plan.name if self.plan else 'No Plan'})"
 
 
+class DailyQuotaExceeded(Exception):
+    pass
+
+
+class DailyApplicationQuota(models.Model):
+    """Per-user, per-day application counter (replaces COUNT(*) over Application)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="application_quotas")
+    day = models.DateField()
+    used = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_user_day_quota"),
+        ]
+
+    @classmethod
+    def used_today(cls, user):
+        used = cls.objects.filter(user=user, day=timezone.localdate()).values_list("used", flat=True).first()
+        return used or 0
+
+    @classmethod
+    def consume(cls, user, limit):
+        """
+        Take one of today's slots or raise DailyQuotaExceeded.
+
+        Call inside transaction.atomic() together with the Application
+        insert. The conditional UPDATE is a single atomic statement, so
+        concurrent submits can never push ``used`` past ``limit``.
+        """
+        if limit is None:
+            return
+        today = timezone.localdate()
+        slot = cls.objects.filter(user=user, day=today, used__lt=limit)
+        if not slot.update(used=models.F("used") + 1):
+            cls.objects.get_or_create(user=user, day=today)
+            if not slot.update(used=models.F("used") + 1):
+                raise DailyQuotaExceeded
+
+    def __str__(self):
+        return f"{self.user_id} {self.day}: {self.used}"
+
+
+def completion_score_expression(field_names):
+    filled = sum(
+        Case(When(Q(**{f"{name}__isnull": False}) & ~Q(**{name: ""}), then=1), default=0)
+        for name in field_names
+    )
+    # integer division in SQL matches int() truncation in compute_completion()
+    return ExpressionWrapper(filled * 100 / len(field_names), output_field=models.IntegerField())
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True)
 
@@ -139,18 +297,36 @@ class UserProfile(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Percentage of COMPLETION_FIELDS that are filled in; kept up to date by save()
+    completion_score = models.PositiveSmallIntegerField(default=0, editable=False, db_index=True)
+
+    COMPLETION_FIELDS = (
+        "full_name", "email", "mobile", "city",
+        "education", "university", "course",
+        "skill", "software",
+        "project_title", "project_details",
+        "current_industry", "current_role",
+        "resume",
+    )
+
+    @classmethod
+    def completion_score_expression(cls):
+        """The same score as a SQL expression, for bulk recomputes."""
+        return completion_score_expression(cls.COMPLETION_FIELDS)
+
+    def compute_completion(self):
+        filled = sum(1 for name in self.COMPLETION_FIELDS if getattr(self, name))
+        return int((filled / len(self.COMPLETION_FIELDS)) * 100)
+
     def completion_percentage(self):
-        # ... existing
-        fields = [
-            self.full_name, self.email, self.mobile, self.city,
-            self.education, self.university, self.course,
-            self.skill, self.software,
-            self.project_title, self.project_details,
-            self.current_industry, self.current_role,
-            self.resume
-        ]
-        filled = sum(1 for f in fields if f)
-        return int((filled / len(fields)) * 100)
+        return self.completion_score
+
+    def save(self, *args, **kwargs):
+        self.completion_score = self.compute_completion()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(self.COMPLETION_FIELDS):
+            kwargs["update_fields"] = {*update_fields, "completion_score"}
+        super().save(*args, **kwargs)
 
     def assign_plan(self, plan):
         """Helper: assign plan and set 1 year validity from today."""
@@ -172,15 +348,10 @@ class UserProfile(models.Model):
         if not self.plan:
             return None  # no plan yet
 
-        plan_name = self.plan.name.strip().lower()
-        if plan_name == "basic":
-            from .models import Application  # avoid circular import
-            apps_today_count = Application.objects.filter(
-                user=self.user, created_at__date=date.today()
-            ).count()
-            return max(5 - apps_today_count, 0)
-        # unlimited for other plans
-        return None
+        limit = self.plan.daily_application_limit
+        if limit is None:
+            return None  # unlimited plan
+        return max(limit - DailyApplicationQuota.used_today(self.user), 0)
     
     def __str__(self):
         if self.user:
@@ -248,6 +419,22 @@ class InterviewQuestion(models.Model):
         return self.tool_name
 
 
+# Mock interview sessions (myapp.interview); rows rather than cache entries
+# so that every worker process sees the same session
+class MockInterviewSession(models.Model):
+    id = models.CharField(max_length=32, primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mock_interviews", null=True, blank=True)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="mock_interviews")
+    level = models.CharField(max_length=20)
+    questions = models.JSONField(default=list)  # [{"tool": ..., "text": ...}]
+    answers = models.JSONField(default=list)  # [{"answer", "score", "feedback"}], one per question so far
+    locked_until = models.DateTimeField(null=True, blank=True)  # set while an answer is being scored
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.id} ({self.level})"
+
+
 # Placement Sessions (linked to a course)
 class PlacementSession(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="placement_sessions")
@@ -292,8 +479,8 @@ class Payment(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     plan = models.ForeignKey(Plan, on_delete=models.CASCADE)
-    razorpay_order_id = models.CharField(max_length=255)
-    razorpay_payment_id = models.CharField(max_length=255, blank=True, null=True)
+    razorpay_order_id = models.CharField(max_length=255, unique=True)
+    razorpay_payment_id = models.CharField(max_length=255, blank=True, null=True, unique=True)
     razorpay_signature = models.TextField(blank=True, null=True)
     amount = models.FloatField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="CREATED")
@@ -302,6 +489,35 @@ class Payment(models.Model):
     class Meta:
         verbose_name = "Payment Transaction"
         verbose_name_plural = "Payment Transactions"
+        indexes = [
+            # admin status filter, newest first
+            models.Index(fields=["status", "-created_at"], name="payment_status_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} | {self.plan.name} | {self.status}"
+
+
+# Razorpay webhook events, queued for batched reconciliation
+class PaymentEvent(models.Model):
+    event = models.CharField(max_length=50)  # payment.captured / payment.failed / order.paid
+    razorpay_payment_id = models.CharField(max_length=255)
+    razorpay_order_id = models.CharField(max_length=255, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # gateway retries of the same event are dropped on insert
+            models.UniqueConstraint(fields=["razorpay_payment_id", "event"], name="unique_payment_event"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"], name="paymentevent_pending_idx",
+                condition=models.Q(processed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.razorpay_payment_id}"
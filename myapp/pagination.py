@@ -0,0 +1,276 @@
+# myapp/pagination.py
+"""
+Keyset (cursor) pagination for the job board.
+
+Pages are addressed by an opaque cursor holding the sort key of the row
+at the page edge, so fetching page 5,000 costs the same indexed range
+scan as page 1 and rows inserted meanwhile never shift the pages. Totals
+come from planner statistics instead of COUNT(*).
+"""
+import base64
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Above this, filtered querysets report "N+" instead of an exact count.
+COUNT_CAP = 1000
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str = None
+    prev_cursor: str = None
+    approx_total: int = 0
+    total_is_lower_bound: bool = False
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(key, direction):
+    raw = json.dumps({"k": key, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return ``(key, direction)``, or ``(None, None)`` for a missing/garbled token."""
+    if not token:
+        return None, None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        key, direction = data["k"], data["d"]
+        if direction not in ("n", "p") or not isinstance(key, list) or len(key) != 2:
+            raise ValueError
+        return key, direction
+    except (ValueError, TypeError, KeyError):
+        return None, None
+
+
+# -------------------- APPROXIMATE COUNTS --------------------
+
+def table_row_estimate(model, using="default"):
+    """Row count from the database's own statistics; None when unavailable."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            # -1 means the table has never been vacuumed/analyzed
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        if connection.vendor == "sqlite":
+            try:
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+            except Exception:
+                row = None  # ANALYZE has never run
+            if row:
+                return int(row[0].split()[0])
+            # rowids are monotonic, so MAX() is an O(log n) upper estimate
+            cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+            return cursor.fetchone()[0] or 0
+    return None
+
+
+def estimate_count(queryset):
+    """
+    Return ``(count, is_lower_bound)`` without a full COUNT(*).
+
+    Unfiltered querysets use table statistics, filtered ones the Postgres
+    planner estimate, and otherwise a COUNT capped at COUNT_CAP rows.
+    """
+    connection = connections[queryset.db]
+    if not queryset.query.where:
+        estimate = table_row_estimate(queryset.model, using=queryset.db)
+        if estimate is not None:
+            return int(estimate), False
+    elif connection.vendor == "postgresql":
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), False
+    capped = queryset.order_by()[: COUNT_CAP + 1].count()
+    return min(capped, COUNT_CAP), capped > COUNT_CAP
+
+
+# -------------------- PAGINATORS --------------------
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django's Paginator with ``count`` from ``estimate_count()``, for admin
+    changelists on big tables (pair with ``show_full_result_count = False``).
+
+    Only the unfiltered list is estimated. The count decides which page
+    numbers exist, and a filtered estimate is either capped at COUNT_CAP or
+    a planner guess, so pages past it would raise EmptyPage. Filtered
+    lists are counted exactly; with filters applied they're the short ones.
+    """
+
+    @cached_property
+    def count(self):
+        if self.object_list.query.where:
+            return super().count
+        return estimate_count(self.object_list)[0]
+
+
+class KeysetPaginator:
+    """
+    Newest-first pagination on ``(posted_at, id)``, backed by the
+    ``job_posted_at_id_idx`` composite index.
+    """
+
+    def __init__(self, queryset, per_page=20, date_field="posted_at"):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.date_field = date_field
+
+    def _key(self, obj):
+        return [getattr(obj, self.date_field).isoformat(), obj.pk]
+
+    def _window(self, cursor):
+        """``(queryset of up to per_page + 1 rows, direction)`` for ``cursor``."""
+        key, direction = decode_cursor(cursor)
+        f = self.date_field
+        qs = self.queryset
+        if key is not None:
+            try:
+                posted, pk = datetime.fromisoformat(key[0]), int(key[1])
+            except (TypeError, ValueError):
+                key, direction = None, None
+
+        if key is None:
+            return qs.order_by(f"-{f}", "-pk")[: self.per_page + 1], None
+        if direction == "n":
+            after = Q(**{f"{f}__lt": posted}) | Q(**{f: posted, "pk__lt": pk})
+            return qs.filter(after).order_by(f"-{f}", "-pk")[: self.per_page + 1], direction
+        before = Q(**{f"{f}__gt": posted}) | Q(**{f: posted, "pk__gt": pk})
+        return qs.filter(before).order_by(f, "pk")[: self.per_page + 1], direction
+
+    def _page(self, rows, direction, estimate):
+        extra = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == "p":
+            rows, has_more, has_less = rows[::-1], True, extra
+        else:
+            has_more, has_less = extra, direction == "n"
+
+        approx_total, lower_bound = estimate
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=encode_cursor(self._key(rows[-1]), "n") if rows and has_more else None,
+            prev_cursor=encode_cursor(self._key(rows[0]), "p") if rows and has_less else None,
+            approx_total=approx_total,
+            total_is_lower_bound=lower_bound,
+        )
+
+    def page(self, cursor=None):
+        window, direction = self._window(cursor)
+        return self._page(list(window), direction, estimate_count(self.queryset))
+
+    async def apage(self, cursor=None):
+        """``page`` for async views."""
+        window, direction = self._window(cursor)
+        rows = [row async for row in window]
+        return self._page(rows, direction, await sync_to_async(estimate_count)(self.queryset))
+
+
+class RankedPaginator:
+    """
+    Keyset pagination over a relevance-ranked id list from ``myapp.search``.
+
+    ``ranked`` is ``[(id, score), ...]`` best first; the cursor holds the
+    ``(score, id)`` of the page edge. The list is already capped at
+    JOB_SEARCH_MAX_RESULTS, so walking it in memory stays bounded.
+    """
+
+    def __init__(self, queryset, ranked, per_page=20, max_results=None):
+        self.queryset = queryset
+        self.ranked = ranked
+        self.per_page = per_page
+        self.max_results = max_results
+
+    def _filter(self, allowed):
+        """The ranked ids still present after the queryset's other filters."""
+        if allowed is None:
+            return self.ranked
+        return [(pk, score) for pk, score in self.ranked if pk in allowed]
+
+    def _allowed_ids(self):
+        """Query for the candidate ids passing the non-text filters; None when there are none."""
+        if self.ranked and self.queryset.query.where:
+            return self.queryset.filter(pk__in=[pk for pk, _ in self.ranked]).values_list("pk", flat=True)
+        return None
+
+    def _window(self, ranked, cursor):
+        sort_keys = [(-score, pk) for pk, score in ranked]
+        key, direction = decode_cursor(cursor)
+        try:
+            edge = (-float(key[0]), int(key[1])) if key is not None else None
+        except (TypeError, ValueError):
+            edge = None
+
+        if edge is None:
+            start = 0
+        elif direction == "n":
+            start = bisect_right(sort_keys, edge)
+        else:
+            start = max(bisect_right(sort_keys, edge) - 1 - self.per_page, 0)
+        return start, start + self.per_page
+
+    def _page(self, ranked, start, end, by_id):
+        window = ranked[start:end]
+        rows = [by_id[pk] for pk, _ in window if pk in by_id]
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=encode_cursor([window[-1][1], window[-1][0]], "n") if end < len(ranked) else None,
+            prev_cursor=encode_cursor([window[0][1], window[0][0]], "p") if start > 0 and window else None,
+            approx_total=len(ranked),
+            total_is_lower_bound=bool(self.max_results) and len(self.ranked) >= self.max_results,
+        )
+
+    def page(self, cursor=None):
+        # apply the non-text filters to the candidate ids in one query
+        allowed = self._allowed_ids()
+        ranked = self._filter(None if allowed is None else set(allowed))
+        start, end = self._window(ranked, cursor)
+        by_id = self.queryset.in_bulk([pk for pk, _ in ranked[start:end]])
+        return self._page(ranked, start, end, by_id)
+
+    async def apage(self, cursor=None):
+        """``page`` for async views."""
+        allowed = self._allowed_ids()
+        ranked = self._filter(None if allowed is None else {pk async for pk in allowed})
+        start, end = self._window(ranked, cursor)
+        by_id = await self.queryset.ain_bulk([pk for pk, _ in ranked[start:end]])
+        return self._page(ranked, start, end, by_id)
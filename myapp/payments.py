@@ -0,0 +1,163 @@
+# myapp/payments.py
+"""
+Shared Razorpay client.
+
+One process-wide client with a pooled ``requests.Session``, connect/read
+timeouts and retries replaces the ``razorpay.Client`` that used to be
+built on every request. ``acreate_order`` is the non-blocking variant
+for async (ASGI) views. Point ``RAZORPAY_BASE_URL`` at
+``manage.py run_fake_razorpay`` to run the checkout flow offline.
+"""
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+
+import httpx
+import razorpay
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Order creation is not idempotent, so POSTs are only retried when the
+# connection itself failed; GETs are also retried on 429/5xx.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _TimeoutSession(requests.Session):
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class _Client(razorpay.Client):
+    @lru_cache(maxsize=1)
+    def _get_version(self):
+        # the SDK resolves its version through pkg_resources on every call
+        return super()._get_version()
+
+
+def _build_session():
+    retries = settings.RAZORPAY_MAX_RETRIES
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=0.2,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.RAZORPAY_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = _TimeoutSession(settings.RAZORPAY_TIMEOUT)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide Razorpay client (created on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _Client(
+                    session=_build_session(),
+                    auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                    base_url=settings.RAZORPAY_BASE_URL,
+                )
+    return _client
+
+
+def create_order(amount, currency="INR", **extra):
+    """Create a Razorpay order for ``amount`` paise and return its JSON."""
+    return get_client().order.create(dict(amount=amount, currency=currency, payment_capture="1", **extra))
+
+
+def verify_payment_signature(order_id, payment_id, signature):
+    """Raise ``razorpay.errors.SignatureVerificationError`` if the signature is wrong."""
+    get_client().utility.verify_payment_signature({
+        "razorpay_order_id": order_id,
+        "razorpay_payment_id": payment_id,
+        "razorpay_signature": signature,
+    })
+
+
+def verify_webhook_signature(body, signature):
+    """Check ``X-Razorpay-Signature`` against RAZORPAY_WEBHOOK_SECRET."""
+    get_client().utility.verify_webhook_signature(body, signature or "", settings.RAZORPAY_WEBHOOK_SECRET)
+
+
+# -------------------- ASYNC --------------------
+
+# httpx clients are bound to the event loop they were created on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        connect, read = settings.RAZORPAY_TIMEOUT
+        client = httpx.AsyncClient(
+            base_url=settings.RAZORPAY_BASE_URL,
+            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+            timeout=httpx.Timeout(read, connect=connect),
+            # transport retries only cover connection failures, which is
+            # exactly what is safe for a non-idempotent POST
+            transport=httpx.AsyncHTTPTransport(
+                retries=settings.RAZORPAY_MAX_RETRIES,
+                limits=httpx.Limits(max_connections=settings.RAZORPAY_POOL_SIZE),
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def acreate_order(amount, currency="INR", **extra):
+    """Async ``create_order`` for ASGI views; raises the same razorpay errors."""
+    response = await get_async_client().post(
+        "/v1/orders",
+        json=dict(amount=amount, currency=currency, payment_capture="1", **extra),
+    )
+    try:
+        data = response.json()
+    except ValueError:
+        data = None  # e.g. an HTML error page from a proxy in front of the gateway
+    if response.status_code >= 300 or not isinstance(data, dict):
+        if not isinstance(data, dict):
+            raise razorpay.errors.ServerError(f"Unexpected response from Razorpay (HTTP {response.status_code})")
+        error = data.get("error", {})
+        code = str(error.get("code", "")).upper()
+        message = error.get("description", "")
+        if code == "BAD_REQUEST_ERROR":
+            raise razorpay.errors.BadRequestError(message)
+        if code == "GATEWAY_ERROR":
+            raise razorpay.errors.GatewayError(message)
+        raise razorpay.errors.ServerError(message)
+    return data
+
+
+@receiver(setting_changed)
+def _reset_clients(setting, **kwargs):
+    # lets override_settings (tests, bench_funnel) point at another gateway
+    global _client
+    if setting.startswith("RAZORPAY_"):
+        _client = None
+        _async_clients.clear()
@@ -0,0 +1,354 @@
+# myapp/recommendations.py
+"""
+"Recommended for you" jobs on job_list.
+
+Every Job becomes a row of a sparse TF-IDF matrix over its skills
+(``s:<slug>``, from the ``skills`` CSV) and title/role words (``t:<word>``).
+A user is turned into a query vector from their profile's skill,
+software, current_role and course fields plus the rows of jobs they have
+applied to, and scored against all jobs at once with NumPy. Rows are
+L2-normalised, so the score is the cosine similarity.
+
+The matrix is built offline by ``manage.py build_recommendations`` (saved
+to RECOMMENDER_INDEX_PATH) or, failing that, in-process on first use.
+Job saves/deletes are applied incrementally: each one is appended to a
+change log in the cache, and every worker replays the entries it hasn't
+seen before answering. A full rebuild happens only when the log has been
+evicted or the pending changes outgrow RECOMMENDER_MAX_DELTA.
+
+Per-user results are cached for RECOMMENDATION_CACHE_TIMEOUT seconds.
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Application, Job
+from .search import tokenize
+from .skills import normalize_skill, parse_skills
+
+logger = logging.getLogger(__name__)
+
+SKILL_WEIGHT = 3.0
+WORD_WEIGHT = 1.0
+HISTORY_WEIGHT = 0.5  # share of the query taken from past applications
+HISTORY_SIZE = 20
+
+GENERATION_KEY = "recommender:generation"
+CHANGE_KEY = "recommender:change:{}"
+CHANGE_LOG_TIMEOUT = 24 * 60 * 60
+
+
+def job_features(skills, title, role):
+    """Raw term frequencies of one job."""
+    features = Counter()
+    for slug, _ in parse_skills(skills):
+        features[f"s:{slug}"] += SKILL_WEIGHT
+    for word in tokenize(f"{title or ''} {role or ''}"):
+        features[f"t:{word}"] += WORD_WEIGHT
+    return features
+
+
+def profile_features(profile):
+    """Raw query terms from a UserProfile (skills/software as skills, role/course as words)."""
+    features = Counter()
+    if profile is None:
+        return features
+    for csv in (profile.skill, profile.software):
+        for slug, _ in parse_skills(csv):
+            features[f"s:{slug}"] += SKILL_WEIGHT
+            for word in tokenize(slug):
+                features[f"t:{word}"] += WORD_WEIGHT
+    for text in (profile.current_role, profile.course):
+        if text:
+            features[f"s:{normalize_skill(text)}"] += SKILL_WEIGHT
+            for word in tokenize(text):
+                features[f"t:{word}"] += WORD_WEIGHT
+    return features
+
+
+# -------------------- INDEX --------------------
+
+class RecommendationIndex:
+    """
+    The job x term matrix, held twice: by term (``col_ptr``/``col_rows``/
+    ``col_weights``) for scoring a query against every job, and by job
+    (``row_ptr``/``row_cols``/``row_weights``) for reading one job's vector.
+    Jobs changed since the build live in ``overlay``; their base rows are
+    masked out through ``alive``.
+    """
+
+    ARRAYS = ("job_ids", "idf", "row_ptr", "row_cols", "row_weights", "col_ptr", "col_rows", "col_weights")
+
+    def __init__(self, names, generation=0, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.names = names                                   # column -> term
+        self.terms = {term: col for col, term in enumerate(names)}
+        self.row_of = {int(pk): row for row, pk in enumerate(self.job_ids)}
+        self.alive = np.ones(len(self.job_ids), dtype=bool)
+        self.overlay = {}                                    # job id -> {term: weight}
+        self.generation = generation
+        self.lock = threading.Lock()
+
+    # ---- building ----
+
+    @classmethod
+    def build(cls, generation=0):
+        job_ids, docs, df = [], [], Counter()
+        for row in Job.objects.values_list("id", "skills", "title", "role").iterator(chunk_size=2000):
+            features = job_features(*row[1:])
+            job_ids.append(row[0])
+            docs.append(features)
+            df.update(features.keys())
+
+        names = sorted(df)
+        terms = {term: col for col, term in enumerate(names)}
+        idf = np.array([math.log((1 + len(docs)) / (1 + df[term])) + 1 for term in names], dtype=np.float32)
+
+        # row-major triplets; a stable sort by column gives the per-term postings
+        rows, cols, values = [], [], []
+        for row, features in enumerate(docs):
+            weights = {terms[t]: tf * float(idf[terms[t]]) for t, tf in features.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for col, weight in weights.items():
+                rows.append(row)
+                cols.append(col)
+                values.append(weight / norm)
+        rows = np.asarray(rows, dtype=np.int32)
+        cols = np.asarray(cols, dtype=np.int32)
+        values = np.asarray(values, dtype=np.float32)
+        order = np.argsort(cols, kind="stable")
+        return cls(
+            names, generation=generation,
+            job_ids=np.asarray(job_ids, dtype=np.int64), idf=idf,
+            row_ptr=cls._pointers(rows, len(docs)), row_cols=cols, row_weights=values,
+            col_ptr=cls._pointers(cols, len(names)), col_rows=rows[order], col_weights=values[order],
+        )
+
+    @staticmethod
+    def _pointers(keys, size):
+        pointers = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=size), out=pointers[1:])
+        return pointers
+
+    def save(self, path):
+        tmp = f"{path}.tmp.npz"  # np.savez keeps a .npz suffix as-is
+        np.savez(
+            tmp, names=np.array(self.names, dtype=str), generation=np.int64(self.generation),
+            **{name: getattr(self, name) for name in self.ARRAYS},
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                [str(term) for term in data["names"]], generation=int(data["generation"]),
+                **{name: data[name] for name in cls.ARRAYS},
+            )
+
+    # ---- incremental updates ----
+
+    def _weigh(self, features):
+        # terms unseen at build time get the rarest-term idf
+        default_idf = float(self.idf.max()) if len(self.idf) else 1.0
+        weights = {
+            term: tf * (float(self.idf[self.terms[term]]) if term in self.terms else default_idf)
+            for term, tf in features.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {term: w / norm for term, w in weights.items()}
+
+    def apply_changes(self, job_ids):
+        """Re-read the given jobs; deleted ones drop out."""
+        current = {
+            row[0]: self._weigh(job_features(*row[1:]))
+            for row in Job.objects.filter(pk__in=job_ids).values_list("id", "skills", "title", "role")
+        }
+        for pk in job_ids:
+            row = self.row_of.get(pk)
+            if row is not None:
+                self.alive[row] = False
+            if pk in current:
+                self.overlay[pk] = current[pk]
+            else:
+                self.overlay.pop(pk, None)
+
+    # ---- scoring ----
+
+    def vector_of(self, job_id):
+        """A job's normalised {term: weight} vector (for application history)."""
+        if job_id in self.overlay:
+            return self.overlay[job_id]
+        row = self.row_of.get(job_id)
+        if row is None or not self.alive[row]:
+            return {}
+        start, end = self.row_ptr[row], self.row_ptr[row + 1]
+        return {
+            self.names[col]: float(weight)
+            for col, weight in zip(self.row_cols[start:end], self.row_weights[start:end])
+        }
+
+    def top_k(self, query, k, exclude=()):
+        """``[(job_id, cosine), ...]`` for a {term: weight} query, best first."""
+        norm = math.sqrt(sum(w * w for w in query.values()))
+        if not norm:
+            return []
+        scores = np.zeros(len(self.job_ids), dtype=np.float32)
+        for term, weight in query.items():
+            col = self.terms.get(term)
+            if col is None:
+                continue
+            start, end = self.col_ptr[col], self.col_ptr[col + 1]
+            # each job appears at most once per term, so plain fancy indexing is safe
+            scores[self.col_rows[start:end]] += self.col_weights[start:end] * (weight / norm)
+        scores[~self.alive] = 0
+        for pk in exclude:
+            row = self.row_of.get(pk)
+            if row is not None:
+                scores[row] = 0
+
+        candidates = []
+        if len(scores):
+            k_base = min(k, len(scores))
+            top = np.argpartition(-scores, k_base - 1)[:k_base]
+            candidates = [(int(self.job_ids[row]), float(scores[row])) for row in top if scores[row] > 0]
+        for pk, vector in self.overlay.items():
+            if pk in exclude:
+                continue
+            score = sum(w * vector.get(term, 0.0) for term, w in query.items()) / norm
+            if score > 0:
+                candidates.append((pk, score))
+        candidates.sort(key=lambda item: (-item[1], item[0]))
+        return candidates[:k]
+
+
+# -------------------- PROCESS-WIDE INDEX --------------------
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, 1, timeout=None)
+
+
+def _load_or_build(generation):
+    path = getattr(settings, "RECOMMENDER_INDEX_PATH", "")
+    if path and os.path.exists(path):
+        try:
+            return RecommendationIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            logger.exception("Unreadable recommender index %s; rebuilding in-process", path)
+    return RecommendationIndex.build(generation)
+
+
+def get_index():
+    """The process-wide index, caught up with the shared change log."""
+    global _index
+    generation = _generation()
+    with _index_lock:
+        if _index is None:
+            _index = _load_or_build(generation)
+        index = _index
+    with index.lock:
+        if index.generation < generation:
+            pending = range(index.generation + 1, generation + 1)
+            changes = cache.get_many([CHANGE_KEY.format(n) for n in pending])
+            too_many = len(index.overlay) + len(pending) > settings.RECOMMENDER_MAX_DELTA
+            if len(changes) < len(pending) or too_many:
+                # the log was evicted or the overlay grew too big: start over
+                index = RecommendationIndex.build(generation)
+                with _index_lock:
+                    _index = index
+            else:
+                index.apply_changes(set(changes.values()))
+                index.generation = generation
+    return index
+
+
+def job_changed(job_id):
+    """Record a Job save/delete for every worker's index."""
+    try:
+        generation = cache.incr(GENERATION_KEY)
+    except ValueError:
+        # the counter was evicted: every worker will rebuild on its next read
+        cache.set(GENERATION_KEY, _generation() + 1, timeout=None)
+        return
+    cache.set(CHANGE_KEY.format(generation), job_id, timeout=CHANGE_LOG_TIMEOUT)
+
+
+def jobs_changed(job_ids):
+    """Bulk ``job_changed`` (imports); big batches skip the log and force a rebuild."""
+    job_ids = list(job_ids)
+    if len(job_ids) <= settings.RECOMMENDER_MAX_DELTA:
+        for job_id in job_ids:
+            job_changed(job_id)
+        return
+    try:
+        cache.incr(GENERATION_KEY)  # no log entry for this generation -> rebuild
+    except ValueError:
+        cache.set(GENERATION_KEY, _generation() + 1, timeout=None)
+
+
+def rebuild():
+    """Rebuild (and, with RECOMMENDER_INDEX_PATH, save) the index; returns it."""
+    global _index
+    index = RecommendationIndex.build(_generation())
+    path = getattr(settings, "RECOMMENDER_INDEX_PATH", "")
+    if path:
+        index.save(path)
+    with _index_lock:
+        _index = index
+    return index
+
+
+# -------------------- PER-USER FEED --------------------
+
+def _cache_key(user, profile, applied):
+    fields = [profile.skill, profile.software, profile.current_role, profile.course] if profile else []
+    signature = hashlib.md5(repr((fields, applied)).encode()).hexdigest()
+    return f"recommendations:{user.pk}:{signature}"
+
+
+def recommend_job_ids(user, profile=None, limit=None):
+    """``[(job_id, score), ...]`` for ``user``, cached per profile/application state."""
+    limit = limit or settings.RECOMMENDED_JOBS
+    applied = list(
+        Application.objects.filter(user=user, job__isnull=False)
+        .order_by("-created_at").values_list("job_id", flat=True)[:HISTORY_SIZE]
+    )
+    key = _cache_key(user, profile, applied)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    index = get_index()
+    query = Counter()
+    for term, weight in profile_features(profile).items():
+        query[term] += weight
+    if applied:
+        # the profile and the application history each get a comparable say
+        profile_norm = math.sqrt(sum(w * w for w in query.values())) or 1.0
+        for job_id in applied:
+            for term, weight in index.vector_of(job_id).items():
+                query[term] += weight * HISTORY_WEIGHT * profile_norm / len(applied)
+
+    with index.lock:
+        result = index.top_k(query, limit, exclude=set(applied))
+    cache.set(key, result, timeout=settings.RECOMMENDATION_CACHE_TIMEOUT)
+    return result
+
+
+def recommend_jobs(user, profile=None, limit=None):
+    """The recommended Job objects, best first (jobs deleted meanwhile are skipped)."""
+    ranked = recommend_job_ids(user, profile, limit)
+    jobs = Job.objects.with_skills().in_bulk([pk for pk, _ in ranked])
+    return [jobs[pk] for pk, _ in ranked if pk in jobs]
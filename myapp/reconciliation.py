@@ -0,0 +1,147 @@
+# myapp/reconciliation.py
+"""
+Razorpay webhook intake and batched reconciliation.
+
+The webhook view only verifies the signature and inserts a PaymentEvent
+(retries of the same event are ignored by the unique constraint).
+``reconcile_pending`` then applies queued events in batches: one
+transaction and a fixed handful of queries per batch, however many
+events the gateway sent.
+"""
+import json
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import entitlements
+from .models import Payment, PaymentEvent, UserProfile
+
+SUCCESS_EVENTS = {"payment.captured", "order.paid"}
+FAILURE_EVENTS = {"payment.failed"}
+HANDLED_EVENTS = SUCCESS_EVENTS | FAILURE_EVENTS
+PLAN_VALIDITY = timedelta(days=365)
+
+
+def _object(value, name):
+    if not isinstance(value, dict):
+        raise ValueError(f"{name}: expected a JSON object")
+    return value
+
+
+def parse_webhook(body):
+    """
+    Return an unsaved PaymentEvent for a webhook body, or None if we don't
+    handle it. Raises ValueError for a body that isn't the expected JSON shape.
+    """
+    data = _object(json.loads(body), "body")
+    event = data.get("event")
+    if event not in HANDLED_EVENTS:
+        return None
+    payload = _object(data.get("payload", {}), "payload")
+    payment, order = (
+        _object(_object(payload.get(name, {}), f"payload.{name}").get("entity", {}), f"payload.{name}.entity")
+        for name in ("payment", "order")
+    )
+    payment_id = payment.get("id")
+    if not payment_id:
+        return None
+    return PaymentEvent(
+        event=event,
+        razorpay_payment_id=payment_id,
+        razorpay_order_id=payment.get("order_id") or order.get("id") or "",
+        payload={"status": payment.get("status"), "amount": payment.get("amount")},
+    )
+
+
+def record_events(events):
+    """Queue events, silently dropping ones we've already seen."""
+    PaymentEvent.objects.bulk_create(events, ignore_conflicts=True)
+
+
+def _final_status(events):
+    # a capture beats an earlier failed attempt on the same order
+    if any(e.event in SUCCESS_EVENTS for e in events):
+        return "SUCCESS"
+    return "FAILED"
+
+
+def reconcile_batch(batch_size=500):
+    """Apply up to ``batch_size`` pending events; returns how many were consumed."""
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            PaymentEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True)
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        by_order = {}
+        for event in events:
+            by_order.setdefault(event.razorpay_order_id, []).append(event)
+
+        payments = list(Payment.objects.filter(razorpay_order_id__in=by_order))
+        changed, activated = [], []
+        for payment in payments:
+            order_events = by_order[payment.razorpay_order_id]
+            status = _final_status(order_events)
+            if payment.status == "SUCCESS" or payment.status == status:
+                continue  # already reconciled (e.g. by the browser callback)
+            payment.status = status
+            if status == "SUCCESS":
+                captured = next(e for e in order_events if e.event in SUCCESS_EVENTS)
+                payment.razorpay_payment_id = captured.razorpay_payment_id
+                activated.append(payment)
+            changed.append(payment)
+        Payment.objects.bulk_update(changed, ["status", "razorpay_payment_id"])
+
+        _activate_plans(activated, now)
+
+        PaymentEvent.objects.filter(id__in=[e.id for e in events]).update(processed_at=now)
+    return len(events)
+
+
+def _activate_plans(payments, now):
+    if not payments:
+        return
+    today = timezone.localdate(now)
+    profiles = {p.user_id: p for p in UserProfile.objects.filter(user_id__in=[p.user_id for p in payments])}
+    to_update, to_create = [], []
+    for payment in payments:
+        profile = profiles.get(payment.user_id)
+        if profile is None:
+            profile = UserProfile(user_id=payment.user_id)
+            profiles[payment.user_id] = profile
+            to_create.append(profile)
+        elif profile.plan_id == payment.plan_id and profile.plan_end and profile.plan_end >= today:
+            continue  # select_plan already activated it; keep the original dates
+        else:
+            to_update.append(profile)
+        profile.plan_id = payment.plan_id
+        profile.plan_start = today
+        profile.plan_end = today + PLAN_VALIDITY
+    UserProfile.objects.bulk_update(to_update, ["plan", "plan_start", "plan_end"])
+    UserProfile.objects.bulk_create(to_create)
+
+    # bulk writes send no post_save, so expire cached entitlements here
+    user_ids = [profile.user_id for profile in to_update + to_create]
+    transaction.on_commit(lambda: _invalidate_entitlements(user_ids))
+
+
+def _invalidate_entitlements(user_ids):
+    for user_id in user_ids:
+        entitlements.invalidate(user_id)
+
+
+def reconcile_pending(batch_size=500, max_batches=None):
+    """Drain the queue; returns the number of events processed."""
+    total, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        done = reconcile_batch(batch_size)
+        total += done
+        batches += 1
+        if done < batch_size:
+            break
+    return total
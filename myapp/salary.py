@@ -0,0 +1,89 @@
+# myapp/salary.py
+"""
+Parse the free-text ``Job.salary_range`` into numbers the database can index.
+
+"₹3 - 5 LPA", "50K-100K", "$60,000 - $80,000 per year" and "₹25,000/month"
+become a ``Salary(min, max, currency, period)``. Amounts are normalized to
+a yearly figure so ``salary_min >= X`` compares like with like whether a
+posting was quoted per month or per annum; ``period`` keeps what it said.
+"""
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+
+CURRENCIES = (
+    (re.compile(r"₹|\brs\b\.?|\binr\b"), "INR"),
+    (re.compile(r"\$|\busd\b"), "USD"),
+    (re.compile(r"€|\beur\b"), "EUR"),
+    (re.compile(r"£|\bgbp\b"), "GBP"),
+)
+PERIODS = (
+    (re.compile(r"\blpa\b|per annum|per year|\bp\.?a\b|/\s*y(?:ea)?r\b|\byearly\b|\bannual"), "year"),
+    (re.compile(r"per month|/\s*mo(?:nth)?\b|\bp\.?m\b|\bmonthly\b"), "month"),
+    (re.compile(r"per week|/\s*w(?:ee)?k\b|\bweekly\b"), "week"),
+    (re.compile(r"per day|/\s*day\b|\bdaily\b"), "day"),
+    (re.compile(r"per hour|/\s*h(?:ou)?r\b|\bhourly\b"), "hour"),
+)
+PERIODS_PER_YEAR = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+MULTIPLIERS = {
+    "k": 1_000,
+    "l": 100_000, "lac": 100_000, "lacs": 100_000, "lakh": 100_000, "lakhs": 100_000,
+    "m": 1_000_000, "mn": 1_000_000,
+    "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000,
+}
+AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(k|lakhs?|lacs?|l|crores?|cr|mn|m)?\b")
+LPA_RE = re.compile(r"\blpa\b")
+DIGIT_COMMAS = re.compile(r"(?<=\d),(?=\d)")
+SALARY_FIELDS = ("salary_min", "salary_max", "salary_currency", "salary_period")
+
+
+@dataclass(frozen=True)
+class Salary:
+    min: int
+    max: int
+    currency: str
+    period: str  # as quoted: "year", "month", "week", "day" or "hour"
+
+
+def _amounts(text):
+    found = [(float(number), suffix) for number, suffix in AMOUNT_RE.findall(text)]
+    amounts, suffix = [], None
+    # "50-100K": a bare number takes the unit of the one after it
+    for number, own in reversed(found):
+        suffix = own or suffix
+        amounts.append(number * MULTIPLIERS.get(suffix, 1))
+    return amounts[::-1]
+
+
+def parse_amount(text):
+    """One amount like "6L", "600000" or "6 LPA" as a whole number; None if there is none."""
+    text = DIGIT_COMMAS.sub("", (text or "").lower())
+    amounts = _amounts(text)
+    if not amounts:
+        return None
+    return int(amounts[0] * (MULTIPLIERS["lakh"] if LPA_RE.search(text) and amounts[0] < 1000 else 1))
+
+
+def parse_salary(text):
+    """The Salary in ``text``, or None for "Not disclosed" and other values without numbers."""
+    text = DIGIT_COMMAS.sub("", (text or "").lower()).replace("–", "-").replace("—", "-")
+    amounts = _amounts(text)
+    if not amounts:
+        return None
+    if LPA_RE.search(text):
+        amounts = [amount * MULTIPLIERS["lakh"] if amount < 1000 else amount for amount in amounts]
+
+    currency = next((code for pattern, code in CURRENCIES if pattern.search(text)), settings.SALARY_DEFAULT_CURRENCY)
+    period = next((name for pattern, name in PERIODS if pattern.search(text)), "year")
+    low, high = sorted(amounts[:2]) if len(amounts) > 1 else (amounts[0], amounts[0])
+    per_year = PERIODS_PER_YEAR[period]
+    return Salary(min=round(low * per_year), max=round(high * per_year), currency=currency, period=period)
+
+
+def salary_fields(text):
+    """The Job columns for ``text``: salary_min / salary_max / salary_currency / salary_period."""
+    salary = parse_salary(text)
+    if salary is None:
+        return dict(zip(SALARY_FIELDS, (None, None, "", "")))
+    return dict(zip(SALARY_FIELDS, (salary.min, salary.max, salary.currency, salary.period)))
@@ -0,0 +1,293 @@
+# myapp/search.py
+"""
+Ranked full-text search over Job postings.
+
+Three backends share one interface and are picked from the database vendor:
+
+* PostgreSQL - a weighted tsvector expression backed by a GIN index
+  (created in migration 0030), ranked with ts_rank_cd.
+* SQLite     - an FTS5 shadow table ``myapp_job_fts`` keyed by job id,
+  ranked with bm25.
+* anything else - an in-process inverted index with BM25 scoring.
+
+Every backend returns ``[(job_id, score), ...]`` ordered best first, so
+views don't need to know which one is in use.
+"""
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+# field -> weight (A..D on Postgres, bm25 column weight elsewhere)
+SEARCH_FIELDS = (
+    ("title", "A", 10.0),
+    ("role", "A", 8.0),
+    ("skills", "B", 6.0),
+    ("company", "B", 4.0),
+    ("responsibilities", "C", 1.0),
+    ("about_company", "D", 0.5),
+)
+FTS_TABLE = "myapp_job_fts"
+MAX_RESULTS = getattr(settings, "JOB_SEARCH_MAX_RESULTS", 500)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def pg_vector_sql():
+    """The tsvector expression; must stay identical to the GIN index in 0030."""
+    parts = [
+        f"setweight(to_tsvector('english'::regconfig, coalesce({field}, '')), '{weight}')"
+        for field, weight, _ in SEARCH_FIELDS
+    ]
+    return " || ".join(parts)
+
+
+class BaseSearchBackend:
+    name = "base"
+
+    def search(self, query, limit=MAX_RESULTS):
+        raise NotImplementedError
+
+    def index_jobs(self, jobs):
+        """Add or refresh the given Job instances in the index."""
+
+    def remove_jobs(self, job_ids):
+        """Drop the given job ids from the index."""
+
+    def rebuild(self):
+        """Re-index every Job from scratch."""
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """The GIN expression index is maintained by Postgres itself."""
+    name = "postgres"
+
+    def search(self, query, limit=MAX_RESULTS):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        tsquery = " & ".join(f"{t}:*" for t in terms)
+        vector = pg_vector_sql()
+        sql = (
+            f"SELECT id, ts_rank_cd({vector}, q) AS rank "
+            f"FROM myapp_job, to_tsquery('english', %s) q "
+            f"WHERE {vector} @@ q ORDER BY rank DESC, id LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [tsquery, limit])
+            return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    name = "sqlite"
+
+    def search(self, query, limit=MAX_RESULTS):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        match = " ".join(f'"{t}"*' for t in terms)
+        weights = ", ".join(str(w) for _, _, w in SEARCH_FIELDS)
+        sql = (
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY score, rowid LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, limit])
+            # bm25() is "lower is better"; flip it so every backend sorts descending
+            return [(row[0], -float(row[1])) for row in cursor.fetchall()]
+
+    def index_jobs(self, jobs):
+        rows = [
+            [job.pk] + [getattr(job, field) or "" for field, _, _ in SEARCH_FIELDS]
+            for job in jobs
+        ]
+        if not rows:
+            return
+        columns = ", ".join(field for field, _, _ in SEARCH_FIELDS)
+        placeholders = ", ".join(["%s"] * (len(SEARCH_FIELDS) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[row[0]] for row in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})", rows
+            )
+
+    def remove_jobs(self, job_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[pk] for pk in job_ids]
+            )
+
+    def rebuild(self):
+        columns = ", ".join(field for field, _, _ in SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM myapp_job"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+class PythonSearchBackend(BaseSearchBackend):
+    """
+    In-process BM25 index for databases without native full-text search.
+
+    Each worker builds its own copy on first use, applies its own saves
+    immediately and rebuilds from the database every JOB_SEARCH_FALLBACK_TTL
+    seconds to pick up writes made by other workers.
+    """
+    name = "python"
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}      # term -> {job_id: weighted tf}
+        self._doc_terms = {}     # job_id -> {term: weighted tf}
+        self._doc_len = {}
+        self._terms = []         # sorted, for prefix lookups
+        self._built_at = None
+        self.ttl = getattr(settings, "JOB_SEARCH_FALLBACK_TTL", 300)
+
+    def _weighted_terms(self, values):
+        counts = defaultdict(float)
+        for (field, _, weight) in SEARCH_FIELDS:
+            for term in tokenize(values.get(field)):
+                counts[term] += weight
+        return counts
+
+    def _add(self, job_id, counts):
+        self._remove(job_id)
+        self._doc_terms[job_id] = counts
+        self._doc_len[job_id] = sum(counts.values())
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[job_id] = tf
+
+    def _remove(self, job_id):
+        for term in self._doc_terms.pop(job_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._doc_len.pop(job_id, None)
+
+    def _ensure_built(self):
+        if self._built_at is None or time.monotonic() - self._built_at > self.ttl:
+            self.rebuild()
+
+    def rebuild(self):
+        from .models import Job
+
+        fields = ["id"] + [field for field, _, _ in SEARCH_FIELDS]
+        with self._lock:
+            self._postings, self._doc_terms, self._doc_len = {}, {}, {}
+            for row in Job.objects.values(*fields).iterator(chunk_size=2000):
+                self._add(row["id"], self._weighted_terms(row))
+            self._terms = sorted(self._postings)
+            self._built_at = time.monotonic()
+
+    def index_jobs(self, jobs):
+        if self._built_at is None:
+            return  # built lazily on the first search
+        with self._lock:
+            for job in jobs:
+                self._add(job.pk, self._weighted_terms(vars(job)))
+            self._terms = sorted(self._postings)
+
+    def remove_jobs(self, job_ids):
+        if self._built_at is None:
+            return
+        with self._lock:
+            for pk in job_ids:
+                self._remove(pk)
+            self._terms = sorted(self._postings)
+
+    def _expand(self, prefix):
+        i = bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            yield self._terms[i]
+            i += 1
+
+    def search(self, query, limit=MAX_RESULTS):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            self._ensure_built()
+            n_docs = len(self._doc_len) or 1
+            avg_len = (sum(self._doc_len.values()) / n_docs) or 1.0
+            scores = None
+            # every query term (as a prefix) must match, like the SQL backends
+            for term in terms:
+                term_scores = defaultdict(float)
+                for expanded in self._expand(term):
+                    postings = self._postings[expanded]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for job_id, tf in postings.items():
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_len[job_id] / avg_len)
+                        term_scores[job_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {pk: s + term_scores[pk] for pk, s in scores.items() if pk in term_scores}
+                if not scores:
+                    return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _sqlite_fts_available():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {FTS_TABLE} LIMIT 0")
+        return True
+    except Exception:
+        return False
+
+
+def get_backend():
+    """Return the search backend for the default database (cached per process)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                choice = getattr(settings, "JOB_SEARCH_BACKEND", None) or connection.vendor
+                if choice in ("postgres", "postgresql"):
+                    _backend = PostgresSearchBackend()
+                elif choice == "sqlite" and _sqlite_fts_available():
+                    _backend = SQLiteSearchBackend()
+                else:
+                    _backend = PythonSearchBackend()
+    return _backend
+
+
+def search_jobs(query, limit=MAX_RESULTS):
+    """Return ``[(job_id, score), ...]`` for ``query``, best match first."""
+    return get_backend().search(query, limit=limit)
+
+
+def index_jobs(jobs):
+    get_backend().index_jobs(jobs)
+
+
+def remove_jobs(job_ids):
+    get_backend().remove_jobs(job_ids)
+
+
+def rebuild_index():
+    get_backend().rebuild()
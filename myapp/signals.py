@@ -0,0 +1,137 @@
+# myapp/signals.py
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import entitlements, facets, images, recommendations, search, suggest
+from .course_bundle import invalidate_course_bundle
+from .models import (
+    Application, Course, InterviewQuestion, Job, JobVideo, PlacementSession, Plan, Skill, Topic, UserProfile,
+)
+from .skills import sync_job_skills
+
+
+# -------------------- SEARCH INDEX --------------------
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, **kwargs):
+    search.index_jobs([instance])
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    search.remove_jobs([instance.pk])
+
+
+# -------------------- RECOMMENDATIONS --------------------
+
+@receiver([post_save, post_delete], sender=Job)
+def refresh_recommendations(sender, instance, **kwargs):
+    job_id = instance.pk
+    transaction.on_commit(lambda: recommendations.job_changed(job_id))
+
+
+# -------------------- SEARCH FACETS --------------------
+
+@receiver(pre_save, sender=Job)
+def remember_job_facets(sender, instance, **kwargs):
+    # from what Job.from_db (or the last save) recorded; None if loaded without them
+    loaded = getattr(instance, "_loaded_values", {})
+    instance._facets_before = None
+    if all(column in loaded for column in facets.FACET_COLUMNS):
+        instance._facets_before = tuple(loaded[column] for column in facets.FACET_COLUMNS)
+
+
+@receiver(post_save, sender=Job)
+def update_job_facets(sender, instance, created, **kwargs):
+    before = getattr(instance, "_facets_before", None)
+    if before is None and not created:
+        transaction.on_commit(facets.invalidate)  # old values unknown: recount
+        return
+    after = facets.facet_values(instance)
+    instance._loaded_values = {**getattr(instance, "_loaded_values", {}), **dict(zip(facets.FACET_COLUMNS, after))}
+    transaction.on_commit(lambda: facets.job_changed(before, after))
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_facets(sender, instance, **kwargs):
+    before = facets.facet_values(instance)
+    transaction.on_commit(lambda: facets.job_changed(before, None))
+
+
+@receiver(post_delete, sender=Course)
+def recount_facets(sender, instance, **kwargs):
+    # the course's jobs were set to NULL by one UPDATE, without signals
+    transaction.on_commit(facets.invalidate)
+
+
+# -------------------- KEYWORD SUGGESTIONS --------------------
+
+@receiver([post_save, post_delete], sender=Job)
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Skill)
+def refresh_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(suggest.changed)
+
+
+# -------------------- SKILL CATALOG --------------------
+
+@receiver(post_save, sender=Job)
+def sync_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "skills" in update_fields:
+        sync_job_skills([instance])
+
+
+# -------------------- COURSE BUNDLE CACHE --------------------
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_course(sender, instance, **kwargs):
+    invalidate_course_bundle(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Topic)
+@receiver([post_save, post_delete], sender=JobVideo)
+@receiver([post_save, post_delete], sender=InterviewQuestion)
+@receiver([post_save, post_delete], sender=PlacementSession)
+def invalidate_course_content(sender, instance, **kwargs):
+    invalidate_course_bundle(instance.course_id)
+
+
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_course_jobs(sender, instance, **kwargs):
+    # a job may be any course's fallback (matched by role/title), so drop them all
+    invalidate_course_bundle()
+
+
+# -------------------- JOB APPLICANT COUNT --------------------
+
+@receiver(post_delete, sender=Application)
+def decrement_applicants(sender, instance, **kwargs):
+    # apply_job does the matching F() increment
+    if instance.job_id:
+        Job.objects.filter(pk=instance.job_id, applicants__gt=0).update(applicants=F("applicants") - 1)
+
+
+# -------------------- ENTITLEMENTS --------------------
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_user_entitlements(sender, instance, **kwargs):
+    entitlements.invalidate(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Plan)
+def invalidate_plan_entitlements(sender, instance, **kwargs):
+    entitlements.invalidate()
+
+
+# -------------------- IMAGE DERIVATIVES --------------------
+
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=JobVideo)
+@receiver(post_save, sender=InterviewQuestion)
+def build_image_derivatives(sender, instance, **kwargs):
+    # after commit, so the worker never sees a file for a rolled-back row
+    transaction.on_commit(lambda: images.schedule_for_instance(instance))
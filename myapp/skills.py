@@ -0,0 +1,54 @@
+# myapp/skills.py
+"""
+Helpers for the normalized Skill catalog.
+
+``Job.skills`` stays the editable comma separated source; these helpers
+mirror it into Skill/JobSkill rows so filters become indexed joins.
+"""
+import re
+
+from django.db.models import Exists, OuterRef
+
+from .models import JobSkill, Skill
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_skill(name):
+    return _SPACES.sub(" ", (name or "").strip()).lower()[:100]
+
+
+def parse_skills(csv):
+    """Return ``[(slug, display_name), ...]`` in CSV order, de-duplicated."""
+    seen = {}
+    for raw in (csv or "").split(","):
+        name = _SPACES.sub(" ", raw.strip())[:100]
+        slug = normalize_skill(name)
+        if slug and slug not in seen:
+            seen[slug] = name
+    return list(seen.items())
+
+
+def sync_job_skills(jobs):
+    """Rewrite the JobSkill rows of ``jobs`` from their ``skills`` CSV."""
+    parsed = {job.pk: parse_skills(job.skills) for job in jobs}
+    if not parsed:
+        return
+    names = {slug: name for pairs in parsed.values() for slug, name in pairs}
+    Skill.objects.bulk_create(
+        [Skill(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True
+    )
+    ids = dict(Skill.objects.filter(slug__in=names).values_list("slug", "id"))
+    JobSkill.objects.filter(job_id__in=parsed).delete()
+    JobSkill.objects.bulk_create([
+        JobSkill(job_id=job_id, skill_id=ids[slug], position=position)
+        for job_id, pairs in parsed.items()
+        for position, (slug, _) in enumerate(pairs)
+    ])
+
+
+def has_skill(name):
+    """Exact (case-insensitive) skill match as an indexed EXISTS subquery."""
+    return Exists(
+        JobSkill.objects.filter(job=OuterRef("pk"), skill__slug=normalize_skill(name))
+    )
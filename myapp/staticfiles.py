@@ -0,0 +1,60 @@
+# myapp/staticfiles.py
+"""
+Static files for the ASGI entry point.
+
+WhiteNoiseMiddleware is sync-only: anywhere in MIDDLEWARE it makes Django
+run the whole chain, async views included, through async_to_sync on a
+thread. So ``myproject.asgi`` sets SERVING_ASGI, the settings leave the
+middleware out, and ``StaticFilesApp`` wraps the Django application
+instead. It serves from the same WhiteNoise file index (compressed
+variants, caching headers, ranges) and reads the files off the event loop.
+"""
+from asgiref.sync import sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+BLOCK_SIZE = 64 * 1024
+
+
+class StaticFilesApp:
+    def __init__(self, application):
+        self.application = application
+        self.whitenoise = WhiteNoiseMiddleware()  # builds the file index from settings
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            static_file = await self.find(scope)
+            if static_file is not None:
+                return await self.serve(static_file, scope, send)
+        await self.application(scope, receive, send)
+
+    async def find(self, scope):
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]  # what request.path_info would be
+        if not path.startswith(self.whitenoise.static_prefix):
+            return None
+        if self.whitenoise.autorefresh:
+            return await sync_to_async(self.whitenoise.find_file, thread_sensitive=False)(path)
+        return self.whitenoise.files.get(path)
+
+    async def serve(self, static_file, scope, send):
+        request_headers = {
+            "HTTP_" + name.decode("latin-1").upper().replace("-", "_"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        response = static_file.get_response(scope["method"], request_headers)
+        await send({
+            "type": "http.response.start",
+            "status": int(response.status),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response.headers],
+        })
+        if response.file is None:
+            return await send({"type": "http.response.body", "body": b""})
+        read = sync_to_async(response.file.read, thread_sensitive=False)
+        try:
+            while chunk := await read(BLOCK_SIZE):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            response.file.close()
@@ -0,0 +1,146 @@
+# myapp/streaming.py
+"""
+Byte-range file responses for JobVideo playback.
+
+``ranged_file_response`` answers ``Range`` requests with ``206 Partial
+Content`` (honouring ``If-Range``), and ``304`` for a matching
+``If-None-Match``. The body is a FileResponse over the real file
+descriptor, so gunicorn's ``wsgi.file_wrapper`` sends the byte window
+with ``os.sendfile`` and nothing is copied through Python. Servers
+without sendfile fall back to bounded reads. Under ASGI, which has no
+sendfile and would collect a sync file iterator into memory, the body is
+a StreamingHttpResponse over the same window read asynchronously.
+
+With ``JOB_VIDEO_ACCEL_REDIRECT`` set, the response is instead an empty
+``X-Accel-Redirect`` and nginx serves the file and its ranges itself.
+"""
+import mimetypes
+import os
+import re
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeFile:
+    """
+    A read-only window ``[start, start + length)`` over an open file.
+
+    ``fileno()`` exposes the real descriptor (already positioned at
+    ``start``) so sendfile-capable servers can send ``Content-Length``
+    bytes from it directly. ``read()`` never goes past the window, and
+    ``async for`` reads it in blocks off the event loop.
+    """
+
+    def __init__(self, fh, start, length):
+        self._fh = fh
+        self._remaining = length
+        self.name = fh.name
+        fh.seek(start)
+
+    def fileno(self):
+        return self._fh.fileno()
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fh.read(size)
+        self._remaining -= len(data)
+        return data
+
+    async def __aiter__(self):
+        read = sync_to_async(self.read, thread_sensitive=False)
+        while chunk := await read(BLOCK_SIZE):
+            yield chunk
+
+    def close(self):
+        self._fh.close()
+
+
+def parse_range(header, size):
+    """
+    Return ``(start, end)`` (inclusive) for a single ``bytes=`` range,
+    ``None`` if the header should be ignored, or ``"unsatisfiable"``.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None  # absent, malformed or multi-range: send the whole file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def _if_range_matches(value, etag, mtime):
+    if value.startswith('"') or value.startswith("W/"):
+        return value == etag  # If-Range needs a strong match
+    since = parse_http_date_safe(value)
+    return since is not None and int(mtime) <= since
+
+
+def ranged_file_response(request, path, accel_path=None, content_type=None):
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = _etag(stat)
+    content_type = content_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    if accel_path:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = accel_path
+        response["ETag"] = etag
+        return response
+
+    byte_range = parse_range(request.headers.get("Range"), size)
+    if_range = request.headers.get("If-Range")
+    if byte_range and if_range and not _if_range_matches(if_range, etag, stat.st_mtime):
+        byte_range = None  # the client's copy is stale: send the whole new file
+
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+    status = 206 if byte_range else 200
+    fh = open(path, "rb")
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(RangeFile(fh, start, length), status=status, content_type=content_type)
+        response["Content-Disposition"] = content_disposition_header(False, os.path.basename(path))
+    elif byte_range:
+        response = FileResponse(RangeFile(fh, start, length), status=status, content_type=content_type)
+    else:
+        response = FileResponse(fh, content_type=content_type)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    return response
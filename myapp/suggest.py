@@ -0,0 +1,201 @@
+# myapp/suggest.py
+"""
+Keyword autocomplete for job_search, served from process memory.
+
+Job titles, companies, roles, skills and course names are loaded into a
+sorted array of keys; a lookup is two ``bisect`` calls plus a short
+ranking pass, with no database access. Every word boundary of a value
+is a key, so "dev" finds "Senior Python Developer" as well as "DevOps".
+
+Each worker process starts building its copy in a background thread on
+its first request (``warm_up``, connected to request_started by
+wsgi/asgi, so nothing runs at import or in a ``--preload`` master); a
+lookup that arrives before it is ready waits for that build instead of
+starting another. Saves to Job, Course and Skill bump a version in the cache
+(see myapp.signals); workers look at it at most every
+SUGGEST_CHECK_INTERVAL seconds and rebuild in a background thread,
+answering from the previous copy until the new one is ready. Other
+workers only see that version through a shared cache, so this needs
+REDIS_URL; without it a copy is instead rebuilt once it is
+SUGGEST_MAX_AGE seconds old.
+"""
+import logging
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from .models import Course, Job, Skill
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "suggest:version"
+MAX_SCAN = 2000  # keys ranked per lookup; bounds the cost of one-letter prefixes
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+class SuggestIndex:
+    """Immutable prefix index over ``[(text, kind, weight)]``."""
+
+    def __init__(self, entries, version=None):
+        merged = {}
+        for text, kind, weight in entries:
+            norm = normalize(text)
+            if not norm:
+                continue
+            if norm in merged:
+                # "Python Developer" as a title and as a role: one suggestion
+                shown, shown_kind, total = merged[norm]
+                merged[norm] = (shown, shown_kind, total + weight)
+            else:
+                merged[norm] = (text.strip(), kind, weight)
+        self.entries = list(merged.values())
+        self.version = version
+        self.built_at = time.monotonic()
+
+        keyed = []
+        for n, norm in enumerate(merged):
+            words = norm.split(" ")
+            for start in range(len(words)):
+                keyed.append((" ".join(words[start:]), start > 0, n))
+        keyed.sort()
+        self.keys = [key for key, _, _ in keyed]
+        self.inner = array("b", (inner for _, inner, _ in keyed))  # key starts mid-value
+        self.refs = array("l", (n for _, _, n in keyed))
+
+    @classmethod
+    def build(cls, version=None):
+        entries = []
+        for kind in ("title", "company", "role"):
+            rows = Job.objects.order_by().values_list(kind).annotate(n=Count("id"))
+            entries.extend((text, kind, n) for text, n in rows)
+        entries.extend((name, "skill", n) for name, n in Skill.objects.order_by().annotate(n=Count("jobs")).values_list("name", "n"))
+        entries.extend((name, "course", n) for name, n in Course.objects.order_by().annotate(n=Count("job")).values_list("name", "n"))
+        return cls(entries, version)
+
+    def lookup(self, prefix, limit=10):
+        """Up to ``limit`` ``(text, kind)`` pairs: whole-value matches first, then by job count."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = min(bisect_left(self.keys, prefix + "\uffff"), lo + MAX_SCAN)
+        best = {}
+        for i in range(lo, hi):
+            n = self.refs[i]
+            if best.get(n, True):  # unseen, or so far only matched mid-value
+                best[n] = self.inner[i]
+        ranked = sorted(best, key=lambda n: (best[n], -self.entries[n][2], self.entries[n][0]))
+        return [self.entries[n][:2] for n in ranked[:limit]]
+
+
+_index = None
+_checked_at = 0.0
+_rebuilding = False
+_warming = False
+_lock = threading.Lock()
+_first_build_lock = threading.Lock()  # held by whoever builds the worker's first index
+
+
+def _after_fork():
+    # a forked worker inherits the parent's flags, and maybe a lock held by
+    # one of its threads, but not the threads themselves
+    global _rebuilding, _warming, _lock, _first_build_lock
+    _rebuilding = _warming = False
+    _lock = threading.Lock()
+    _first_build_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def _current_version():
+    return cache.get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def _rebuild(version=None):
+    global _index, _rebuilding
+    try:
+        index = SuggestIndex.build(version or _current_version())
+        with _lock:
+            _index = index
+    except Exception:
+        logger.exception("Building the suggest index failed; keeping the previous one")
+    finally:
+        _rebuilding = False
+        connection.close()  # this thread's connection
+
+
+def _build_first():
+    global _index, _checked_at
+    with _first_build_lock:
+        if _index is None:
+            _index = SuggestIndex.build(_current_version())
+            _checked_at = time.monotonic()
+
+
+def _warm_up():
+    try:
+        _build_first()
+    except Exception:
+        logger.exception("Warming up the suggest index failed; the first lookup will build it")
+    finally:
+        connection.close()  # this thread's connection
+
+
+def _rebuild_in_background(version=None):
+    global _rebuilding
+    with _lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild, args=(version,), name="suggest-rebuild", daemon=True).start()
+
+
+def get_index():
+    """The worker's index; the first call builds it (or waits for ``warm_up``), later ones never wait."""
+    global _checked_at
+    if _index is None:
+        _build_first()
+        return _index
+    now = time.monotonic()
+    if now - _checked_at >= settings.SUGGEST_CHECK_INTERVAL:
+        _checked_at = now
+        version = _current_version()
+        max_age = settings.SUGGEST_MAX_AGE
+        if version != _index.version or (max_age is not None and now - _index.built_at >= max_age):
+            _rebuild_in_background(version)
+    return _index
+
+
+def suggest(prefix, limit=None):
+    return get_index().lookup(prefix, limit or settings.SUGGEST_LIMIT)
+
+
+def changed():
+    """A Job, Course or Skill changed: every worker sharing this cache rebuilds its index soon."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time()), timeout=None)
+
+
+def warm_up(sender=None, **kwargs):
+    """request_started receiver: start building this process's index in the background, once."""
+    global _warming
+    if _warming or _index is not None:
+        return
+    with _lock:
+        if _warming:
+            return
+        _warming = True
+    threading.Thread(target=_warm_up, name="suggest-warm-up", daemon=True).start()
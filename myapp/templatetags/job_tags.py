@@ -0,0 +1,19 @@
+from django import template
+from django.utils import timezone
+
+register = template.Library()
+
+
+@register.filter
+def days_ago(value):
+    """
+    "Today", "1 day ago", "N days ago" for a datetime, counted in local dates.
+
+    Usage: {{ job.posted_at|days_ago }}
+    """
+    if not value:
+        return ""
+    days = (timezone.localdate() - timezone.localtime(value).date()).days
+    if days <= 0:
+        return "Today"
+    return "1 day ago" if days == 1 else f"{days} days ago"
@@ -0,0 +1,33 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from myapp.images import derivative_name, derivatives_ready, widths
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, alt="", css_class="", sizes="100vw", style=""):
+    """
+    Render an uploaded ImageField as a <picture> with WebP/JPEG srcsets.
+
+    Usage: {% responsive_image profile.profile_image alt="Me" css_class="img-thumbnail" sizes="120px" %}
+    """
+    if not image:
+        return ""
+    if not derivatives_ready(image.name, image.storage):
+        return format_html('<img src="{}" alt="{}" class="{}" style="{}" loading="lazy">',
+                           image.url, alt, css_class, style)
+
+    def srcset(ext):
+        return format_html_join(
+            ", ", "{} {}w",
+            ((image.storage.url(derivative_name(image.name, w, ext)), w) for w in widths()),
+        )
+
+    fallback = image.storage.url(derivative_name(image.name, widths()[0], "jpg"))
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" style="{}" loading="lazy"></picture>',
+        srcset("webp"), sizes, fallback, srcset("jpg"), sizes, alt, css_class, style,
+    )
@@ -1,3 +1,597 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from importlib import reload
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from . import job_import, payments, reconciliation, suggest
+from . import urls as app_urls
+from .exports import iter_lines, streaming_export
+from .models import (
+    Course, DailyApplicationQuota, DailyQuotaExceeded, Job, Payment, PaymentEvent, Plan, UserProfile,
+)
+from .pagination import KeysetPaginator, RankedPaginator, decode_cursor, encode_cursor
+from .streaming import parse_range, ranged_file_response
+
+WEBHOOK_SECRET = "test-webhook-secret"
+
+
+class DailyApplicationQuotaTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("quota@example.com")
+
+    def test_consume_creates_todays_row(self):
+        DailyApplicationQuota.consume(self.user, limit=3)
+        self.assertEqual(DailyApplicationQuota.used_today(self.user), 1)
+        self.assertEqual(DailyApplicationQuota.objects.filter(user=self.user).count(), 1)
+
+    def test_consume_stops_at_limit(self):
+        for _ in range(2):
+            DailyApplicationQuota.consume(self.user, limit=2)
+        with self.assertRaises(DailyQuotaExceeded):
+            DailyApplicationQuota.consume(self.user, limit=2)
+        self.assertEqual(DailyApplicationQuota.used_today(self.user), 2)
+
+    def test_no_limit_takes_nothing(self):
+        DailyApplicationQuota.consume(self.user, limit=None)
+        self.assertEqual(DailyApplicationQuota.used_today(self.user), 0)
+        self.assertFalse(DailyApplicationQuota.objects.exists())
+
+    def test_zero_limit_refuses(self):
+        with self.assertRaises(DailyQuotaExceeded):
+            DailyApplicationQuota.consume(self.user, limit=0)
+
+    def test_counts_per_user(self):
+        other = User.objects.create_user("other@example.com")
+        DailyApplicationQuota.consume(self.user, limit=1)
+        DailyApplicationQuota.consume(other, limit=1)
+        self.assertEqual(DailyApplicationQuota.used_today(self.user), 1)
+        self.assertEqual(DailyApplicationQuota.used_today(other), 1)
+
+
+def webhook_body(event, payment_id, order_id):
+    return json.dumps({
+        "event": event,
+        "payload": {"payment": {"entity": {"id": payment_id, "order_id": order_id, "status": "captured", "amount": 49900}}},
+    })
+
+
+@override_settings(RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET)
+class PaymentWebhookTests(TestCase):
+    def post(self, body, signature=None):
+        if signature is None:
+            signature = hmac.new(WEBHOOK_SECRET.encode(), body.encode(), hashlib.sha256).hexdigest()
+        return self.client.post(
+            reverse("payment_webhook"), body, content_type="application/json",
+            headers={"X-Razorpay-Signature": signature}, secure=True,
+        )
+
+    def test_valid_signature_queues_event(self):
+        response = self.post(webhook_body("payment.captured", "pay_1", "order_1"))
+        self.assertEqual(response.status_code, 200)
+        event = PaymentEvent.objects.get()
+        self.assertEqual((event.event, event.razorpay_payment_id, event.razorpay_order_id),
+                         ("payment.captured", "pay_1", "order_1"))
+        self.assertIsNone(event.processed_at)
+
+    def test_bad_signature_is_rejected(self):
+        response = self.post(webhook_body("payment.captured", "pay_1", "order_1"), signature="0" * 64)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    def test_retries_are_deduplicated(self):
+        body = webhook_body("payment.captured", "pay_1", "order_1")
+        for _ in range(3):
+            self.assertEqual(self.post(body).status_code, 200)
+        self.post(webhook_body("payment.failed", "pay_1", "order_1"))
+        self.assertEqual(PaymentEvent.objects.count(), 2)  # one per (payment, event)
+
+    def test_malformed_body_is_rejected(self):
+        for body in ("[]", '"payment.captured"', '{"event": "payment.captured", "payload": []}',
+                     '{"event": "payment.captured", "payload": {"payment": {"entity": "pay_1"}}}'):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    def test_unhandled_event_is_acknowledged_and_dropped(self):
+        self.assertEqual(self.post(webhook_body("refund.created", "pay_1", "order_1")).status_code, 200)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    @override_settings(RAZORPAY_WEBHOOK_SECRET="")
+    def test_unconfigured(self):
+        self.assertEqual(self.post(webhook_body("payment.captured", "pay_1", "order_1")).status_code, 403)
+
+
+class ReconcileBatchTests(TestCase):
+    def setUp(self):
+        self.plan = Plan.objects.create(name="Premium Plan", price=499)
+
+    def payment(self, order_id, status="CREATED"):
+        user = User.objects.create_user(f"{order_id}@example.com")
+        return Payment.objects.create(user=user, plan=self.plan, razorpay_order_id=order_id, amount=499, status=status)
+
+    def event(self, event, payment_id, order_id):
+        return PaymentEvent.objects.create(event=event, razorpay_payment_id=payment_id, razorpay_order_id=order_id)
+
+    def test_capture_marks_success_and_activates_plan(self):
+        payment = self.payment("order_1")
+        self.event("payment.captured", "pay_1", "order_1")
+        self.assertEqual(reconciliation.reconcile_batch(), 1)
+        payment.refresh_from_db()
+        self.assertEqual((payment.status, payment.razorpay_payment_id), ("SUCCESS", "pay_1"))
+        profile = UserProfile.objects.get(user=payment.user)
+        self.assertEqual(profile.plan_id, self.plan.pk)
+        self.assertIsNotNone(profile.plan_end)
+        self.assertFalse(PaymentEvent.objects.filter(processed_at__isnull=True).exists())
+
+    def test_failure_then_capture_is_success(self):
+        payment = self.payment("order_1")
+        self.event("payment.failed", "pay_1", "order_1")
+        self.event("payment.captured", "pay_2", "order_1")
+        reconciliation.reconcile_batch()
+        payment.refresh_from_db()
+        self.assertEqual((payment.status, payment.razorpay_payment_id), ("SUCCESS", "pay_2"))
+
+    def test_failure_only(self):
+        payment = self.payment("order_1")
+        self.event("payment.failed", "pay_1", "order_1")
+        reconciliation.reconcile_batch()
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "FAILED")
+        self.assertFalse(UserProfile.objects.filter(user=payment.user, plan__isnull=False).exists())
+
+    def test_success_is_never_downgraded(self):
+        payment = self.payment("order_1", status="SUCCESS")
+        self.event("payment.failed", "pay_1", "order_1")
+        reconciliation.reconcile_batch()
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "SUCCESS")
+
+    def test_batches_and_unknown_orders(self):
+        for n in range(3):
+            self.payment(f"order_{n}")
+            self.event("payment.captured", f"pay_{n}", f"order_{n}")
+        self.event("payment.captured", "pay_x", "order_unknown")
+        self.assertEqual(reconciliation.reconcile_batch(batch_size=2), 2)
+        self.assertEqual(reconciliation.reconcile_pending(batch_size=2), 2)
+        self.assertEqual(Payment.objects.filter(status="SUCCESS").count(), 3)
+        self.assertEqual(reconciliation.reconcile_batch(), 0)
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        cases = {
+            "bytes=0-9": (0, 9),
+            "bytes=10-": (10, 99),
+            "bytes=-10": (90, 99),
+            "bytes=-500": (0, 99),  # suffix longer than the file
+            "bytes=90-500": (90, 99),  # end clamped to the file
+            " bytes=5-5 ": (5, 5),
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 100), expected)
+
+    def test_ignored(self):
+        for header in (None, "", "bytes=-", "items=0-9", "bytes=0-9,20-29", "bytes=a-b"):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_unsatisfiable(self):
+        for header in ("bytes=100-", "bytes=150-200", "bytes=9-5", "bytes=-0"):
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 100), "unsatisfiable")
+
+
+class RangedFileResponseTests(SimpleTestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".mp4")
+        self.content = bytes(range(256)) * 4
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(self.content)
+        self.addCleanup(os.remove, self.path)
+        self.factory = RequestFactory()
+
+    def get(self, **headers):
+        response = ranged_file_response(self.factory.get("/video", headers=headers), self.path)
+        self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_whole_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertEqual(self.body(response), self.content)
+
+    def test_partial_content(self):
+        response = self.get(range="bytes=100-199")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.content)}")
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(self.body(response), self.content[100:200])
+
+    def test_unsatisfiable(self):
+        response = self.get(range=f"bytes={len(self.content)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+    def test_if_range_matching_etag(self):
+        etag = self.get()["ETag"]
+        response = self.get(range="bytes=0-9", if_range=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), self.content[:10])
+
+    def test_if_range_stale_etag_sends_whole_file(self):
+        response = self.get(range="bytes=0-9", if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+
+    def test_if_range_weak_etag_never_matches(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(range="bytes=0-9", if_range="W/" + etag).status_code, 200)
+
+    def test_if_range_date(self):
+        mtime = os.stat(self.path).st_mtime
+        self.assertEqual(self.get(range="bytes=0-9", if_range=http_date(mtime)).status_code, 206)
+        self.assertEqual(self.get(range="bytes=0-9", if_range=http_date(mtime - 60)).status_code, 200)
+
+    def test_if_none_match(self):
+        etag = self.get()["ETag"]
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    async def test_asgi_reads_the_window_asynchronously(self):
+        request = AsyncRequestFactory().get("/video", headers={"range": "bytes=100-199"})
+        response = ranged_file_response(request, self.path)
+        self.addCleanup(response.close)
+        self.assertTrue(response.is_async)  # not collected into memory before sending
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), self.content[100:200])
+
+    def test_accel_redirect(self):
+        response = ranged_file_response(self.factory.get("/video", headers={"range": "bytes=0-9"}), self.path,
+                                        accel_path="/protected/video.mp4")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected/video.mp4")
+        self.assertEqual(response.content, b"")
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        for key, direction in ((["2025-01-02T03:04:05+00:00", 42], "n"), ([0.75, 7], "p")):
+            with self.subTest(key=key):
+                self.assertEqual(decode_cursor(encode_cursor(key, direction)), (key, direction))
+
+    def test_garbled_tokens_start_over(self):
+        bad_direction = encode_cursor([1, 2], "x")
+        bad_key = encode_cursor([1, 2, 3], "n")
+        for token in (None, "", "not-base64!", "e30", bad_direction, bad_key):
+            with self.subTest(token=token):
+                self.assertEqual(decode_cursor(token), (None, None))
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # pairs share a timestamp, so the id tie-breaker is exercised at page edges
+        Job.objects.bulk_create(
+            Job(title=f"Job {n}", company="Acme", salary_range="", responsibilities="", role="Developer",
+                candidate_type="Fresher", employment_type="Full-time", education="", skills="", about_company="",
+                posted_at=now - timedelta(hours=n // 2))
+            for n in range(11)
+        )
+        cls.newest_first = list(Job.objects.order_by("-posted_at", "-pk").values_list("pk", flat=True))
+
+    def walk(self, paginator):
+        pages = []
+        page = paginator.page()
+        while True:
+            pages.append([job.pk for job in page])
+            if not page.has_next:
+                return pages, page
+            page = paginator.page(page.next_cursor)
+
+    def test_forward_covers_every_row_once(self):
+        pages, last = self.walk(KeysetPaginator(Job.objects.all(), per_page=3))
+        self.assertEqual([pk for page in pages for pk in page], self.newest_first)
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+        self.assertIsNone(last.next_cursor)
+
+    def test_backward_returns_the_same_pages(self):
+        paginator = KeysetPaginator(Job.objects.all(), per_page=3)
+        pages, page = self.walk(paginator)
+        back = [[job.pk for job in page]]
+        while page.has_previous:
+            page = paginator.page(page.prev_cursor)
+            back.append([job.pk for job in page])
+        self.assertEqual(back[::-1], pages)
+        self.assertFalse(page.has_previous)
+        self.assertTrue(page.has_next)
+
+    def test_garbled_cursor_is_the_first_page(self):
+        paginator = KeysetPaginator(Job.objects.all(), per_page=3)
+        self.assertEqual([job.pk for job in paginator.page("garbage")], self.newest_first[:3])
+        self.assertEqual([job.pk for job in paginator.page(encode_cursor(["yesterday", "x"], "n"))], self.newest_first[:3])
+
+    def test_filtered_queryset(self):
+        odd = Job.objects.filter(pk__in=self.newest_first[1::2])
+        pages, _ = self.walk(KeysetPaginator(odd, per_page=2))
+        self.assertEqual([pk for page in pages for pk in page], self.newest_first[1::2])
+
+
+class RankedPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Job.objects.bulk_create(
+            Job(title=f"Job {n}", company="Acme", salary_range="", responsibilities="", role="Developer",
+                candidate_type="Fresher", employment_type="Full-time", education="", skills="", about_company="")
+            for n in range(7)
+        )
+        pks = list(Job.objects.order_by("pk").values_list("pk", flat=True))
+        # ties on score, broken by id
+        cls.ranked = [(pk, score) for pk, score in zip(pks, (3.0, 2.5, 2.5, 2.5, 1.0, 0.5, 0.5))]
+
+    def test_round_trip(self):
+        paginator = RankedPaginator(Job.objects.all(), self.ranked, per_page=3)
+        page, forward = paginator.page(), []
+        while True:
+            forward.append([job.pk for job in page])
+            if not page.has_next:
+                break
+            page = paginator.page(page.next_cursor)
+        self.assertEqual([pk for rows in forward for pk in rows], [pk for pk, _ in self.ranked])
+
+        back = [forward[-1]]
+        while page.has_previous:
+            page = paginator.page(page.prev_cursor)
+            back.append([job.pk for job in page])
+        self.assertEqual(back[::-1], forward)
+
+    def test_other_filters_drop_ids(self):
+        keep = [pk for pk, _ in self.ranked[::2]]
+        paginator = RankedPaginator(Job.objects.filter(pk__in=keep), self.ranked, per_page=10)
+        page = paginator.page()
+        self.assertEqual([job.pk for job in page], keep)
+        self.assertEqual(page.approx_total, len(keep))
+
+
+def reload_urlconf():
+    from myproject import urls as project_urls
+
+    reload(app_urls)  # picks the views by ASYNC_JOB_VIEWS at import
+    reload(project_urls)
+    clear_url_caches()
+
+
+@override_settings(
+    ASYNC_JOB_VIEWS=True,
+    # as under myproject.asgi: nothing sync-only in the chain
+    MIDDLEWARE=[name for name in settings.MIDDLEWARE if not name.startswith("whitenoise.")],
+)
+class AsyncJobViewsTests(TestCase):
+    """The async job pages through AsyncClient, with the ASGI middleware stack."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        reload_urlconf()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()  # drops the overrides first
+        reload_urlconf()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.plan = Plan.objects.create(name="Premium Plan", price=499)
+        cls.user = User.objects.create_user("async@example.com")
+        UserProfile.objects.create(user=cls.user).assign_plan(cls.plan)
+        course = Course.objects.create(name="Python Developer", course_tools="Python, SQL")
+        cls.job = Job.objects.create(
+            title="Python Developer", company="Acme", location="Remote", salary_range="5-8 LPA",
+            responsibilities="Build APIs\nWrite tests", role="Python Developer", candidate_type="Fresher",
+            employment_type="Full-time", education="B.E.", skills="Python, Django", about_company="",
+            course=course,
+        )
+
+    def setUp(self):
+        self.async_client.force_login(self.user)
+
+    def test_routes_are_async(self):
+        for name in ("job_list", "job_search", "plan_select"):
+            self.assertEqual(resolve(reverse(name)).func.__name__, "a" + name)
+
+    async def get(self, url, **params):
+        response = await self.async_client.get(url, params, secure=True)
+        self.assertEqual(response.status_code, 200, url)
+        return response.content.decode()
+
+    async def test_job_list(self):
+        html = await self.get(reverse("job_list"))
+        self.assertIn("Python Developer", html)
+        self.assertIn("My Plan</a>", html)  # the navbar's request.entitlements, resolved before render
+
+    async def test_job_detail(self):
+        html = await self.get(reverse("job_detail", args=[self.job.pk]))
+        self.assertIn("Build APIs", html)
+
+    async def test_job_search(self):
+        self.assertIn("Acme", await self.get(reverse("job_search")))
+        self.assertIn("Acme", await self.get(reverse("job_search"), keyword="python", job_location="Remote"))
+
+    async def test_plan_select(self):
+        self.assertIn("Premium Plan", await self.get(reverse("plan_select")))
+
+    async def test_select_plan(self):
+        order = {"id": "order_async_1", "amount": 49900, "currency": "INR"}
+        with mock.patch.object(payments, "acreate_order", mock.AsyncMock(return_value=order)):
+            html = await self.get(reverse("select_plan", args=[self.plan.pk]))
+        self.assertIn("order_async_1", html)
+        self.assertTrue(await Payment.objects.filter(razorpay_order_id="order_async_1", user=self.user).aexists())
+
+
+class GenerateBioStreamTests(TestCase):
+    form = {"fullName": "Asha", "skills": "Python, SQL", "experience": "2 years"}
+
+    async def test_asgi_streams_from_an_async_iterator(self):
+        response = await self.async_client.post(
+            reverse("generate_bio"), self.form, headers={"accept": "text/event-stream"}, secure=True,
+        )
+        self.assertTrue(response.is_async)  # not collected into a list before the first byte
+        body = "".join([chunk.decode() async for chunk in response.streaming_content])
+        self.assertIn('"variant": 2', body)
+        self.assertTrue(body.endswith("event: done\ndata: {}\n\n"))
+
+    def test_wsgi_streams_from_a_sync_iterator(self):
+        response = self.client.post(
+            reverse("generate_bio"), self.form, headers={"accept": "text/event-stream"}, secure=True,
+        )
+        self.assertFalse(response.is_async)
+        self.assertTrue(b"".join(response.streaming_content).endswith(b"event: done\ndata: {}\n\n"))
+
+
+class StreamingExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        plan = Plan.objects.create(name="Premium Plan", price=499)
+        for n in range(5):
+            user = User.objects.create_user(f"export{n}@example.com")
+            Payment.objects.create(user=user, plan=plan, razorpay_order_id=f"order_{n}", amount=499)
+
+    async def test_asgi_streams_the_same_lines_from_an_async_iterator(self):
+        for fmt in ("csv", "jsonl"):
+            with self.subTest(fmt=fmt):
+                expected = await sync_to_async(lambda: "".join(iter_lines(Payment.objects.all(), fmt)))()
+                response = streaming_export(Payment.objects.all(), fmt, chunk_size=2, request=AsyncRequestFactory().get("/"))
+                self.assertTrue(response.is_async)
+                body = "".join([chunk.decode() async for chunk in response.streaming_content])
+                self.assertEqual(body, expected)
+                self.assertIn("order_4", body)
+
+    def export(self, **options):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command("export_rows", "payments", format="jsonl", output=path, stdout=io.StringIO(), **options)
+        with open(path, encoding="utf-8") as fh:
+            return [json.loads(line)["razorpay_order_id"] for line in fh]
+
+    def test_command_date_range_covers_whole_days(self):
+        day = timezone.make_aware(timezone.datetime(2026, 3, 10))
+        for n, created_at in enumerate((day - timedelta(seconds=1), day, day + timedelta(hours=23, minutes=59))):
+            Payment.objects.filter(razorpay_order_id=f"order_{n}").update(created_at=created_at)
+        Payment.objects.exclude(razorpay_order_id__in=["order_0", "order_1", "order_2"]).update(
+            created_at=day + timedelta(days=1))
+        self.assertEqual(self.export(since="2026-03-10", until="2026-03-10"), ["order_1", "order_2"])
+
+    def test_command_rejects_malformed_dates(self):
+        for value in ("10/03/2026", "2026-02-30"):
+            with self.subTest(value=value), self.assertRaisesMessage(CommandError, "--since"):
+                self.export(since=value)
+
+    def test_wsgi_streams_from_a_sync_iterator(self):
+        response = streaming_export(Payment.objects.all(), "csv", request=RequestFactory().get("/"))
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 6)
+
+
+class JobImportTests(TestCase):
+    columns = ("company", "title", "location", "salary_range", "responsibilities", "role",
+               "candidate_type", "employment_type", "education", "skills", "about_company")
+
+    def feed(self, *rows):
+        lines = [",".join(self.columns)] + [",".join(row) for row in rows]
+        return io.BytesIO("\n".join(lines).encode())
+
+    def row(self, title, **values):
+        values = {"company": "Acme", "title": title, "location": "Remote", "salary_range": "5-8 LPA",
+                  "responsibilities": "Build APIs", "role": "Developer", "candidate_type": "Fresher",
+                  "employment_type": "Full-time", "education": "B.E.", "skills": "Python",
+                  "about_company": "Acme builds things", **values}
+        return [values[name] for name in self.columns]
+
+    def test_new_row_missing_required_columns_is_rejected(self):
+        result = job_import.import_jobs(self.feed(self.row("Developer", role="", about_company="")))
+        self.assertEqual((result.created, result.failed), (0, 1))
+        line, message = result.errors[0]
+        self.assertEqual(line, 2)
+        self.assertIn("role", message)
+        self.assertIn("about_company", message)
+        self.assertFalse(Job.objects.exists())
+
+    def test_update_needs_only_the_columns_given(self):
+        job_import.import_jobs(self.feed(self.row("Developer")))
+        feed = io.BytesIO(b"company,title,location,openings\nAcme,Developer,Remote,4\n")
+        result = job_import.import_jobs(feed)
+        self.assertEqual((result.updated, result.failed), (1, 0))
+        self.assertEqual(Job.objects.get().openings, 4)
+
+    def test_database_error_reports_only_the_failing_row(self):
+        real = job_import.sync_job_skills
+
+        def sync_job_skills(jobs):
+            if any(job.title == "Broken" for job in jobs):
+                raise DatabaseError("rejected")
+            real(jobs)
+
+        feed = self.feed(self.row("Developer"), self.row("Broken"), self.row("Tester"))
+        with mock.patch.object(job_import, "sync_job_skills", sync_job_skills):
+            result = job_import.import_jobs(feed)
+        self.assertEqual((result.created, result.failed), (2, 1))
+        self.assertEqual(result.errors, [(3, "rejected")])
+        self.assertEqual(sorted(Job.objects.values_list("title", flat=True)), ["Developer", "Tester"])
+
+
+class SuggestWarmUpTests(SimpleTestCase):
+    def setUp(self):
+        for name, value in (("_index", None), ("_warming", False), ("_rebuilding", False)):
+            patcher = mock.patch.object(suggest, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.builds = []
+
+    def build(self, version=None):
+        self.builds.append(version)
+        self.started.set()
+        self.release.wait(5)
+        return suggest.SuggestIndex([("Python Developer", "title", 3)], version)
+
+    def test_lookup_waits_for_the_warm_up_build(self):
+        with mock.patch.object(suggest.SuggestIndex, "build", self.build), \
+                mock.patch.object(suggest, "_current_version", return_value=7):
+            suggest.warm_up()
+            suggest.warm_up()  # later requests: no second thread
+            self.assertTrue(self.started.wait(5))
+            threading.Timer(0.05, self.release.set).start()
+            index = suggest.get_index()
+        self.assertEqual(self.builds, [7])
+        self.assertEqual(index.lookup("dev"), [("Python Developer", "title")])
+
+    def test_forked_worker_forgets_the_parents_build_state(self):
+        suggest._warming = suggest._rebuilding = True
+        suggest._after_fork()
+        self.assertFalse(suggest._warming or suggest._rebuilding)
@@ -1,29 +1,40 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# ASGI deployments serve the read-heavy job pages from their async twins
+async_jobs = settings.ASYNC_JOB_VIEWS
+
 urlpatterns = [
     path('', views.home_view, name='home'),
     path("register/", views.register_view, name="register"),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
     path("ai-mock-interview/", views.ai_mock_interview, name="ai_mock_interview"),
+    path("ai-mock-interview/start/", views.interview_start, name="interview_start"),
+    path("ai-mock-interview/<str:session_id>/", views.interview_session, name="interview_session"),
+    path("ai-mock-interview/<str:session_id>/answer/", views.interview_answer, name="interview_answer"),
     path("bio-generator/", views.bio_generator, name="bio_generator"),
     path("generate-bio/", views.generate_bio, name="generate_bio"),
     path("resume_builder", views.resume_builder, name="resume_builder"),
-    path("jobs/", views.job_list, name="job_list"),
-    path("job/<int:job_id>/", views.job_detail, name="job_detail"),
+    path("jobs/", views.ajob_list if async_jobs else views.job_list, name="job_list"),
+    path("job/<int:job_id>/", views.ajob_detail if async_jobs else views.job_detail, name="job_detail"),
     path("apply/<int:job_id>/", views.apply_job, name="apply_job"),
-    path("jobs/search/", views.job_search, name="job_search"),
-    path("plans/", views.plan_select, name="plan_select"),
-    path("plans/<int:plan_id>/select/", views.select_plan, name="select_plan"),
+    path("jobs/search/", views.ajob_search if async_jobs else views.job_search, name="job_search"),
+    path("jobs/suggest/", views.job_suggest, name="job_suggest"),
+    path("plans/", views.aplan_select if async_jobs else views.plan_select, name="plan_select"),
+    path("plans/<int:plan_id>/select/", views.aselect_plan if async_jobs else views.select_plan, name="select_plan"),
     # path("confirm-courses/", views.confirm_courses, name="confirm_courses"),
     path("confirm-courses/<int:course_id>/", views.confirm_courses, name="confirm_courses_course"),
+    path("videos/<int:video_id>/", views.stream_job_video, name="job_video_stream"),
 
 
     path("profile/", views.profile_dashboard, name="profile_dashboard"),
     path("payment/callback/", views.payment_callback, name="payment_callback"),
+    path("payment/webhook/", views.payment_webhook, name="payment_webhook"),
+    path("metrics", views.metrics_view, name="metrics"),
 
-    path('select-plan/<int:plan_id>/', views.select_plan, name='select_plan'),
+    path('select-plan/<int:plan_id>/', views.aselect_plan if async_jobs else views.select_plan, name='select_plan'),
     path('payment-success/', views.payment_success, name='payment_success'),
     
 ]
@@ -1,17 +1,38 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
+from django.views.decorators.http import require_POST
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import F, Q
 from django.conf import settings
+from django.utils.crypto import constant_time_compare
 import razorpay
 
+from . import bio, facets, interview, metrics, payments, recommendations, reconciliation, search, suggest
+from .course_bundle import get_course_bundle
+from .entitlements import afor_request
+from .pagination import KeysetPaginator, RankedPaginator
+from .salary import parse_amount, parse_salary
+from .skills import has_skill
+from .streaming import ranged_file_response
 from .models import (
     UserProfile, Job, Application, Plan, Course, JobVideo,
-    InterviewQuestion, PlacementSession, Doubt
+    InterviewQuestion, PlacementSession, Doubt,
+    DailyApplicationQuota, DailyQuotaExceeded,
 )
 
+logger = logging.getLogger(__name__)
+
 # -------------------- AUTH --------------------
 
 def register_view(request):
@@ -67,27 +88,127 @@ def home_view(request):
 # -------------------- AI TOOLS -------------------- 
 
 def ai_mock_interview(request):
-    return render(request, "myapp/mock_interview.html")
+    courses = Course.objects.order_by("name").only("id", "name")
+    return render(request, "myapp/mock_interview.html", {"courses": courses, "levels": interview.LEVELS})
 
 
 def bio_generator(request):
     return render(request, "myapp/bio_generator.html")
 
 
-def generate_bio(request):
-    if request.method == "POST":
-        name = request.POST.get("fullName")
-        exp = request.POST.get("experience")
-        skills = request.POST.get("skills")
-        highlights = request.POST.get("highlights")
-        tone = request.POST.get("tone")
-        length = request.POST.get("length")
-        lang = request.POST.get("language")
+def _sse(event, data):
+    """One server-sent event; ``event`` None is the default "message" type."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
 
-        bio1 = f"{name} is a {exp} professional skilled in {skills}. {highlights}. Known for a {tone.lower()} approach with {length.lower()} impactful communication. ({lang})"
-        bio2 = f"With experience at the {exp}, {name} specializes in {skills}. {highlights}. Delivering results with a {tone.lower()} style and {length.lower()} summaries. ({lang})"
 
-        return JsonResponse({"bio1": bio1, "bio2": bio2})
+@require_POST
+def generate_bio(request):
+    bio_request = bio.BioRequest.from_form(request.POST)
+    missing = bio_request.missing()
+    if missing:
+        return JsonResponse({"error": f"Please fill in: {', '.join(missing)}"}, status=400)
+
+    if "text/event-stream" not in request.headers.get("Accept", ""):
+        return JsonResponse(bio.generate_bios(bio_request))
+
+    # ✅ server-sent events: the bios appear as they are written. Each server
+    # needs its own kind of iterator: WSGI buffers an async one into a list,
+    # and so does ASGI with a sync one.
+    events = _abio_events(bio_request) if isinstance(request, ASGIRequest) else _bio_events(bio_request)
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+    return response
+
+
+def _bio_events(bio_request):
+    try:
+        for variant, text in bio.stream_bios(bio_request):
+            yield _sse(None, {"variant": variant, "text": text})
+    except Exception:
+        logger.exception("Bio generation failed")
+        yield _sse("error", {"error": "Could not generate a bio right now."})
+        return
+    yield _sse("done", {})
+
+
+async def _abio_events(bio_request):
+    try:
+        async for variant, text in bio.astream_bios(bio_request):
+            yield _sse(None, {"variant": variant, "text": text})
+    except Exception:
+        logger.exception("Bio generation failed")
+        yield _sse("error", {"error": "Could not generate a bio right now."})
+        return
+    yield _sse("done", {})
+
+
+# ---- MOCK INTERVIEW ----
+# Async views: between answers a session is only a database row, and while
+# feedback streams the view awaits the provider, so under ASGI thousands
+# of open interviews don't each hold a worker thread.
+
+@require_POST
+async def interview_start(request):
+    user = await request.auser()
+    try:
+        session = await interview.astart(request.POST.get("course_id"), request.POST.get("level"), user.pk)
+    except (Course.DoesNotExist, ValueError, TypeError):
+        return JsonResponse({"error": "Please choose a course."}, status=400)
+    return JsonResponse({"session": session.id, "question": session.question()}, status=201)
+
+
+async def interview_session(request, session_id):
+    user = await request.auser()
+    try:
+        session = await interview.aload(session_id, user.pk)
+    except interview.SessionNotFound:
+        return JsonResponse({"error": "This interview has expired. Please start a new one."}, status=404)
+    return JsonResponse({"session": session.id, "question": session.question(), "summary": session.summary()})
+
+
+@require_POST
+async def interview_answer(request, session_id):
+    answer = request.POST.get("answer", "").strip()[:5000]
+    try:
+        number = int(request.POST.get("number", ""))
+    except ValueError:
+        number = None
+    if not answer or number is None:
+        return JsonResponse({"error": "Please type an answer."}, status=400)
+
+    user = await request.auser()
+    try:
+        session = await interview.aclaim(session_id, number, user.pk)
+    except interview.SessionNotFound:
+        return JsonResponse({"error": "This interview has expired. Please start a new one."}, status=404)
+    except interview.AnswerConflict as exc:
+        return JsonResponse({"error": str(exc)}, status=409)
+
+    if "text/event-stream" not in request.headers.get("Accept", ""):
+        result = {"feedback": ""}
+        async for event, data in interview.aanswer(session, answer):
+            if event is None:
+                result["feedback"] += data
+            else:
+                result.update(data)
+        result["feedback"] = result["feedback"].strip()
+        return JsonResponse(result)
+
+    response = StreamingHttpResponse(_interview_events(session, answer), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _interview_events(session, answer):
+    try:
+        async for event, data in interview.aanswer(session, answer):
+            yield _sse(event, {"text": data} if event is None else data)
+    except Exception:
+        logger.exception("Scoring a mock interview answer failed")
+        yield _sse("error", {"error": "Could not score this answer right now. Please try again."})
 
 
 def resume_builder(request):
@@ -108,13 +229,17 @@ def resume_builder(request):
 
 @login_required
 def job_list(request):
-    jobs = Job.objects.all()
+    page = KeysetPaginator(Job.objects.with_skills(), per_page=settings.JOBS_PER_PAGE).page(request.GET.get("cursor"))
     profile, created = UserProfile.objects.get_or_create(user=request.user)
-    return render(request, "myapp/job_list.html", {"jobs": jobs, "profile": profile})
+    # the feed only sits above the first page
+    recommended = [] if page.has_previous else recommendations.recommend_jobs(request.user, profile)
+    return render(request, "myapp/job_list.html", {
+        "jobs": page.object_list, "page": page, "profile": profile, "recommended": recommended,
+    })
 
 
 def job_detail(request, job_id):
-    job = get_object_or_404(Job, id=job_id)
+    job = get_object_or_404(Job.objects.with_skills(), id=job_id)
     responsibilities = job.responsibilities.split("\n")
 
     # Get related course dynamically
@@ -123,19 +248,10 @@ def job_detail(request, job_id):
         course = Course.objects.filter(name__iexact=job.role).first() or \
                  Course.objects.filter(name__iexact=job.title).first()
 
-    # ✅ Get user plan (if logged in)
-    user_plan = None
-    if request.user.is_authenticated:
-        try:
-            user_plan = request.user.userprofile.plan.name.lower()  # "basic", "standard", "premium"
-        except:
-            user_plan = None
-
     return render(request, "myapp/job_detail.html", {
         "job": job,
         "responsibilities": responsibilities,
         "course": course,
-        "user_plan": user_plan,  # ✅ Pass to template
     })
 
 
@@ -152,47 +268,47 @@ from django.contrib.auth.decorators import login_required
 @login_required
 def apply_job(request, job_id):
     job = get_object_or_404(Job, id=job_id)
-
-    # get-or-create profile
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    entitlements = request.entitlements
 
     if request.method == "POST":
-        # Check for Basic plan daily limit
-        if profile.plan and profile.plan.name and profile.plan.name.strip().lower() == "basic":
-            today = date.today()
-            apps_today_count = Application.objects.filter(user=request.user, created_at__date=today).count()
-            
-            if apps_today_count >= 5:
-                messages.error(
-                    request,
-                    "You have reached the daily limit of 5 job applications for Basic plan. You can apply again tomorrow."
+        # Daily limit comes from the plan (e.g. 5/day on Basic, empty = unlimited)
+        daily_limit = entitlements.daily_application_limit
+        try:
+            with transaction.atomic():
+                DailyApplicationQuota.consume(request.user, daily_limit)
+
+                # Create the application
+                application = Application.objects.create(
+                    user=request.user,
+                    job=job,
+                    full_name=request.POST.get("full_name"),
+                    email=request.POST.get("email"),
+                    mobile=request.POST.get("mobile"),
+                    city=request.POST.get("city"),
+                    gender=request.POST.get("gender"),
+                    languages=request.POST.get("languages"),
+                    work_status=request.POST.get("work_status"),
+                    experience_years=request.POST.get("experience_years"),
+                    qualification=request.POST.get("qualification"),
+                    passed_out_year=request.POST.get("passed_out_year"),
+                    updates_optin=request.POST.get("updates_optin") == "on",
+                    profile_image=request.FILES.get("profile_image"),
+                    resume=request.FILES.get("resume"),
                 )
-                return redirect("job_detail", job_id=job.id)
-
-        # Create the application
-        application = Application.objects.create(
-            user=request.user,
-            job=job,
-            full_name=request.POST.get("full_name"),
-            email=request.POST.get("email"),
-            mobile=request.POST.get("mobile"),
-            city=request.POST.get("city"),
-            gender=request.POST.get("gender"),
-            languages=request.POST.get("languages"),
-            work_status=request.POST.get("work_status"),
-            experience_years=request.POST.get("experience_years"),
-            qualification=request.POST.get("qualification"),
-            passed_out_year=request.POST.get("passed_out_year"),
-            updates_optin=request.POST.get("updates_optin") == "on",
-            profile_image=request.FILES.get("profile_image"),
-            resume=request.FILES.get("resume"),
-        )
+                # ✅ live count: one UPDATE, safe against concurrent applies
+                Job.objects.filter(pk=job.pk).update(applicants=F("applicants") + 1)
+        except DailyQuotaExceeded:
+            messages.error(
+                request,
+                f"You have reached the daily limit of {daily_limit} job applications for {entitlements.plan_name} plan. You can apply again tomorrow."
+            )
+            return redirect("job_detail", job_id=job.id)
 
         request.session["job_id"] = job.id
         request.session["application_id"] = application.id
 
         # Redirect based on whether user has a plan
-        if not profile.plan:
+        if not entitlements.has_plan:
             return redirect("plan_select")
 
         return redirect("confirm_courses_course", course_id=job.course.id)
@@ -270,7 +386,6 @@ from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
-from django.http import HttpResponseBadRequest
 from myapp.models import Plan, Application, UserProfile, Payment
 
 @login_required
@@ -292,16 +407,11 @@ def select_plan(request, plan_id):
     profile, _ = UserProfile.objects.get_or_create(user=request.user)
     profile.assign_plan(plan)
 
-    # --- Razorpay Order Creation ---
-    client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    # --- Razorpay Order Creation (shared pooled client) ---
     order_amount = int(plan.price * 100)  # Razorpay accepts amount in paise
     order_currency = "INR"
 
-    razorpay_order = client.order.create(dict(
-        amount=order_amount,
-        currency=order_currency,
-        payment_capture="1"
-    ))
+    razorpay_order = payments.create_order(order_amount, order_currency)
 
     # Save payment details in DB (Optional but Recommended)
     payment = Payment.objects.create(
@@ -319,6 +429,7 @@ def select_plan(request, plan_id):
         "amount": order_amount,
         "currency": order_currency,
         "callback_url": request.build_absolute_uri("/payment/callback/"),
+        "razorpay_checkout_js": settings.RAZORPAY_CHECKOUT_JS,
     }
     return render(request, "myapp/checkout.html", context)
 
@@ -330,7 +441,6 @@ def payment_callback(request):
     """
     if request.method == "POST":
         data = request.POST
-        client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
 
         razorpay_payment_id = data.get("razorpay_payment_id")
         razorpay_order_id = data.get("razorpay_order_id")
@@ -338,18 +448,16 @@ def payment_callback(request):
 
         try:
             # Verify the signature
-            client.utility.verify_payment_signature({
-                'razorpay_order_id': razorpay_order_id,
-                'razorpay_payment_id': razorpay_payment_id,
-                'razorpay_signature': razorpay_signature
-            })
-
-            # ✅ Update payment status
-            payment = Payment.objects.get(razorpay_order_id=razorpay_order_id)
-            payment.razorpay_payment_id = razorpay_payment_id
-            payment.razorpay_signature = razorpay_signature
-            payment.status = "SUCCESS"
-            payment.save()
+            payments.verify_payment_signature(razorpay_order_id, razorpay_payment_id, razorpay_signature)
+
+            # ✅ Update payment status (single UPDATE on the unique order id)
+            updated = Payment.objects.filter(razorpay_order_id=razorpay_order_id).update(
+                razorpay_payment_id=razorpay_payment_id,
+                razorpay_signature=razorpay_signature,
+                status="SUCCESS",
+            )
+            if not updated:
+                return HttpResponseBadRequest("Unknown order")
 
             return redirect("payment_success")
 
@@ -358,6 +466,43 @@ def payment_callback(request):
     return HttpResponseBadRequest("Invalid request")
 
 
+@csrf_exempt
+@require_POST
+def payment_webhook(request):
+    """
+    Razorpay webhook: verify, queue and acknowledge. Events are applied in
+    batches by `manage.py reconcile_payments`.
+    """
+    if not settings.RAZORPAY_WEBHOOK_SECRET:
+        return HttpResponseForbidden("Webhooks are not configured")
+
+    body = request.body.decode("utf-8")
+    try:
+        payments.verify_webhook_signature(body, request.headers.get("X-Razorpay-Signature"))
+        event = reconciliation.parse_webhook(body)
+    except razorpay.errors.SignatureVerificationError:
+        return HttpResponseBadRequest("Signature verification failed")
+    except ValueError:
+        return HttpResponseBadRequest("Invalid payload")
+
+    if event is not None:
+        reconciliation.record_events([event])
+    return HttpResponse(status=200)
+
+
+# -------------------- METRICS --------------------
+
+def metrics_view(request):
+    """Prometheus scrape target: METRICS_TOKEN bearer auth, or a staff session."""
+    token = settings.METRICS_TOKEN
+    authorized = request.user.is_staff or (
+        token and constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+    )
+    if not authorized:
+        return HttpResponseForbidden("Forbidden")
+    return HttpResponse(metrics.render_prometheus(), content_type="text/plain; version=0.0.4")
+
+
 from datetime import date, timedelta
 
 @login_required
@@ -413,38 +558,26 @@ def confirm_courses(request, course_id=None):
     if not course_id:
         return redirect("job_search")
 
-    course = get_object_or_404(Course, id=course_id)
+    bundle = get_course_bundle(course_id)
+    if bundle is None:
+        raise Http404("Course not found")
+    course = bundle.course
     courses = [course]
 
-    # Get the relevant job
+    # Get the relevant job (the bundle already holds the course's default job)
     job_id = request.session.get("job_id")
-    job = None
-    user_application = None
-    user_plan = None
-
-    if job_id:
-        job = Job.objects.filter(id=job_id).first()
-    if not job:
-        job = Job.objects.filter(course=course).first() \
-              or Job.objects.filter(role__iexact=course.name).first() \
-              or Job.objects.filter(title__iexact=course.name).first()
-
-    # Get user application if exists
-    if job:
-        user_application = Application.objects.filter(
-            job=job, email=request.user.email, plan__isnull=False
-        ).first()
-
-    # Set user_plan safely
-    if user_application:
-        user_plan = user_application.plan.name.lower().strip()  # lowercase + remove spaces
-    else:
-        user_plan = None
+    job = bundle.job
+
+    if job_id and (not job or job.id != job_id):
+        job = Job.objects.with_skills().filter(id=job_id).first() or bundle.job
+    if job is bundle.job and job is not None:
+        # not cached with the bundle: apply_job changes it without a signal
+        job.applicants = Job.objects.filter(pk=job.pk).values_list("applicants", flat=True).first() or 0
 
-    # Fetch course-related data
-    job_videos = JobVideo.objects.filter(course=course)
-    interview_qs = InterviewQuestion.objects.filter(course=course)
-    placement = PlacementSession.objects.filter(course=course).first()
+    # Course content comes from the cached bundle
+    job_videos = bundle.job_videos
+    interview_qs = bundle.interview_qs
+    placement = bundle.placement
 
     # Handle doubt form submission
     if request.method == "POST":
@@ -462,19 +595,42 @@ def confirm_courses(request, course_id=None):
         "job_videos": job_videos,
         "interview_qs": interview_qs,
         "placement": placement,
-        "user_plan": user_plan,  # None if no plan
-        "remaining_days": user_application.remaining_days() if user_application else 0,
+        "remaining_days": request.entitlements.remaining_days,
     })
 
 
+# -------------------- VIDEO STREAMING --------------------
+
+@login_required
+def stream_job_video(request, video_id):
+    video = get_object_or_404(JobVideo, id=video_id)
+    if not video.video_file:
+        raise Http404("No video uploaded")
+    if not request.entitlements.can_watch_videos:
+        return HttpResponseForbidden("Videos are available only for Standard and Premium plan users.")
+
+    try:
+        path = video.video_file.path
+    except NotImplementedError:
+        # remote storage (S3 etc.) already serves ranges from its own URL
+        return redirect(video.video_file.url)
+
+    accel_path = None
+    if settings.JOB_VIDEO_ACCEL_REDIRECT:
+        accel_path = settings.JOB_VIDEO_ACCEL_REDIRECT.rstrip("/") + "/" + video.video_file.name
+    try:
+        return ranged_file_response(request, path, accel_path=accel_path)
+    except FileNotFoundError:
+        raise Http404("Video file missing")
+
+
 # -------------------- PROFILE --------------------
 
 @login_required
 def profile_dashboard(request):
     profile, created = UserProfile.objects.get_or_create(user=request.user)
-    remaining_days = profile.remaining_days()
-    remaining_today = profile.remaining_applications_today()
-
+    remaining_days = request.entitlements.remaining_days
+    remaining_today = request.entitlements.remaining_applications_today()
 
     if request.method == "POST":
         section = request.POST.get("section")
@@ -531,22 +687,192 @@ def profile_dashboard(request):
 
 # -------------------- JOB SEARCH --------------------
 
-def job_search(request):
+def _job_search_filters(request):
+    """``(filtered Job queryset, keyword)`` for the job_search query string."""
     jobs = Job.objects.all()
 
-    keyword = request.GET.get("keyword", "")
+    keyword = request.GET.get("keyword", "").strip()
     course = request.GET.get("course", "")
     location = request.GET.get("location", "")
     salary = request.GET.get("salary", "")
-
-    if keyword:
-        jobs = jobs.filter(title__icontains=keyword) | jobs.filter(skills__icontains=keyword)
+    salary_min = parse_amount(request.GET.get("salary_min"))
+    salary_max = parse_amount(request.GET.get("salary_max"))
+    posted = request.GET.get("posted", "")
+    # exact-match filters picked from the facet sidebar
+    exact = {name: request.GET[name] for name in ("job_type", "employment_type", "candidate_type") if request.GET.get(name)}
+    if request.GET.get("job_location"):
+        exact["location"] = request.GET["job_location"]
+    course_id = request.GET.get("course_id", "")
+
+    if exact:
+        jobs = jobs.filter(**exact)
+    if course_id.isdigit():
+        jobs = jobs.filter(course_id=int(course_id))
     if course:
-        jobs = jobs.filter(role__icontains=course) | jobs.filter(skills__icontains=course)
+        # exact skill match through the JobSkill index ("Java" no longer matches "JavaScript")
+        jobs = jobs.filter(Q(role__icontains=course) | Q(has_skill(course)))
     if location:
         jobs = jobs.filter(location__icontains=location)
     if salary:
-        jobs = jobs.filter(salary_range__icontains=salary)
+        # old links carry a range like "50K-100K"; match it against the parsed columns
+        parsed = parse_salary(salary)
+        if parsed:
+            salary_min, salary_max = parsed.min, parsed.max
+    if salary_min is not None or salary_max is not None:
+        jobs = jobs.salary_between(salary_min, salary_max)
+    if posted.isdigit():
+        jobs = jobs.posted_within(int(posted))
+    return jobs, keyword
+
+
+def job_search(request):
+    jobs, keyword = _job_search_filters(request)
+    cursor = request.GET.get("cursor")
+    if keyword:
+        # ✅ Full-text index (GIN / FTS5 / in-process) instead of LIKE '%x%' scans
+        ranked = search.search_jobs(keyword)
+        paginator = RankedPaginator(jobs, ranked, per_page=settings.JOBS_PER_PAGE,
+                                    max_results=settings.JOB_SEARCH_MAX_RESULTS)
+        facet_counts = facets.compute_facets(jobs.filter(pk__in=[pk for pk, _ in ranked]), request.GET)
+    else:
+        paginator = KeysetPaginator(jobs, per_page=settings.JOBS_PER_PAGE)
+        # ✅ the unfiltered board's facets come from the cache
+        facet_counts = facets.compute_facets(jobs, request.GET) if jobs.query.where else facets.board_facets(request.GET)
+    page = paginator.page(cursor)
 
-    return render(request, "myapp/job_search.html", {"jobs": jobs})
+    return render(request, "myapp/job_search.html", {"jobs": page.object_list, "page": page, "facets": facet_counts})
 
+
+def job_suggest(request):
+    """Autocomplete for the job_search keyword box (in-process index, no queries)."""
+    matches = suggest.suggest(request.GET.get("q", "")[:100])
+    response = JsonResponse({"suggestions": [{"text": text, "kind": kind} for text, kind in matches]})
+    response["Cache-Control"] = "public, max-age=60"
+    return response
+
+
+# -------------------- ASYNC JOB VIEWS --------------------
+# Async twins of the read-heavy job pages and of select_plan, routed
+# instead of the sync ones when ASYNC_JOB_VIEWS is on (ASGI deployments;
+# see myproject/asgi.py).
+
+async def _aresolve(request):
+    """
+    Load request.user and request.entitlements before rendering: their lazy
+    versions would query the database from inside the template, which
+    isn't allowed in an async view.
+    """
+    request.user = await request.auser()
+    request.entitlements = await afor_request(request)
+
+
+@login_required
+async def ajob_list(request):
+    await _aresolve(request)
+    paginator = KeysetPaginator(Job.objects.with_skills(), per_page=settings.JOBS_PER_PAGE)
+    page = await paginator.apage(request.GET.get("cursor"))
+    profile, created = await UserProfile.objects.aget_or_create(user=request.user)
+    recommended = [] if page.has_previous else await sync_to_async(recommendations.recommend_jobs)(request.user, profile)
+    return render(request, "myapp/job_list.html", {
+        "jobs": page.object_list, "page": page, "profile": profile, "recommended": recommended,
+    })
+
+
+async def ajob_detail(request, job_id):
+    await _aresolve(request)
+    job = await aget_object_or_404(Job.objects.with_skills().select_related("course"), id=job_id)
+    course = job.course
+    if not course:
+        course = await Course.objects.filter(name__iexact=job.role).afirst() or \
+                 await Course.objects.filter(name__iexact=job.title).afirst()
+
+    return render(request, "myapp/job_detail.html", {
+        "job": job,
+        "responsibilities": job.responsibilities.split("\n"),
+        "course": course,
+    })
+
+
+async def ajob_search(request):
+    await _aresolve(request)
+    jobs, keyword = _job_search_filters(request)
+    cursor = request.GET.get("cursor")
+    if keyword:
+        ranked = await sync_to_async(search.search_jobs)(keyword)  # raw SQL or the in-process index
+        paginator = RankedPaginator(jobs, ranked, per_page=settings.JOBS_PER_PAGE,
+                                    max_results=settings.JOB_SEARCH_MAX_RESULTS)
+        facet_counts = await facets.acompute_facets(jobs.filter(pk__in=[pk for pk, _ in ranked]), request.GET)
+    else:
+        paginator = KeysetPaginator(jobs, per_page=settings.JOBS_PER_PAGE)
+        if jobs.query.where:
+            facet_counts = await facets.acompute_facets(jobs, request.GET)
+        else:
+            facet_counts = await facets.aboard_facets(request.GET)
+    page = await paginator.apage(cursor)
+
+    return render(request, "myapp/job_search.html", {"jobs": page.object_list, "page": page, "facets": facet_counts})
+
+
+@login_required
+async def aplan_select(request):
+    await _aresolve(request)
+    application_id = await request.session.aget("application_id")
+
+    if request.method == "POST":
+        selected_plan_id = request.POST.get("plan_id")
+        if not application_id:
+            messages.error(request, "No application found in session.")
+            return redirect("job_search")
+
+        application = await aget_object_or_404(Application, id=application_id)
+        if selected_plan_id:
+            selected_plan = await aget_object_or_404(Plan, id=selected_plan_id)
+            application.plan = selected_plan
+            await application.asave()
+            await request.session.aset("selected_plan_id", selected_plan.id)
+            return redirect("select_plan", plan_id=selected_plan.id)
+
+        messages.error(request, "Please select a plan.")
+        return redirect("plan_select")
+
+    plans = [plan async for plan in Plan.objects.all()]
+    return render(request, "myapp/plan_select.html", {"plans": plans})
+
+
+@login_required
+async def aselect_plan(request, plan_id):
+    user = await request.auser()
+    plan = await aget_object_or_404(Plan, id=plan_id)
+
+    application_id = await request.session.aget("application_id")
+    if application_id:
+        application = await Application.objects.filter(id=application_id).afirst()
+        if application and application.plan_id != plan.id:
+            application.plan = plan
+            await application.asave()
+
+    profile, _ = await UserProfile.objects.aget_or_create(user=user)
+    await sync_to_async(profile.assign_plan)(plan)
+
+    # ✅ the gateway call awaits on the shared httpx pool instead of blocking a worker
+    order_amount = int(plan.price * 100)  # Razorpay accepts amount in paise
+    order_currency = "INR"
+    razorpay_order = await payments.acreate_order(order_amount, order_currency)
+    await Payment.objects.acreate(
+        user=user,
+        plan=plan,
+        razorpay_order_id=razorpay_order["id"],
+        amount=order_amount / 100,
+        status="CREATED",
+    )
+
+    await _aresolve(request)  # after assign_plan, so the navbar shows the new plan
+    return render(request, "myapp/checkout.html", {
+        "plan": plan,
+        "razorpay_order_id": razorpay_order["id"],
+        "razorpay_key_id": settings.RAZORPAY_KEY_ID,
+        "amount": order_amount,
+        "currency": order_currency,
+        "callback_url": request.build_absolute_uri("/payment/callback/"),
+        "razorpay_checkout_js": settings.RAZORPAY_CHECKOUT_JS,
+    })
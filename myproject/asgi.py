@@ -5,6 +5,13 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+The async views (the mock interview, and the job pages with
+ASYNC_JOB_VIEWS=1) only pay off when served from here, e.g.
+``uvicorn myproject.asgi:application --workers 4``; under WSGI they still
+work, one thread per request. Static files are served by
+myapp.staticfiles here rather than by WhiteNoiseMiddleware, which is
+sync-only and would put every request back on a thread. ``manage.py bench_asgi`` compares the two.
 """
 
 import os
@@ -12,5 +19,18 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+os.environ['SERVING_ASGI'] = '1'  # keeps the sync-only WhiteNoise middleware out of the chain
 
 application = get_asgi_application()
+
+from myapp.staticfiles import StaticFilesApp  # noqa: E402
+
+application = StaticFilesApp(application)
+
+# each worker process starts building its keyword autocomplete index on its
+# first request; not here, where a --preload master would fork it half-built
+from django.core.signals import request_started  # noqa: E402
+
+from myapp import suggest  # noqa: E402
+
+request_started.connect(suggest.warm_up, dispatch_uid="suggest_warm_up")
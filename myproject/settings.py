@@ -40,16 +40,23 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'myapp.metrics.MetricsMiddleware',  # first, so it times the whole stack
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add this for static files
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'myapp.entitlements.EntitlementsMiddleware',  # request.entitlements, needs request.user
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# set by myproject.asgi: WhiteNoiseMiddleware is sync-only and would force the
+# whole chain onto a thread, so there myapp.staticfiles serves static files
+SERVING_ASGI = config('SERVING_ASGI', default=False, cast=bool)
+if not SERVING_ASGI:
+    MIDDLEWARE.insert(2, 'whitenoise.middleware.WhiteNoiseMiddleware')  # Add this for static files
+
 ROOT_URLCONF = 'myproject.urls'
 
 TEMPLATES = [
@@ -62,6 +69,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'myapp.entitlements.context_processor',
             ],
         },
     },
@@ -77,6 +85,22 @@ DATABASES = {
     )
 }
 
+# Cache - Redis when REDIS_URL is set (shared by all workers), else per-process memory
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -111,6 +135,15 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Serve JobVideo files through nginx: set to an `internal` location aliased to
+# MEDIA_ROOT (e.g. "/protected-media/") and Django only does the plan check
+JOB_VIDEO_ACCEL_REDIRECT = config('JOB_VIDEO_ACCEL_REDIRECT', default="")
+
+# Resized WebP/JPEG copies of uploaded images (see myapp/images.py)
+IMAGE_DERIVATIVE_WIDTHS = (160, 320, 640, 1280)
+IMAGE_DERIVATIVE_QUALITY = 80
+IMAGE_DERIVATIVE_WORKERS = 2
+
 LOGIN_URL = '/login/'
 
 # Default primary key field type
@@ -119,11 +152,81 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Razorpay settings
 RAZORPAY_KEY_ID = config('RAZORPAY_KEY_ID', default="rzp_live_lEa015FwnbAOyT")
 RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET', default="iPgE73Glejf80nuDFbaQTQz0")
+# Point both at `manage.py run_fake_razorpay` to test checkout offline
+RAZORPAY_BASE_URL = config('RAZORPAY_BASE_URL', default="https://api.razorpay.com")
+RAZORPAY_CHECKOUT_JS = config('RAZORPAY_CHECKOUT_JS', default="https://checkout.razorpay.com/v1/checkout.js")
+RAZORPAY_WEBHOOK_SECRET = config('RAZORPAY_WEBHOOK_SECRET', default="")
+RAZORPAY_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+RAZORPAY_MAX_RETRIES = 2
+RAZORPAY_POOL_SIZE = 20
 
 # Security settings for production
 if not DEBUG:
-    SECURE_SSL_REDIRECT = True
+    SECURE_SSL_REDIRECT = config('SECURE_SSL_REDIRECT', default=True, cast=bool)
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     SECURE_BROWSER_XSS_FILTER = True
     SECURE_CONTENT_TYPE_NOSNIFF = True
+
+# Job search backend: "postgres", "sqlite" or "python" (default: picked from the database)
+JOB_SEARCH_BACKEND = config('JOB_SEARCH_BACKEND', default=None)
+JOB_SEARCH_MAX_RESULTS = 500
+
+# Cached job_search sidebar counts. Saves patch them in place, but the patch
+# only reaches other workers through Redis; without it, recount every minute
+JOB_FACETS_TIMEOUT = 24 * 60 * 60 if REDIS_URL else 60
+
+# /jobs/suggest/ keyword autocomplete: suggestions per response, and how often
+# (seconds) a worker checks whether its in-memory index is out of date
+SUGGEST_LIMIT = 8
+SUGGEST_CHECK_INTERVAL = 2
+# Change notices only reach other workers through Redis; without it each
+# worker rebuilds its index once it is this many seconds old
+SUGGEST_MAX_AGE = None if REDIS_URL else 5 * 60
+
+# Keyset-paginated job board page size
+JOBS_PER_PAGE = 20
+
+# Route job_list, job_detail, job_search, plan_select and select_plan to their async
+# views. Turn on when serving myproject/asgi.py (uvicorn); under WSGI each
+# async view needs its own event loop and is slower, not faster.
+ASYNC_JOB_VIEWS = config('ASYNC_JOB_VIEWS', default=False, cast=bool)
+
+# "Recommended for you" on job_list. Build the matrix offline with
+# `manage.py build_recommendations`; workers load it from this path.
+RECOMMENDER_INDEX_PATH = config('RECOMMENDER_INDEX_PATH', default="")
+RECOMMENDER_MAX_DELTA = 1000  # changed jobs kept in the overlay before a full rebuild
+RECOMMENDED_JOBS = 6
+RECOMMENDATION_CACHE_TIMEOUT = 10 * 60
+
+# confirm_courses content bundle lifetime (seconds); signals invalidate it earlier
+COURSE_BUNDLE_TIMEOUT = 60 * 60
+
+# Keep request.entitlements (plan, expiry, limits) in the session between
+# requests; profile/plan saves invalidate it through a cache version. That
+# version has to be in a cache every worker shares, so off without Redis:
+# with LocMemCache the other workers would never see the bump.
+ENTITLEMENTS_SESSION_CACHE = config('ENTITLEMENTS_SESSION_CACHE', default=bool(REDIS_URL), cast=bool)
+
+# Text generation for the AI tools: "stub" (deterministic, offline) or "openai"
+AI_PROVIDER = config('AI_PROVIDER', default="stub")
+OPENAI_API_KEY = config('OPENAI_API_KEY', default="")
+OPENAI_BASE_URL = config('OPENAI_BASE_URL', default="")
+OPENAI_MODEL = config('OPENAI_MODEL', default="gpt-4o-mini")
+OPENAI_TEMPERATURE = 0.7
+OPENAI_TIMEOUT = 30  # seconds
+OPENAI_MAX_RETRIES = 2
+BIO_CACHE_SIZE = 512  # generated bio pairs kept per worker (LRU)
+INTERVIEW_QUESTIONS = 5  # per mock interview
+INTERVIEW_SESSION_TIMEOUT = 2 * 60 * 60  # idle seconds before a mock interview is dropped
+INTERVIEW_ANSWER_TIMEOUT = 120  # seconds one answer may hold the session lock
+
+# Per-view metrics served at /metrics. With several gunicorn workers point
+# METRICS_DIR at a shared directory so every worker's numbers are merged.
+METRICS_TOKEN = config('METRICS_TOKEN', default="")
+METRICS_DIR = config('METRICS_DIR', default="")
+METRICS_FLUSH_INTERVAL = 5  # seconds between a worker's snapshot writes
+
+# Currency assumed for Job.salary_range values that don't name one, and for
+# the salary filters on job_search
+SALARY_DEFAULT_CURRENCY = "INR"
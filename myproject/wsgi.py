@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
 application = get_wsgi_application()
+
+# each worker process starts building its keyword autocomplete index on its
+# first request; not here, where a --preload master would fork it half-built
+from django.core.signals import request_started  # noqa: E402
+
+from myapp import suggest  # noqa: E402
+
+request_started.connect(suggest.warm_up, dispatch_uid="suggest_warm_up")